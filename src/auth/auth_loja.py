@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 from src.interface.interface import pausar, mensagem_alerta, mensagem_sucesso, cabecalho, mostrar_menu, prompt, prompt_senha, confirmar, painel
 from src.auth.usuarios import criar_usuario, validar_login, iniciar_recuperacao, concluir_recuperacao
 from src.utils.logs import get_logger
+import src.services.atualizador_catalogo as atualizador_catalogo
 
 log = get_logger("auth")
 
@@ -160,5 +161,9 @@ def iniciar_sistema() -> None:
     log.info("Aplicação iniciada")
     usuario = tela_login()
     if usuario:
-        _abrir_menu_pos_login(usuario)
+        atualizador_catalogo.iniciar()  # aquece o catálogo enquanto o menu é montado
+        try:
+            _abrir_menu_pos_login(usuario)
+        finally:
+            atualizador_catalogo.parar()
 
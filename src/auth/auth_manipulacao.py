@@ -5,12 +5,15 @@ import json
 import os
 from typing import Any, Dict
 
+from src.utils import cache_arquivos, gravacao_atomica
+
 try:
     import manipulacaoArquivos as ma  # integração com camada existente
 except Exception:
     ma = None  # fallback para open()
 
-DB_PATH = "db.json"  # segue o padrão do projeto de usar caminhos relativos (Pedidos.txt, etc.)
+# segue o padrão do projeto de usar caminhos relativos (Pedidos.txt, etc.)
+DB_PATH = os.environ.get("LOJA_DB_PATH", "db.json")
 
 
 def _garantir_estrutura(dados: Dict[str, Any]) -> Dict[str, Any]:
@@ -21,7 +24,20 @@ def _garantir_estrutura(dados: Dict[str, Any]) -> Dict[str, Any]:
     return dados
 
 
+def _copiar_db(dados: Dict[str, Any]) -> Dict[str, Any]:
+    """Cópia independente do cache (os dicts de usuário só têm listas como valores aninhados)."""
+    usuarios = [{k: (list(v) if isinstance(v, list) else v) for k, v in u.items()} if isinstance(u, dict) else u
+                for u in dados["usuarios"]]
+    recuperacoes = {t: (dict(r) if isinstance(r, dict) else r) for t, r in dados["recuperacoes"].items()}
+    return {**dados, "usuarios": usuarios, "recuperacoes": recuperacoes}
+
+
 def carregar_db() -> Dict[str, Any]:
+    # db.json só é lido e interpretado de novo quando muda (mtime, tamanho, inode)
+    return cache_arquivos.ler(DB_PATH, _ler_json, _copiar_db)
+
+
+def _ler_json() -> Dict[str, Any]:
     if not os.path.exists(DB_PATH):
         return _garantir_estrutura({})
     try:
@@ -42,14 +58,12 @@ def carregar_db() -> Dict[str, Any]:
 def salvar_db(dados: Dict[str, Any]) -> None:
     dados = _garantir_estrutura(dados)
     try:
-        if ma is not None and hasattr(ma, "lerArquivo"):
-            f = ma.lerArquivo(DB_PATH, "w")  # type: ignore[misc]
-            with f:
-                json.dump(dados, f, indent=2, ensure_ascii=False)
-        else:
-            with open(DB_PATH, "w", encoding="utf-8") as f:
-                json.dump(dados, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        # último recurso: tenta escrever via open
-        with open(DB_PATH, "w", encoding="utf-8") as f:
-            json.dump(dados, f, indent=2, ensure_ascii=False)
+        _gravar_atomico(dados)
+    finally:
+        cache_arquivos.invalidar(DB_PATH)
+
+
+def _gravar_atomico(dados: Dict[str, Any]) -> None:
+    # temporário + fsync + os.replace via group commit: uma queda nunca deixa o
+    # db.json pela metade, e salvamentos simultâneos viram um só commit
+    gravacao_atomica.substituir(DB_PATH, json.dumps(dados, indent=2, ensure_ascii=False))
@@ -7,7 +7,15 @@ import secrets
 import time
 from typing import Dict, Any, Optional, Tuple, List
 
-from .auth_manipulacao import carregar_db, salvar_db
+import src.utils.repositorios as repositorios
+
+
+def carregar_db() -> Dict[str, Any]:
+    return repositorios.obter().carregar_usuarios()
+
+
+def salvar_db(dados: Dict[str, Any]) -> None:
+    repositorios.obter().salvar_usuarios(dados)
 
 
 def _hash_texto(texto: str, salt: str) -> str:
@@ -29,14 +37,20 @@ def listar_usuarios() -> List[Dict[str, Any]]:
     return db.get("usuarios", [])
 
 
-def buscar_usuario_por_login(login: str) -> Optional[Dict[str, Any]]:
-    db = carregar_db()
+def _procurar(db: Dict[str, Any], login: str) -> Optional[Dict[str, Any]]:
     for u in db.get("usuarios", []):
         if u.get("username") == login or u.get("email") == login:
             return u
     return None
 
 
+def buscar_usuario_por_login(login: str) -> Optional[Dict[str, Any]]:
+    repositorio = repositorios.obter()
+    if repositorio.busca_indexada:
+        return repositorio.buscar_usuario(login)  # sem varrer a base inteira
+    return _procurar(carregar_db(), login)
+
+
 def criar_usuario(username: str, nome: str, email: str, senha: str,
                   pergunta: str, resposta: str) -> tuple[bool, str]:
     if not username or not email or not senha:
@@ -90,7 +104,7 @@ def validar_login(login: str, senha: str) -> tuple[bool, Optional[Dict[str, Any]
 
 def iniciar_recuperacao(login: str) -> tuple[bool, str, Optional[str]]:
     db = carregar_db()
-    u = buscar_usuario_por_login(login)
+    u = _procurar(db, login)  # a base já está carregada: não lê de novo
     if not u:
         return False, "Usuário não encontrado.", None
 
@@ -1,13 +1,28 @@
 import os
+import itertools
 import rich
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.align import Align
-from typing import Optional
+from rich.segment import Segment, Segments
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from src.models.produto import Produto
+
+try:
+    import readline  # TAB para autocompletar; não existe no Windows sem pyreadline
+except ImportError:
+    readline = None
 
 console = Console()
 
+TAMANHO_PAGINA = 20
+LIMITE_PAGINAS_CACHE = 64
+
+# (versão, tamanho da página, página) -> segmentos já renderizados
+_paginas_renderizadas: Dict[Tuple[Hashable, int, int], List[Segment]] = {}
+
 def limpar_tela():
     os.system("cls" if os.name == "nt" else "clear")
 
@@ -45,14 +60,109 @@ def mostrar_menu(opcoes, titulo_menu="MENU"):
         console.print(f"[green]{i}[/green] - {opcao}")
     console.print("[yellow]Escolha uma opção: [/yellow]", end="")
 
-def mostrar_tabela_produtos(produtos):
-    table = Table(title="📦 Produtos Disponíveis", header_style="bold magenta")
+def _tabela_produtos(produtos, legenda=None):
+    table = Table(title="📦 Produtos Disponíveis", header_style="bold magenta", caption=legenda)
     table.add_column("ID", justify="center")
     table.add_column("Nome")
     table.add_column("Preço (R$)", justify="right")
 
-    for p in produtos:
-        table.add_row(str(p["id"]), p["title"], f"R$ {p['price']:.2f}")
+    for p in map(Produto.de, produtos):
+        table.add_row(str(p.id), p.title, f"R$ {p.price:.2f}")
+
+    return table
+
+def _fatia(produtos, lidos: List[Any], inicio: int, fim: int) -> List[Any]:
+    """Itens [inicio:fim]; de um iterador, consome só o necessário (guardando em lidos)."""
+    if isinstance(produtos, Sequence):
+        return list(produtos[inicio:fim])
+    if len(lidos) < fim:
+        lidos.extend(itertools.islice(produtos, fim - len(lidos)))
+    return lidos[inicio:fim]
+
+def _renderizar_pagina(itens, legenda: str, chave: Optional[Tuple[Hashable, int, int]]) -> List[Segment]:
+    segmentos = _paginas_renderizadas.get(chave) if chave is not None else None
+    if segmentos is None:
+        segmentos = list(console.render(_tabela_produtos(itens, legenda)))
+        if chave is not None:
+            if len(_paginas_renderizadas) >= LIMITE_PAGINAS_CACHE:
+                del _paginas_renderizadas[next(iter(_paginas_renderizadas))]
+            _paginas_renderizadas[chave] = segmentos
+    return segmentos
+
+def mostrar_tabela_produtos(produtos: Iterable[Any], tamanho_pagina: int = TAMANHO_PAGINA,
+                            versao: Optional[Hashable] = None) -> None:
+    """Tabela paginada: formata só a página visível. Com versao (ex.: a do catálogo
+    mais os filtros), as páginas já desenhadas são reaproveitadas."""
+    if not isinstance(produtos, Sequence):
+        produtos = iter(produtos)
+    tamanho_pagina = max(1, tamanho_pagina)
+    lidos: List[Any] = []
+    total = len(produtos) if isinstance(produtos, Sequence) else None
+    pagina = 0
+
+    while True:
+        inicio = pagina * tamanho_pagina
+        # um item a mais só para saber se existe próxima página
+        itens = _fatia(produtos, lidos, inicio, inicio + tamanho_pagina + 1)
+        tem_proxima = len(itens) > tamanho_pagina
+        itens = itens[:tamanho_pagina]
+
+        if pagina == 0 and not tem_proxima:
+            console.print(_tabela_produtos(itens))  # cabe numa página: sem navegação
+            return
+
+        paginas = f"{pagina + 1}/{-(-total // tamanho_pagina)}" if total is not None else f"{pagina + 1}"
+        legenda = f"Página {paginas}"
+        chave = (versao, tamanho_pagina, pagina) if versao is not None else None
+        console.print(Segments(_renderizar_pagina(itens, legenda, chave)))
+
+        opcoes = ["[P]róxima"] if tem_proxima else []
+        if pagina > 0:
+            opcoes.append("[A]nterior")
+        opcoes += ["nº da página", "ENTER para sair"]
+        escolha = input(" | ".join(opcoes) + ": ").strip().upper()
+        if not escolha:
+            return
+        if escolha == "P" and tem_proxima:
+            pagina += 1
+        elif escolha == "A" and pagina > 0:
+            pagina -= 1
+        elif escolha.isdigit() and int(escolha) >= 1:
+            destino = int(escolha) - 1
+            if total is not None:
+                destino = min(destino, max(total - 1, 0) // tamanho_pagina)
+            elif not _fatia(produtos, lidos, destino * tamanho_pagina, destino * tamanho_pagina + 1):
+                destino = max(len(lidos) - 1, 0) // tamanho_pagina  # iterador acabou antes: vai para a última
+            pagina = destino
+
+def mostrar_tabela_facetas(facetas, medias: Optional[Dict[str, float]] = None):
+    table = Table(title="🗂️ Categorias", header_style="bold magenta")
+    table.add_column("#", justify="center")
+    table.add_column("Categoria")
+    table.add_column("Produtos", justify="right")
+    table.add_column("Menor preço (R$)", justify="right")
+    table.add_column("Maior preço (R$)", justify="right")
+    if medias is not None:
+        table.add_column("Preço médio (R$)", justify="right")
+
+    for i, f in enumerate(facetas, 1):
+        linha = [str(i), f.categoria, str(f.quantidade), f"R$ {f.preco_min:.2f}", f"R$ {f.preco_max:.2f}"]
+        if medias is not None:
+            linha.append(f"R$ {medias[f.categoria]:.2f}" if f.categoria in medias else "-")
+        table.add_row(*linha)
+
+    console.print(table)
+
+def mostrar_tabela_similares(pares):
+    table = Table(title="🔎 Você quis dizer", header_style="bold magenta")
+    table.add_column("ID", justify="center")
+    table.add_column("Nome")
+    table.add_column("Preço (R$)", justify="right")
+    table.add_column("Similaridade", justify="right")
+
+    for p, similaridade in pares:
+        p = Produto.de(p)
+        table.add_row(str(p.id), p.title, f"R$ {p.price:.2f}", f"{similaridade:.0%}")
 
     console.print(table)
 
@@ -62,8 +172,32 @@ def mostrar_tabela_pedidos(pedidos):
     table.add_column("Nome")
     table.add_column("Preço (R$)", justify="right")
 
-    for i, item in enumerate(pedidos, 1):
-        table.add_row(str(i), item[1], f"R$ {item[2]:.2f}")
+    for i, (_, nome, preco) in enumerate(pedidos, 1):
+        table.add_row(str(i), nome, f"R$ {preco:.2f}")
+
+    console.print(table)
+
+def mostrar_tabela_vendas_por_dia(dias):
+    table = Table(title="📅 Receita por Dia", header_style="bold yellow")
+    table.add_column("Dia", justify="center")
+    table.add_column("Pedidos", justify="right")
+    table.add_column("Receita (R$)", justify="right")
+
+    for dia, pedidos, receita in dias:
+        table.add_row(dia, str(pedidos), f"R$ {receita:.2f}")
+
+    console.print(table)
+
+def mostrar_tabela_mais_vendidos(produtos, titulo_tabela="🏆 Mais Vendidos"):
+    table = Table(title=titulo_tabela, header_style="bold magenta")
+    table.add_column("#", justify="center")
+    table.add_column("ID", justify="center")
+    table.add_column("Nome")
+    table.add_column("Unidades", justify="right")
+    table.add_column("Receita (R$)", justify="right")
+
+    for i, (id_produto, nome, quantidade, receita) in enumerate(produtos, 1):
+        table.add_row(str(i), str(id_produto), nome, str(quantidade), f"R$ {receita:.2f}")
 
     console.print(table)
 
@@ -78,6 +212,32 @@ def prompt(label: str, padrao: Optional[str] = None) -> str:
         return console.input(f"{label} [dim][{padrao}]: [/dim]") or padrao
     return console.input(f"{label}: ")
 
+def prompt_autocompletar(label: str, sugerir: Callable[[str], List[str]]) -> str:
+    """input() em que TAB completa com as sugestões para o texto já digitado."""
+    if readline is None:
+        return input(label)
+
+    opcoes: List[str] = []
+
+    def completar(texto: str, estado: int) -> Optional[str]:
+        if estado == 0:
+            opcoes[:] = sugerir(texto) if texto.strip() else []
+        return opcoes[estado] if estado < len(opcoes) else None
+
+    completer_antigo = readline.get_completer()
+    delims_antigos = readline.get_completer_delims()
+    readline.set_completer(completar)
+    readline.set_completer_delims("")  # completa a linha inteira, não só a última palavra
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    try:
+        return input(label)
+    finally:
+        readline.set_completer(completer_antigo)
+        readline.set_completer_delims(delims_antigos)
+
 def prompt_senha(label: str) -> str:
     return console.input(f"{label}: ", password=True)
 
@@ -24,7 +24,7 @@ def exibir_menu_principal():
         elif opcao == "2":
             pagamentos.realizar_pagamento()
         elif opcao == "3":
-            catalogo.exibir_catalogo()
+            catalogo.menu_catalogo()
         elif opcao == "4":
             pedidos.menu_pedidos()
         elif opcao == "5":
@@ -1,6 +1,8 @@
 # cadastros.py
-import src.utils.manipulacaoArquivos as manipulacaoArquivos
+import src.utils.repositorios as repositorios
 import src.interface.interface as interface
+import src.services.atualizador_catalogo as atualizador_catalogo
+from src.models.produto import Produto
 
 def cadastrar_item():
     interface.limpar_tela()
@@ -13,7 +15,9 @@ def cadastrar_item():
         preco = float(input("Preço: R$ "))
         descricao = input("Descrição: ")
         id_fake = gerar_id_produto()
-        manipulacaoArquivos.gravarProdutoFakeStore(id_fake, nome, preco, descricao)
+        produto = Produto(id_fake, nome, preco, descricao)
+        repositorios.obter().inserir_produto(produto)
+        atualizador_catalogo.salvar_local(produto)
         tipo_nome = "Produto" if tipo == "1" else "Roupa"
         interface.mensagem_sucesso(f"✅ {tipo_nome} '{nome}' cadastrado com sucesso.")
     else:
@@ -22,12 +26,13 @@ def cadastrar_item():
     interface.pausar()
 
 def gerar_id_produto():
-    produtos_locais = manipulacaoArquivos.lerProdutosLocais()
-    return max(p['id'] for p in produtos_locais) + 1 if produtos_locais else 21
+    # Sequência durável reservada em blocos: O(1) e sem colisão entre processos
+    return repositorios.obter().gerar_id_produto()
 
 def excluir_item():
     interface.limpar_tela()
-    produtos = manipulacaoArquivos.lerProdutosLocais()
+    catalogo = atualizador_catalogo.obter_catalogo()
+    produtos = catalogo.produtos_locais
 
     if not produtos:
         interface.mensagem_alerta("⚠️ Nenhum produto local para excluir.")
@@ -35,27 +40,25 @@ def excluir_item():
         return
 
     interface.titulo("🗑️ Exclusão de Produtos Locais")
-    interface.mostrar_tabela_produtos(produtos)
+    interface.mostrar_tabela_produtos(produtos, versao=(catalogo.versao, "locais"))
 
     try:
         id_excluir = int(input("Digite o ID do produto que deseja excluir: "))
-        produto = next((p for p in produtos if p['id'] == id_excluir), None)
+        produto = catalogo.buscar_local(id_excluir)
 
         if not produto:
             interface.mensagem_alerta("❌ Produto não encontrado.")
             interface.pausar()
             return
 
-        confirmacao = input(f"Tem certeza que deseja excluir '{produto['title']}'? [S/N]: ").strip().upper()
+        confirmacao = input(f"Tem certeza que deseja excluir '{produto.title}'? [S/N]: ").strip().upper()
         if confirmacao != "S":
             interface.mensagem_alerta("❌ Exclusão cancelada.")
             interface.pausar()
             return
 
-        produtos = [p for p in produtos if p['id'] != id_excluir]
-        with open("produtos_local.txt", "w") as f:
-            for p in produtos:
-                f.write(f"{p['id']};{p['title']};{p['price']};{p['description']}\n")
+        repositorios.obter().excluir_produto(id_excluir)
+        atualizador_catalogo.remover_local(id_excluir)
 
         interface.mensagem_sucesso("✅ Produto excluído com sucesso.")
     except ValueError:
@@ -65,7 +68,8 @@ def excluir_item():
 
 def editar_item():
     interface.limpar_tela()
-    produtos = manipulacaoArquivos.lerProdutosLocais()
+    catalogo = atualizador_catalogo.obter_catalogo()
+    produtos = catalogo.produtos_locais
 
     if not produtos:
         interface.mensagem_alerta("⚠️ Nenhum produto local para editar.")
@@ -73,29 +77,26 @@ def editar_item():
         return
 
     interface.titulo("🛠️ Edição de Produtos Locais")
-    interface.mostrar_tabela_produtos(produtos)
+    interface.mostrar_tabela_produtos(produtos, versao=(catalogo.versao, "locais"))
 
     try:
         id_editar = int(input("Digite o ID do produto que deseja editar: "))
-        produto = next((p for p in produtos if p['id'] == id_editar), None)
+        produto = catalogo.buscar_local(id_editar)
 
         if not produto:
             interface.mensagem_alerta("❌ Produto não encontrado.")
             interface.pausar()
             return
 
-        novo_nome = input(f"Novo nome ({produto['title']}): ") or produto['title']
-        novo_preco = input(f"Novo preço ({produto['price']}): ")
-        novo_preco = float(novo_preco) if novo_preco.strip() else produto['price']
-        nova_desc = input(f"Nova descrição ({produto['description']}): ") or produto['description']
+        novo_nome = input(f"Novo nome ({produto.title}): ") or produto.title
+        novo_preco = input(f"Novo preço ({produto.price}): ")
+        novo_preco = float(novo_preco) if novo_preco.strip() else produto.price
+        nova_desc = input(f"Nova descrição ({produto.description}): ") or produto.description
 
-        produto['title'] = novo_nome
-        produto['price'] = novo_preco
-        produto['description'] = nova_desc
-
-        with open("produtos_local.txt", "w") as f:
-            for p in produtos:
-                f.write(f"{p['id']};{p['title']};{p['price']};{p['description']}\n")
+        # Cópia: o produto antigo continua válido para quem ainda lê esta versão
+        atualizado = produto.copiar(title=novo_nome, price=novo_preco, description=nova_desc)
+        repositorios.obter().atualizar_produto(atualizado)
+        atualizador_catalogo.salvar_local(atualizado)
 
         interface.mensagem_sucesso("✅ Produto atualizado com sucesso.")
     except ValueError:
@@ -0,0 +1,104 @@
+"""
+produto.py
+Tipos compactos de produto e de item de pedido. Produto usa __slots__ (sem
+dict por instância) e ItemPedido é uma tupla nomeada; os títulos são
+internados, então o mesmo nome repetido no catálogo, nos carrinhos e nos
+pedidos ocupa memória uma vez só.
+Produto ainda aceita produto["campo"] e compara igual ao dict equivalente,
+para quem trata produtos como no formato antigo (JSON da Fake Store).
+"""
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Union
+
+CAMPOS = ("id", "title", "price", "description", "category")
+
+
+def _internar(texto: Any) -> Any:
+    return sys.intern(texto) if type(texto) is str else texto
+
+
+class Produto:
+    __slots__ = CAMPOS
+
+    def __init__(self, id: int, title: str, price: float, description: Optional[str] = None,
+                 category: Optional[str] = None) -> None:
+        self.id = id
+        self.title = _internar(title)
+        self.price = price
+        self.description = description
+        self.category = _internar(category)
+
+    @classmethod
+    def de(cls, dados: Union["Produto", Mapping]) -> "Produto":
+        """Produto a partir de um dict (campos extras, como image e rating, são descartados)."""
+        if isinstance(dados, Produto):
+            return dados
+        return cls(dados["id"], dados["title"], dados["price"], dados.get("description"), dados.get("category"))
+
+    def copiar(self, **alteracoes: Any) -> "Produto":
+        """Cópia com os campos alterados; o original continua válido para quem ainda o lê."""
+        novo = Produto(self.id, self.title, self.price, self.description, self.category)
+        for campo, valor in alteracoes.items():
+            novo[campo] = valor
+        return novo
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Formato dict antigo; campos opcionais vazios ficam de fora."""
+        return {campo: getattr(self, campo) for campo in CAMPOS if getattr(self, campo) is not None}
+
+    # --- compatibilidade com o formato dict ---
+    def __getitem__(self, campo: str) -> Any:
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __setitem__(self, campo: str, valor: Any) -> None:
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        setattr(self, campo, _internar(valor) if campo in ("title", "category") else valor)
+
+    def __contains__(self, campo: object) -> bool:
+        return campo in CAMPOS and getattr(self, campo) is not None  # type: ignore[arg-type]
+
+    def get(self, campo: str, padrao: Any = None) -> Any:
+        valor = getattr(self, campo, None) if campo in CAMPOS else None
+        return padrao if valor is None else valor
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.para_dict())
+
+    def __eq__(self, outro: object) -> bool:
+        if isinstance(outro, Produto):
+            return all(getattr(self, c) == getattr(outro, c) for c in CAMPOS)
+        if isinstance(outro, Mapping):
+            return self.para_dict() == dict(outro)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]  # mutável, como o dict que substitui
+
+    def __repr__(self) -> str:
+        return f"Produto({self.para_dict()!r})"
+
+
+class ItemPedido(NamedTuple):
+    """Item do carrinho; continua sendo a tupla (id, nome, preço) de antes."""
+    id: int
+    nome: str
+    preco: float
+
+    @classmethod
+    def do_produto(cls, produto: Union[Produto, Mapping]) -> "ItemPedido":
+        produto = Produto.de(produto)
+        return cls(produto.id, produto.title, produto.price)  # title já internado
+
+    @classmethod
+    def de(cls, item: Any) -> "ItemPedido":
+        if isinstance(item, ItemPedido):
+            return item
+        return cls(item[0], _internar(item[1]), item[2])
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "nome": self.nome, "preco": self.preco}
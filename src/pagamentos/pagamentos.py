@@ -1,33 +1,20 @@
-import src.utils.manipulacaoArquivos as manipulacaoArquivos
-import json
+import src.utils.repositorios as repositorios
 import src.interface.interface as interface
 
 def realizar_pagamento():
     interface.limpar_tela()
     interface.titulo("💳 PAGAMENTO DE PEDIDOS")
 
+    repositorio = repositorios.obter()
     try:
-        arquivo = manipulacaoArquivos.lerArquivo("Pedidos.txt", "r")
-        pedidos = arquivo.readlines()
-        arquivo.close()
-
-        if not pedidos:
+        # Quantidade e soma vêm prontas do repositório (livro de pedidos no backend
+        # em arquivo); o custo não cresce com o número de pedidos acumulados
+        quantidade, soma = repositorio.resumo_pedidos()
+        if not quantidade:
             interface.mensagem_alerta("⚠️ Nenhum pedido encontrado.")
             interface.pausar()
             return
 
-        soma = 0.0
-        for linha in pedidos:
-            try:
-                partes = linha.strip().split(";", 1)
-                if len(partes) < 2:
-                    continue
-                lista = json.loads(partes[1])
-                for item in lista:
-                    soma += float(item["preco"])
-            except Exception as e:
-                interface.mensagem_alerta(f"Erro ao processar linha: {linha} → {e}")
-
         print(f"\n🧾 Valor total dos pedidos: R$ {soma:.2f}")
         print("\nSelecione a forma de pagamento:")
         print("1 - Crédito")
@@ -46,8 +33,7 @@ def realizar_pagamento():
         metodo = metodos[opcao]
         interface.mensagem_sucesso(f"✅ Pagamento de R$ {soma:.2f} realizado via {metodo.upper()}!")
 
-        with open("Pedidos.txt", "w") as f:
-            f.truncate()
+        repositorio.apagar_pedidos()
 
         interface.mensagem_sucesso("🧾 Pedidos quitados e arquivo zerado.")
     except FileNotFoundError:
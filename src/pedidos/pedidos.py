@@ -1,8 +1,9 @@
 from datetime import datetime
-import src.utils.manipulacaoArquivos as manipulacaoArquivos
-import requests
-import json
+import src.utils.repositorios as repositorios
 import src.interface.interface as interface
+import src.services.atualizador_catalogo as atualizador_catalogo
+import src.services.analise_vendas as analise_vendas
+from src.models.produto import ItemPedido
 
 listaPedido = []
 
@@ -13,6 +14,7 @@ def menu_pedidos():
             "Finalizar Pedido",
             "Ver Itens do Pedido",
             "Remover Item do Pedido",
+            "Relatório de Vendas",
             "Voltar"
         ]
         interface.mostrar_menu(opcoes, "📋 MENU DE PEDIDOS")
@@ -27,6 +29,8 @@ def menu_pedidos():
         elif opcao == "4":
             remover_item_pedido()
         elif opcao == "5":
+            analise_vendas.relatorio_vendas()
+        elif opcao == "6":
             break
         else:
             interface.mensagem_alerta("❌ Opção inválida.")
@@ -35,22 +39,34 @@ def menu_pedidos():
 def adicionar_pedido():
     global listaPedido
     interface.limpar_tela()
-    try:
-        res = requests.get("https://fakestoreapi.com/products")
-        produtos_api = res.json() if res.status_code == 200 else []
-    except:
-        produtos_api = []
-
-    produtos_locais = manipulacaoArquivos.lerProdutosLocais()
-    todos = produtos_api + produtos_locais
+    catalogo = atualizador_catalogo.obter_catalogo()
 
-    interface.mostrar_tabela_produtos(todos)
+    # Sem imprimir a tabela inteira: TAB autocompleta pelo título e o texto digitado vira sugestões
+    entrada = interface.prompt_autocompletar(
+        "Digite o ID do produto, o começo do nome (TAB completa) ou ENTER para ver todos: ",
+        lambda texto: [p.title for p in catalogo.sugerir(texto)],
+    ).strip()
+    if not entrada:
+        interface.mostrar_tabela_produtos(catalogo.todos, versao=(catalogo.versao, "todos"))
+        entrada = input("Digite o ID do produto desejado: ")
+    elif not entrada.isdigit():
+        resultados = catalogo.sugerir(entrada) or catalogo.buscar_texto(entrada)
+        parecidos = catalogo.buscar_parecidos(entrada) if not resultados else []
+        if resultados:
+            interface.mostrar_tabela_produtos(resultados)
+        elif parecidos:
+            interface.mostrar_tabela_similares(parecidos)
+        else:
+            interface.mensagem_alerta("❌ Nenhum produto encontrado.")
+            interface.pausar()
+            return
+        entrada = input("Digite o ID do produto desejado: ")
 
     try:
-        id_produto = int(input("Digite o ID do produto desejado: "))
-        produto = next((p for p in todos if p["id"] == id_produto), None)
+        id_produto = int(entrada)
+        produto = catalogo.buscar(id_produto)
         if produto:
-            listaPedido.append((produto["id"], produto["title"], produto["price"]))
+            listaPedido.append(ItemPedido.do_produto(produto))
             interface.mensagem_sucesso("✅ Produto adicionado ao pedido.")
         else:
             interface.mensagem_alerta("❌ Produto não encontrado.")
@@ -69,9 +85,9 @@ def fechar_pedido():
     nome = input("Nome do cliente: ")
     cpf = input("CPF do cliente: ")
     now = datetime.now()
-    manipulacaoArquivos.gravarPedidos(listaPedido, now)
+    id_pedido = repositorios.obter().gravar_pedido(listaPedido, now)
     listaPedido = []
-    interface.mensagem_sucesso("✅ Pedido finalizado.")
+    interface.mensagem_sucesso(f"✅ Pedido nº {id_pedido} finalizado.")
     interface.pausar()
 
 def listar_pedidos():
@@ -98,7 +114,7 @@ def remover_item_pedido():
             interface.mensagem_alerta("❌ Remoção cancelada.")
         elif 1 <= opcao <= len(listaPedido):
             removido = listaPedido.pop(opcao - 1)
-            interface.mensagem_sucesso(f"✅ Item removido: {removido[1]}")
+            interface.mensagem_sucesso(f"✅ Item removido: {ItemPedido.de(removido).nome}")
         else:
             interface.mensagem_alerta("❌ Número inválido.")
     except ValueError:
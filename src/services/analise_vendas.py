@@ -0,0 +1,131 @@
+"""
+analise_vendas.py
+Relatório de vendas sobre o histórico de pedidos: receita por dia, produtos
+mais vendidos (por quantidade e por receita), ticket médio e itens por pedido.
+Os números saem dos agregados por dia que o repositório mantém a cada pedido
+gravado (repositorio.vendas_por_dia); o histórico não é relido para montar o
+relatório.
+
+Uso: python -m src.services.analise_vendas [--inicio 2025-08-01] [--fim 2025-09-01] [--top 5]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import src.utils.repositorios as repositorios
+from src.utils.agregacao_pedidos import Agregado
+
+CRITERIOS = ("quantidade", "receita")
+TOP_PADRAO = 5
+_DIA = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+class ProdutoVendido(NamedTuple):
+    id: Any
+    nome: str
+    quantidade: int
+    receita: float
+
+
+class ResumoVendas:
+    """Vendas de um período, dia a dia (por_dia) e somadas (total)."""
+    __slots__ = ("por_dia", "total")
+
+    def __init__(self, por_dia: Dict[str, Agregado]) -> None:
+        self.por_dia = por_dia
+        self.total = Agregado()
+        for vendas in por_dia.values():
+            self.total.juntar(vendas)
+
+    @property
+    def pedidos(self) -> int:
+        return self.total.pedidos
+
+    @property
+    def receita(self) -> float:
+        return self.total.total
+
+    @property
+    def ticket_medio(self) -> float:
+        return self.total.total / self.total.pedidos if self.total.pedidos else 0.0
+
+    @property
+    def itens_por_pedido(self) -> float:
+        return self.total.itens / self.total.pedidos if self.total.pedidos else 0.0
+
+    def receita_por_dia(self) -> List[Tuple[str, int, float]]:
+        """[(dia, pedidos, receita)] em ordem de data."""
+        return [(dia, vendas.pedidos, vendas.total) for dia, vendas in sorted(self.por_dia.items())]
+
+    def mais_vendidos(self, n: int = TOP_PADRAO, criterio: str = "quantidade") -> List[ProdutoVendido]:
+        """Os n produtos com mais unidades vendidas ou mais receita; empates pelo outro critério."""
+        if criterio not in CRITERIOS:
+            raise ValueError(f"Critério desconhecido: {criterio!r} (opções: {', '.join(CRITERIOS)})")
+        produtos = [ProdutoVendido(id_produto, nome, quantidade, soma)
+                    for id_produto, (nome, quantidade, soma) in self.total.por_produto.items()]
+        if criterio == "quantidade":
+            produtos.sort(key=lambda p: (-p.quantidade, -p.receita))
+        else:
+            produtos.sort(key=lambda p: (-p.receita, -p.quantidade))
+        return produtos[:max(0, n)]
+
+
+def resumo(inicio: Any = None, fim: Any = None,
+           repositorio: Optional[repositorios.Repositorio] = None) -> ResumoVendas:
+    """Vendas com inicio <= dia < fim (datas "AAAA-MM-DD", date ou datetime; None = sem limite)."""
+    repositorio = repositorio or repositorios.obter()
+    return ResumoVendas(repositorio.vendas_por_dia(inicio, fim))
+
+
+def mostrar_resumo(vendas: ResumoVendas, top: int = TOP_PADRAO) -> None:
+    import src.interface.interface as interface
+
+    if not vendas.pedidos:
+        interface.mensagem_alerta("⚠️ Nenhuma venda no período.")
+        return
+    interface.mensagem_sucesso(
+        f"💰 {vendas.pedidos} pedido(s), receita R$ {vendas.receita:.2f}, "
+        f"ticket médio R$ {vendas.ticket_medio:.2f}, {vendas.itens_por_pedido:.1f} item(ns) por pedido."
+    )
+    interface.mostrar_tabela_vendas_por_dia(vendas.receita_por_dia())
+    interface.mostrar_tabela_mais_vendidos(vendas.mais_vendidos(top, "quantidade"), "🏆 Mais vendidos (unidades)")
+    interface.mostrar_tabela_mais_vendidos(vendas.mais_vendidos(top, "receita"), "💵 Mais vendidos (receita)")
+
+
+def _pedir_dia(label: str) -> Optional[str]:
+    """Dia digitado, None se vazio; ValueError se fora do formato (o relatório é cancelado)."""
+    dia = input(label).strip()
+    if dia and not _DIA.match(dia):
+        raise ValueError(dia)
+    return dia or None
+
+
+def relatorio_vendas() -> None:
+    import src.interface.interface as interface
+
+    interface.limpar_tela()
+    try:
+        inicio = _pedir_dia("Data inicial (AAAA-MM-DD, ENTER para desde o início): ")
+        fim = _pedir_dia("Data final, exclusiva (AAAA-MM-DD, ENTER para até hoje): ")
+    except ValueError:
+        interface.mensagem_alerta("❌ Use o formato AAAA-MM-DD.")
+    else:
+        mostrar_resumo(resumo(inicio, fim))
+    interface.pausar()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Relatório de vendas do histórico de pedidos.")
+    parser.add_argument("--inicio", help="primeiro dia (AAAA-MM-DD)")
+    parser.add_argument("--fim", help="dia seguinte ao último (AAAA-MM-DD)")
+    parser.add_argument("--top", type=int, default=TOP_PADRAO, help="produtos em cada ranking")
+    args = parser.parse_args(argv)
+
+    mostrar_resumo(resumo(args.inicio, args.fim), args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
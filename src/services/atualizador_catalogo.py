@@ -0,0 +1,113 @@
+"""
+atualizador_catalogo.py
+Snapshot do catálogo completo (Fake Store + produtos locais) mantido por uma
+thread em segundo plano (stale-while-revalidate): quem lê recebe sempre a última
+versão boa na hora, e a nova versão é trocada de uma vez só quando fica pronta.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import src.services.cache_catalogo as cache_catalogo
+from src.models.produto import Produto
+from src.services.indice_catalogo import Catalogo
+import src.utils.repositorios as repositorios
+from src.utils.logs import get_logger
+
+# Atualiza antes de o cache expirar, para ninguém pagar a latência da API.
+FRACAO_TTL = 0.8
+
+log = get_logger("catalogo")
+
+
+_lock = threading.Lock()
+_snapshot: Optional[Catalogo] = None
+_fontes: Optional[Tuple[List[Dict[str, Any]], Optional[Hashable]]] = None  # (API, assinatura dos locais) do snapshot
+_thread: Optional[threading.Thread] = None
+_parar = threading.Event()
+
+
+def _publicar(produtos_api: List[Dict[str, Any]], produtos_locais: List[Produto]) -> Catalogo:
+    global _snapshot
+    novo = Catalogo(produtos_api, produtos_locais)  # índices montados uma vez por versão
+    _snapshot = novo  # troca atômica: leitores pegam o antigo ou o novo, nunca um meio-termo
+    return novo
+
+
+def recarregar(forcar_api: bool = False, so_se_mudou: bool = False) -> Catalogo:
+    """Monta um snapshot novo a partir da API (via cache) e do arquivo local.
+    Com so_se_mudou, mantém o atual (e os índices dele) se a API respondeu o mesmo
+    catálogo (304 ou lista igual) e os produtos locais têm a mesma assinatura."""
+    global _fontes
+    import src.services.catalogo as catalogo  # import tardio: catalogo também usa este módulo
+
+    produtos_api = catalogo.buscar_produtos_api(forcar=forcar_api)  # fora do lock: pode demorar
+    repositorio = repositorios.obter()
+    with _lock:
+        assinatura = repositorio.assinatura_produtos()  # antes de ler: mudança no meio é vista na próxima
+        if so_se_mudou and _snapshot is not None and _fontes is not None and assinatura is not None \
+                and _fontes[1] == assinatura and (_fontes[0] is produtos_api or _fontes[0] == produtos_api):
+            return _snapshot
+        _fontes = (produtos_api, assinatura)
+        return _publicar(produtos_api, repositorio.listar_produtos())
+
+
+def obter_catalogo() -> Catalogo:
+    """Retorna o catálogo atual; só bloqueia se ainda não existe nenhum."""
+    snapshot = _snapshot
+    if snapshot is None:
+        snapshot = recarregar()
+    return snapshot
+
+
+def salvar_local(produto: Produto) -> None:
+    """Aplica um cadastro/edição ao catálogo atual sem reler o arquivo."""
+    with _lock:
+        if _snapshot is not None:
+            _snapshot.salvar_local(produto)
+
+
+def remover_local(id_produto: int) -> None:
+    with _lock:
+        if _snapshot is not None:
+            _snapshot.remover_local(id_produto)
+
+
+def _laco(intervalo: float) -> None:
+    while True:
+        try:
+            recarregar(forcar_api=True, so_se_mudou=True)
+        except Exception as e:
+            log.debug("Falha ao atualizar o catálogo em segundo plano: %s", e)
+        if _parar.wait(intervalo):
+            return
+
+
+def iniciar(intervalo: Optional[float] = None) -> None:
+    """Sobe a thread de atualização (idempotente). A primeira carga já aquece o catálogo."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    if intervalo is None:
+        intervalo = max(1.0, cache_catalogo.TTL_SEGUNDOS * FRACAO_TTL)
+    _parar.clear()
+    _thread = threading.Thread(target=_laco, args=(intervalo,), name="atualizador-catalogo", daemon=True)
+    _thread.start()
+
+
+def parar(timeout: float = 1.0) -> None:
+    global _thread
+    _parar.set()
+    if _thread is not None:
+        _thread.join(timeout)
+    _thread = None
+
+
+def reiniciar() -> None:
+    """Para a thread e descarta o snapshot (usado em testes)."""
+    global _snapshot, _fontes
+    parar()
+    with _lock:
+        _snapshot = None
+        _fontes = None
@@ -0,0 +1,87 @@
+"""
+autocompletar.py
+Trie de prefixos sobre os títulos dos produtos para sugerir os K primeiros
+produtos a partir do que o usuário começou a digitar. Cada título entra pelo
+início e também a partir de cada palavra ("laranja" acha "Suco de Laranja").
+"""
+from __future__ import annotations
+
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from src.services.busca_produtos import STOPWORDS
+from src.utils.utils import normalizar_texto
+
+
+class _No:
+    __slots__ = ("filhos", "chaves")
+
+    def __init__(self) -> None:
+        self.filhos: Dict[str, _No] = {}
+        self.chaves: Optional[Set[Hashable]] = None  # só nos nós onde alguma entrada termina
+
+
+def _entradas(titulo: str) -> List[str]:
+    palavras = normalizar_texto(titulo).split()
+    entradas = [" ".join(palavras[i:]) for i, p in enumerate(palavras) if i == 0 or p not in STOPWORDS]
+    return list(dict.fromkeys(e for e in entradas if e))
+
+
+class TrieProdutos:
+    def __init__(self, itens: Iterable[Tuple[Hashable, str]] = ()) -> None:
+        self._raiz = _No()
+        self._entradas: Dict[Hashable, List[str]] = {}
+        for chave, titulo in itens:
+            self.adicionar(chave, titulo)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def adicionar(self, chave: Hashable, titulo: str) -> None:
+        if chave in self._entradas:
+            self.remover(chave)
+        entradas = _entradas(titulo)
+        self._entradas[chave] = entradas
+        for texto in entradas:
+            no = self._raiz
+            for c in texto:
+                no = no.filhos.setdefault(c, _No())
+            if no.chaves is None:
+                no.chaves = set()
+            no.chaves.add(chave)
+
+    def remover(self, chave: Hashable) -> None:
+        for texto in self._entradas.pop(chave, []):
+            caminho = [self._raiz]
+            for c in texto:
+                caminho.append(caminho[-1].filhos[c])
+            fim = caminho[-1]
+            fim.chaves.discard(chave)
+            if not fim.chaves:
+                fim.chaves = None
+            # poda os nós que ficaram vazios, de baixo para cima
+            for i in range(len(texto) - 1, -1, -1):
+                no = caminho[i + 1]
+                if no.filhos or no.chaves:
+                    break
+                del caminho[i].filhos[texto[i]]
+
+    def sugerir(self, prefixo: str, k: int = 10) -> List[Hashable]:
+        """Até k chaves cujos títulos (ou alguma palavra deles) começam com o prefixo, em ordem alfabética."""
+        no = self._raiz
+        for c in " ".join(normalizar_texto(prefixo).split()):
+            no = no.filhos.get(c)
+            if no is None:
+                return []
+
+        encontradas: List[Hashable] = []
+        vistas: Set[Hashable] = set()
+        pilha = [no]
+        while pilha and len(encontradas) < k:
+            atual = pilha.pop()
+            if atual.chaves:
+                for chave in sorted(atual.chaves, key=str):
+                    if chave not in vistas:
+                        vistas.add(chave)
+                        encontradas.append(chave)
+            pilha.extend(atual.filhos[c] for c in sorted(atual.filhos, reverse=True))
+        return encontradas[:k]
@@ -0,0 +1,86 @@
+"""
+busca_fuzzy.py
+Busca aproximada de títulos por trigramas de caracteres (tolerante a acentos e
+erros de digitação). A poda de candidatos usa só as listas de trigramas mais
+raras da consulta, então o custo não cresce com o tamanho do catálogo inteiro.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set, Tuple
+
+from src.utils.utils import normalizar_texto
+
+SIMILARIDADE_MINIMA = 0.3
+
+
+def trigramas(texto: str) -> FrozenSet[str]:
+    """Trigramas por palavra, com borda ("  su", " suc", ...) como no pg_trgm."""
+    grams: Set[str] = set()
+    for palavra in normalizar_texto(texto).split():
+        palavra = "".join(c for c in palavra if c.isalnum())
+        if not palavra:
+            continue
+        marcada = f"  {palavra} "
+        grams.update(marcada[i:i + 3] for i in range(len(marcada) - 2))
+    return frozenset(grams)
+
+
+class IndiceTrigramas:
+    """Índice invertido trigrama -> chaves, com similaridade de Jaccard na verificação."""
+
+    def __init__(self, itens: Iterable[Tuple[Hashable, str]] = ()) -> None:
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._grams: Dict[Hashable, FrozenSet[str]] = {}
+        for chave, titulo in itens:
+            self.adicionar(chave, titulo)
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def adicionar(self, chave: Hashable, titulo: str) -> None:
+        if chave in self._grams:
+            self.remover(chave)
+        grams = trigramas(titulo)
+        self._grams[chave] = grams
+        for g in grams:
+            self._postings.setdefault(g, set()).add(chave)
+
+    def remover(self, chave: Hashable) -> None:
+        for g in self._grams.pop(chave, frozenset()):
+            postings = self._postings[g]
+            postings.discard(chave)
+            if not postings:
+                del self._postings[g]
+
+    def buscar(self, consulta: str, limite: int = 10,
+               similaridade_minima: float = SIMILARIDADE_MINIMA) -> List[Tuple[Hashable, float]]:
+        """Retorna [(chave, similaridade)] com similaridade >= mínima, da maior para a menor."""
+        q = trigramas(consulta)
+        if not q:
+            return []
+
+        # Jaccard >= s exige pelo menos ceil(s*|q|) trigramas em comum; logo todo
+        # candidato aparece em alguma das (|q| - mínimo + 1) listas mais raras.
+        minimo_comum = max(1, math.ceil(similaridade_minima * len(q)))
+        listas = sorted((self._postings.get(g, set()) for g in q), key=len)
+        corte = len(q) - minimo_comum + 1
+        raras, restantes = listas[:corte], listas[corte:]
+
+        contagem: Dict[Hashable, int] = {}
+        for postings in raras:
+            for chave in postings:
+                contagem[chave] = contagem.get(chave, 0) + 1
+
+        resultados = []
+        for chave, comuns in contagem.items():
+            tamanho = len(self._grams[chave])
+            if tamanho * similaridade_minima > len(q) or len(q) * similaridade_minima > tamanho:
+                continue  # filtro de tamanho: não tem como atingir a similaridade mínima
+            comuns += sum(1 for postings in restantes if chave in postings)
+            similaridade = comuns / (len(q) + tamanho - comuns)
+            if similaridade >= similaridade_minima:
+                resultados.append((chave, similaridade))
+
+        return heapq.nlargest(limite, resultados, key=lambda r: r[1])
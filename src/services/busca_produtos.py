@@ -0,0 +1,102 @@
+"""
+busca_produtos.py
+Busca textual de produtos com índice invertido (título, descrição e categoria),
+tokens sem acento e ranking por TF-IDF ponderado por campo.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+from src.utils.utils import normalizar_texto
+
+PESOS_CAMPOS = {"title": 3.0, "category": 2.0, "description": 1.0}
+STOPWORDS = frozenset({"a", "o", "as", "os", "de", "da", "do", "das", "dos", "e",
+                       "em", "com", "para", "por", "um", "uma", "the", "and", "of", "for", "with"})
+
+_RE_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenizar(texto: str) -> List[str]:
+    return [t for t in _RE_TOKEN.findall(normalizar_texto(texto)) if t not in STOPWORDS]
+
+
+class IndiceTexto:
+    """Índice invertido termo -> {chave do produto: peso}; atualizado item a item."""
+
+    def __init__(self, itens: Iterable[Tuple[Hashable, Dict[str, Any]]] = ()) -> None:
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._termos: Dict[Hashable, Dict[str, float]] = {}
+        self._vocabulario: List[str] = []  # ordenado, para casar prefixos
+        for chave, produto in itens:
+            self.adicionar(chave, produto)
+
+    def __len__(self) -> int:
+        return len(self._termos)
+
+    def adicionar(self, chave: Hashable, produto: Dict[str, Any]) -> None:
+        if chave in self._termos:
+            self.remover(chave)
+        pesos: Dict[str, float] = defaultdict(float)
+        for campo, peso in PESOS_CAMPOS.items():
+            for termo in tokenizar(str(produto.get(campo) or "")):
+                pesos[termo] += peso
+        self._termos[chave] = dict(pesos)
+        for termo, peso in pesos.items():
+            postings = self._postings.get(termo)
+            if postings is None:
+                postings = self._postings[termo] = {}
+                insort(self._vocabulario, termo)
+            postings[chave] = peso
+
+    def remover(self, chave: Hashable) -> None:
+        for termo in self._termos.pop(chave, {}):
+            postings = self._postings[termo]
+            del postings[chave]
+            if not postings:
+                del self._postings[termo]
+                i = bisect_left(self._vocabulario, termo)
+                del self._vocabulario[i]
+
+    def _expandir(self, termo: str, limite: int = 50) -> List[str]:
+        """Termos do vocabulário que começam com `termo` (para a última palavra digitada)."""
+        i = bisect_left(self._vocabulario, termo)
+        encontrados = []
+        while i < len(self._vocabulario) and self._vocabulario[i].startswith(termo) and len(encontrados) < limite:
+            encontrados.append(self._vocabulario[i])
+            i += 1
+        return encontrados
+
+    def buscar(self, consulta: str, limite: int = 20) -> List[Tuple[Hashable, float]]:
+        """
+        Retorna [(chave, score)] do mais relevante ao menos relevante.
+        Produtos que casam mais palavras da consulta vêm primeiro; o score desempata.
+        """
+        termos = tokenizar(consulta)
+        if not termos:
+            return []
+        total = len(self._termos)
+        scores: Dict[Hashable, float] = defaultdict(float)
+        casados: Dict[Hashable, int] = defaultdict(int)
+
+        for posicao, termo in enumerate(termos):
+            variantes = [termo] if termo in self._postings else []
+            if posicao == len(termos) - 1:
+                variantes = self._expandir(termo) or variantes
+            vistos = set()
+            for variante in variantes:
+                postings = self._postings[variante]
+                idf = math.log(1 + total / len(postings))
+                fator = 1.0 if variante == termo else 0.5  # prefixo vale menos que palavra inteira
+                for chave, peso in postings.items():
+                    scores[chave] += peso * idf * fator
+                    if chave not in vistos:
+                        vistos.add(chave)
+                        casados[chave] += 1
+
+        ranking = heapq.nsmallest(limite, scores, key=lambda c: (-casados[c], -scores[c]))
+        return [(chave, scores[chave]) for chave in ranking]
@@ -0,0 +1,139 @@
+"""
+cache_catalogo.py
+Cache do catálogo da Fake Store com TTL, snapshot em disco e revalidação condicional
+(ETag / Last-Modified).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import src.services.http_cliente as http_cliente
+from src.utils.logs import get_logger
+
+API_URL = "https://fakestoreapi.com/products"
+TTL_SEGUNDOS = float(os.getenv("LOJA_CATALOGO_TTL", "300"))
+SNAPSHOT_PATH = os.getenv("LOJA_CATALOGO_SNAPSHOT", "catalogo_cache.json")
+
+log = get_logger("catalogo")
+
+_lock = threading.Lock()
+_estado: Dict[str, Any] = {}
+
+
+def limpar_cache() -> None:
+    """Esquece o catálogo em memória (o snapshot em disco é mantido)."""
+    with _lock:
+        _estado.clear()
+        _estado.update({
+            "produtos": None,
+            "etag": None,
+            "last_modified": None,
+            "obtido_em": 0.0,
+            "snapshot_lido": False,
+        })
+
+
+limpar_cache()
+
+
+def expirado(agora: Optional[float] = None) -> bool:
+    if _estado["produtos"] is None:
+        return True
+    agora = time.time() if agora is None else agora
+    return agora - _estado["obtido_em"] >= TTL_SEGUNDOS
+
+
+def idade() -> Optional[float]:
+    """Segundos desde a última confirmação do catálogo com a API (None se vazio)."""
+    if _estado["produtos"] is None:
+        return None
+    return time.time() - _estado["obtido_em"]
+
+
+def obter_produtos(forcar: bool = False) -> List[Dict[str, Any]]:
+    """
+    Retorna os produtos da Fake Store.
+    Dentro do TTL responde da memória; fora dele revalida com a API usando
+    If-None-Match / If-Modified-Since. Em caso de falha devolve a última cópia boa.
+    Com o disjuntor aberto a chamada falha na hora e a cópia antiga é servida.
+    A lista retornada é compartilhada: não modificar.
+    """
+    produtos = _estado["produtos"]
+    if produtos is not None and not forcar and not expirado():
+        return produtos
+
+    with _lock:
+        if not _estado["snapshot_lido"]:
+            _carregar_snapshot()
+        if forcar or expirado():
+            _revalidar()
+        return _estado["produtos"] if _estado["produtos"] is not None else []
+
+
+def _cabecalho(res: Any, nome: str) -> Optional[str]:
+    valor = res.headers.get(nome) if res.headers is not None else None
+    return valor if isinstance(valor, str) else None
+
+
+def _revalidar() -> None:
+    headers: Dict[str, str] = {}
+    if _estado["produtos"] is not None:
+        if _estado["etag"]:
+            headers["If-None-Match"] = _estado["etag"]
+        if _estado["last_modified"]:
+            headers["If-Modified-Since"] = _estado["last_modified"]
+
+    try:
+        res = http_cliente.get(API_URL, headers=headers)
+        if res.status_code == 304 and _estado["produtos"] is not None:
+            _estado["obtido_em"] = time.time()
+            _salvar_snapshot()
+            return
+        res.raise_for_status()
+        produtos = res.json()
+        if not isinstance(produtos, list):
+            raise ValueError("resposta da API não é uma lista")
+    except Exception as e:
+        log.debug("Falha ao revalidar catálogo: %s", e)
+        return
+
+    _estado["produtos"] = produtos
+    _estado["etag"] = _cabecalho(res, "ETag")
+    _estado["last_modified"] = _cabecalho(res, "Last-Modified")
+    _estado["obtido_em"] = time.time()
+    _salvar_snapshot()
+
+
+def _carregar_snapshot() -> None:
+    _estado["snapshot_lido"] = True
+    try:
+        with open(SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(dados, dict) or not isinstance(dados.get("produtos"), list):
+        return
+    _estado["produtos"] = dados["produtos"]
+    _estado["etag"] = dados.get("etag")
+    _estado["last_modified"] = dados.get("last_modified")
+    _estado["obtido_em"] = float(dados.get("obtido_em", 0.0))
+
+
+def _salvar_snapshot() -> None:
+    dados = {
+        "produtos": _estado["produtos"],
+        "etag": _estado["etag"],
+        "last_modified": _estado["last_modified"],
+        "obtido_em": _estado["obtido_em"],
+    }
+    tmp = SNAPSHOT_PATH + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(tmp, SNAPSHOT_PATH)
+    except (OSError, TypeError, ValueError) as e:
+        log.debug("Não foi possível gravar o snapshot do catálogo: %s", e)
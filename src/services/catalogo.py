@@ -1,33 +1,86 @@
-import requests
-import src.utils.manipulacaoArquivos as manipulacaoArquivos
 import src.interface.interface as interface
+import src.services.cache_catalogo as cache_catalogo
+import src.services.atualizador_catalogo as atualizador_catalogo
 
-def buscar_produtos_api():
+PRECO_PROMOCIONAL = 60.0
+
+def _ler_preco(texto, padrao):
     try:
-        res = requests.get("https://fakestoreapi.com/products")
-        res.raise_for_status()
-        return res.json()
-    except:
-        return []
-    
+        return float(input(texto).strip().replace(",", "."))
+    except ValueError:
+        return padrao
+
+def buscar_produtos_api(forcar=False):
+    return cache_catalogo.obter_produtos(forcar)
+
+def menu_catalogo():
+    while True:
+        opcoes = [
+            "Ver Catálogo",
+            "Buscar Produtos",
+            "Voltar"
+        ]
+        interface.mostrar_menu(opcoes, "🛍️ MENU DO CATÁLOGO")
+        opcao = input()
+
+        if opcao == "1":
+            exibir_catalogo()
+        elif opcao == "2":
+            buscar_produtos()
+        elif opcao == "3":
+            break
+        else:
+            interface.mensagem_alerta("❌ Opção inválida.")
+            interface.pausar()
+
+def buscar_produtos():
+    interface.limpar_tela()
+    interface.titulo("🔎 BUSCA DE PRODUTOS")
+    consulta = input("Buscar por nome, descrição ou categoria: ").strip()
+
+    catalogo = atualizador_catalogo.obter_catalogo()
+    resultados = catalogo.buscar_texto(consulta) if consulta else []
+    parecidos = catalogo.buscar_parecidos(consulta) if consulta and not resultados else []
+    if resultados:
+        interface.mostrar_tabela_produtos(resultados)
+    elif parecidos:
+        interface.mostrar_tabela_similares(parecidos)
+    else:
+        interface.mensagem_alerta("❌ Nenhum produto encontrado.")
+    interface.pausar()
+
+def _escolher_categoria(catalogo):
+    facetas = catalogo.facetas()
+    if len(facetas) < 2:
+        return None
+    interface.mostrar_tabela_facetas(facetas, catalogo.colunar().preco_medio_por_categoria())
+    escolha = input("Filtrar por categoria (número, ENTER para todas): ").strip()
+    if escolha.isdigit() and 1 <= int(escolha) <= len(facetas):
+        return facetas[int(escolha) - 1].categoria
+    return None
+
 def exibir_catalogo():
     interface.limpar_tela()
     interface.titulo("🛍️ CATÁLOGO DE PRODUTOS")
-    promocao = input("Deseja ver o catálogo promocional (preço < R$60)? [S/N]: ").strip().upper()
+    promocao = input(f"Deseja ver o catálogo promocional (preço < R${PRECO_PROMOCIONAL:.0f})? [S/N]: ").strip().upper()
+    limite = _ler_preco(f"Preço máximo (R$) [{PRECO_PROMOCIONAL:.0f}]: ", PRECO_PROMOCIONAL) if promocao == "S" else None
 
-    produtos_api = buscar_produtos_api()
-    if not produtos_api:
+    catalogo = atualizador_catalogo.obter_catalogo()
+    if not catalogo.produtos_api:
         interface.mensagem_alerta("❌ Erro ao acessar a Fake Store API.")
 
-    produtos_locais = manipulacaoArquivos.lerProdutosLocais()
-    todos_produtos = produtos_api + produtos_locais
+    todos_produtos = catalogo.todos
 
     if not todos_produtos:
         interface.mensagem_alerta("Nenhum produto para exibir.")
         interface.pausar()
         return
-    
-    filtrados = [p for p in todos_produtos if p["price"] < 60] if promocao == "S" else todos_produtos
 
-    interface.mostrar_tabela_produtos(filtrados)
+    categoria = _escolher_categoria(catalogo)
+    if limite is not None or categoria is not None:
+        filtrados = catalogo.faixa_preco(maximo=limite, categoria=categoria)
+    else:
+        filtrados = todos_produtos
+
+    interface.mostrar_tabela_produtos(filtrados, versao=(catalogo.versao, limite, categoria))
     interface.pausar()
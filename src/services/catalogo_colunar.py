@@ -0,0 +1,128 @@
+"""
+catalogo_colunar.py
+Visão em colunas do catálogo para varreduras do catálogo inteiro (filtros de
+preço, contagens, médias por categoria): ids, preços e códigos de categoria em
+buffers tipados (array, ou NumPy se instalado) e títulos numa tabela de
+strings. Os predicados devolvem máscaras (uma posição por produto) que os
+agregados consomem sem passar por dict algum.
+"""
+from __future__ import annotations
+
+import itertools
+import operator
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.models.produto import Produto
+
+try:
+    import numpy as np
+except ImportError:  # opcional: sem NumPy as colunas ficam em array e as operações em C via map/compress
+    np = None
+
+# Máscara: ndarray de bool com NumPy, bytearray de 0/1 sem ele
+Mascara = Any
+
+
+class CatalogoColunar:
+    """Colunas de uma versão do catálogo, na mesma ordem de `produtos`. Somente leitura."""
+
+    def __init__(self, produtos: Sequence[Produto], categoria_de: Callable[[Produto], str]) -> None:
+        self._produtos = produtos
+        self.titulos: List[str] = [p.title for p in produtos]  # já internados pelo Produto
+        self.categorias: List[str] = []  # código -> nome
+        codigo_de: Dict[str, int] = {}
+        codigos = array("I")
+        for p in produtos:
+            nome = categoria_de(p)
+            codigo = codigo_de.get(nome)
+            if codigo is None:
+                codigo = codigo_de[nome] = len(self.categorias)
+                self.categorias.append(nome)
+            codigos.append(codigo)
+        self._codigo_de = codigo_de
+        ids = array("q", (p.id for p in produtos))
+        precos = array("d", (float(p.price) for p in produtos))
+        if np is not None:
+            self.ids, self.precos, self.codigos = np.frombuffer(ids, np.int64), np.frombuffer(precos), \
+                np.frombuffer(codigos, np.uint32)
+        else:
+            self.ids, self.precos, self.codigos = ids, precos, codigos
+
+    def __len__(self) -> int:
+        return len(self.precos)
+
+    # --- predicados ---
+
+    def _todos(self) -> Mascara:
+        return np.ones(len(self), bool) if np is not None else bytearray(b"\x01") * len(self)
+
+    def _e(self, a: Mascara, b: Mascara) -> Mascara:
+        return a & b if np is not None else bytearray(map(operator.and_, a, b))
+
+    def selecionar(self, minimo: Optional[float] = None, maximo: Optional[float] = None,
+                   categoria: Optional[str] = None) -> Mascara:
+        """Máscara de minimo <= preço < maximo (e da categoria, se dada)."""
+        mascara = None
+        if categoria is not None:
+            codigo = self._codigo_de.get(categoria)
+            if codigo is None:
+                return np.zeros(len(self), bool) if np is not None else bytearray(len(self))
+            mascara = self.codigos == codigo if np is not None else bytearray(map(codigo.__eq__, self.codigos))
+        for limite, comparacao in ((minimo, operator.ge), (maximo, operator.lt)):
+            if limite is None:
+                continue
+            limite = float(limite)
+            if np is not None:
+                parcial = comparacao(self.precos, limite)
+            else:  # limite <= preço  /  limite > preço, aplicado pela C em cada posição
+                parcial = bytearray(map((limite.__le__ if comparacao is operator.ge else limite.__gt__), self.precos))
+            mascara = parcial if mascara is None else self._e(mascara, parcial)
+        return self._todos() if mascara is None else mascara
+
+    # --- agregados ---
+
+    def contar(self, mascara: Optional[Mascara] = None) -> int:
+        if mascara is None:
+            return len(self)
+        return int(mascara.sum()) if np is not None else mascara.count(1)
+
+    def somar_precos(self, mascara: Optional[Mascara] = None) -> float:
+        if np is not None:
+            return float(self.precos.sum() if mascara is None else self.precos[mascara].sum())
+        return sum(self.precos if mascara is None else itertools.compress(self.precos, mascara))
+
+    def preco_medio(self, mascara: Optional[Mascara] = None) -> Optional[float]:
+        quantidade = self.contar(mascara)
+        return self.somar_precos(mascara) / quantidade if quantidade else None
+
+    def _por_categoria(self) -> Tuple[List[int], List[float]]:
+        if np is not None:
+            n = len(self.categorias)
+            return np.bincount(self.codigos, minlength=n).tolist(), \
+                np.bincount(self.codigos, weights=self.precos, minlength=n).tolist()
+        contagens = [0] * len(self.categorias)
+        somas = [0.0] * len(self.categorias)
+        for codigo, preco in zip(self.codigos, self.precos):
+            contagens[codigo] += 1
+            somas[codigo] += preco
+        return contagens, somas
+
+    def contagem_por_categoria(self) -> Dict[str, int]:
+        contagens, _ = self._por_categoria()
+        return dict(zip(self.categorias, contagens))
+
+    def preco_medio_por_categoria(self) -> Dict[str, float]:
+        contagens, somas = self._por_categoria()
+        return {nome: soma / n for nome, n, soma in zip(self.categorias, contagens, somas) if n}
+
+    # --- volta para produtos ---
+
+    def posicoes(self, mascara: Mascara) -> List[int]:
+        if np is not None:
+            return np.flatnonzero(mascara).tolist()
+        return list(itertools.compress(range(len(self)), mascara))
+
+    def produtos(self, mascara: Mascara) -> List[Produto]:
+        """Produtos selecionados, na ordem do catálogo."""
+        return [self._produtos[i] for i in self.posicoes(mascara)]
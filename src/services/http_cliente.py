@@ -0,0 +1,150 @@
+"""
+http_cliente.py
+Cliente HTTP compartilhado para chamadas externas: sessão com keep-alive,
+timeouts por chamada, retentativas com backoff e disjuntor (circuit breaker).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils.logs import get_logger
+
+TIMEOUT_CONEXAO = float(os.getenv("LOJA_HTTP_TIMEOUT_CONEXAO", "3.05"))
+TIMEOUT_LEITURA = float(os.getenv("LOJA_HTTP_TIMEOUT_LEITURA", "5"))
+MAX_RETENTATIVAS = int(os.getenv("LOJA_HTTP_RETENTATIVAS", "2"))
+BACKOFF_SEGUNDOS = 0.3
+LIMITE_FALHAS = 3
+TEMPO_ABERTO_SEGUNDOS = 30.0
+
+log = get_logger("http")
+
+
+class CircuitoAberto(requests.RequestException):
+    """Disparada quando o disjuntor do host está aberto e a chamada nem é feita."""
+
+
+class Disjuntor:
+    """
+    Disjuntor simples por host.
+    fechado -> (LIMITE_FALHAS falhas seguidas) -> aberto -> (TEMPO_ABERTO) -> meio-aberto,
+    onde uma única chamada de teste decide se volta a fechar ou reabre.
+    """
+
+    def __init__(self, limite_falhas: int = LIMITE_FALHAS,
+                 tempo_aberto: float = TEMPO_ABERTO_SEGUNDOS) -> None:
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self._falhas = 0
+        self._aberto_em: Optional[float] = None
+        self._em_teste = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> str:
+        if self._aberto_em is None:
+            return "fechado"
+        if time.monotonic() - self._aberto_em < self.tempo_aberto:
+            return "aberto"
+        return "meio-aberto"
+
+    def permitir(self) -> bool:
+        with self._lock:
+            estado = self.estado
+            if estado == "fechado":
+                return True
+            if estado == "aberto" or self._em_teste:
+                return False
+            self._em_teste = True
+            return True
+
+    def registrar_sucesso(self) -> None:
+        with self._lock:
+            self._falhas = 0
+            self._aberto_em = None
+            self._em_teste = False
+
+    def registrar_falha(self) -> None:
+        with self._lock:
+            self._falhas += 1
+            if self._em_teste or self._falhas >= self.limite_falhas:
+                if self._aberto_em is None or self._em_teste:
+                    log.warning("Disjuntor aberto após %d falha(s) seguida(s)", self._falhas)
+                self._aberto_em = time.monotonic()
+            self._em_teste = False
+
+
+_lock = threading.Lock()
+_sessao: Optional[requests.Session] = None
+_disjuntores: Dict[str, Disjuntor] = {}
+
+
+def _criar_sessao() -> requests.Session:
+    retentativas = Retry(
+        total=MAX_RETENTATIVAS,
+        backoff_factor=BACKOFF_SEGUNDOS,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retentativas)
+    sessao = requests.Session()
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    return sessao
+
+
+def obter_sessao() -> requests.Session:
+    global _sessao
+    if _sessao is None:
+        with _lock:
+            if _sessao is None:
+                _sessao = _criar_sessao()
+    return _sessao
+
+
+def disjuntor_para(url: str) -> Disjuntor:
+    host = urlsplit(url).netloc
+    with _lock:
+        if host not in _disjuntores:
+            _disjuntores[host] = Disjuntor()
+        return _disjuntores[host]
+
+
+def reiniciar() -> None:
+    """Fecha a sessão e zera os disjuntores (usado em testes e no encerramento)."""
+    global _sessao
+    with _lock:
+        if _sessao is not None:
+            _sessao.close()
+        _sessao = None
+        _disjuntores.clear()
+
+
+def get(url: str, headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Tuple[float, float]] = None) -> requests.Response:
+    """GET pela sessão compartilhada; falha na hora com CircuitoAberto se o host está degradado."""
+    disjuntor = disjuntor_para(url)
+    if not disjuntor.permitir():
+        raise CircuitoAberto(f"Disjuntor aberto para {urlsplit(url).netloc}")
+
+    sucesso = False
+    try:
+        res = obter_sessao().get(url, headers=headers,
+                                 timeout=timeout or (TIMEOUT_CONEXAO, TIMEOUT_LEITURA))
+        sucesso = res.status_code < 500
+        return res
+    finally:
+        # qualquer saída registra o resultado (e libera a chamada de teste do meio-aberto);
+        # exceções fora de requests também contam como falha
+        if sucesso:
+            disjuntor.registrar_sucesso()
+        else:
+            disjuntor.registrar_falha()
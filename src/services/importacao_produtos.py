@@ -0,0 +1,201 @@
+"""
+importacao_produtos.py
+Importação em massa de produtos locais a partir de CSV ou JSONL. O arquivo é
+lido em streaming e processado em lotes: cada lote é validado, recebe um bloco
+de IDs de uma vez (repositorio.reservar_ids_produto) e é gravado numa operação
+atômica (repositorio.inserir_produtos). Linhas inválidas não param a
+importação; ficam no relatório com o número da linha e o motivo.
+
+Uso: python -m src.services.importacao_produtos produtos.csv [--formato jsonl] [--lote 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import src.utils.repositorios as repositorios
+from src.models.produto import Produto
+from src.utils.logs import get_logger
+
+TAMANHO_LOTE = 5000
+# colunas aceitas para cada campo (cabeçalho do CSV ou chave do JSON)
+COLUNAS = {
+    "title": ("title", "nome", "titulo", "título"),
+    "price": ("price", "preco", "preço"),
+    "description": ("description", "descricao", "descrição"),
+    "category": ("category", "categoria"),
+}
+PROIBIDOS = (";", "\n", "\r")  # quebrariam o formato "id;title;price;description" do log
+
+log = get_logger("importacao")
+
+Registro = Tuple[int, Any]  # (nº da linha, dict lido ou a exceção de leitura)
+Campos = Tuple[str, float, str, Optional[str]]  # title, price, description, category
+
+
+class RelatorioImportacao:
+    __slots__ = ("lidos", "importados", "lotes", "erros", "segundos")
+
+    def __init__(self) -> None:
+        self.lidos = 0
+        self.importados = 0
+        self.lotes = 0
+        self.erros: List[Tuple[int, str]] = []  # (nº da linha, motivo)
+        self.segundos = 0.0
+
+    @property
+    def por_segundo(self) -> float:
+        return self.lidos / self.segundos if self.segundos > 0 else float(self.lidos)
+
+
+# --- leitura em streaming ---
+
+def _registros_csv(arquivo) -> Iterator[Registro]:
+    amostra = arquivo.read(4096)
+    arquivo.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+    except csv.Error:
+        dialeto = csv.excel
+    leitor = csv.DictReader(arquivo, dialect=dialeto)
+    for registro in leitor:
+        yield leitor.line_num, registro
+
+
+def _registros_jsonl(arquivo) -> Iterator[Registro]:
+    for numero, linha in enumerate(arquivo, 1):
+        if not linha.strip():
+            continue
+        try:
+            yield numero, json.loads(linha)
+        except ValueError as e:
+            yield numero, e
+
+
+LEITORES = {"csv": _registros_csv, "jsonl": _registros_jsonl}
+
+
+def detectar_formato(caminho: str) -> str:
+    extensao = os.path.splitext(caminho)[1].lower().lstrip(".")
+    return "jsonl" if extensao in ("jsonl", "ndjson") else "csv"
+
+
+# --- validação ---
+
+def _campo(registro: Dict[str, Any], campo: str) -> Any:
+    for coluna in COLUNAS[campo]:
+        valor = registro.get(coluna)
+        if valor is not None and valor != "":
+            return valor
+    return None
+
+
+def validar(registro: Any) -> Tuple[Optional[Campos], Optional[str]]:
+    """(campos, None) se a linha vale um produto; (None, motivo) se não."""
+    if isinstance(registro, Exception):
+        return None, f"linha ilegível: {registro}"
+    if not isinstance(registro, dict):
+        return None, "esperado um objeto com title e price"
+    registro = {str(k).strip().lower(): v for k, v in registro.items() if k is not None}
+
+    title = str(_campo(registro, "title") or "").strip()
+    if not title:
+        return None, "título obrigatório"
+    preco_bruto = _campo(registro, "price")
+    if preco_bruto is None:
+        return None, "preço obrigatório"
+    try:
+        price = float(str(preco_bruto).strip().replace(",", "."))
+    except ValueError:
+        return None, f"preço inválido: {preco_bruto!r}"
+    if not math.isfinite(price) or price < 0:
+        return None, f"preço inválido: {preco_bruto!r}"
+    description = str(_campo(registro, "description") or "").strip()
+    category = _campo(registro, "category")
+    category = str(category).strip() if category is not None else None
+
+    for nome, valor in (("título", title), ("descrição", description), ("categoria", category or "")):
+        if any(c in valor for c in PROIBIDOS):
+            return None, f"{nome} não pode conter ';' nem quebra de linha"
+    return (title, price, description, category), None
+
+
+# --- importação ---
+
+def importar(caminho: str, formato: Optional[str] = None, tamanho_lote: int = TAMANHO_LOTE,
+             repositorio: Optional[repositorios.Repositorio] = None) -> RelatorioImportacao:
+    """Importa o arquivo lote a lote; um lote gravado não é desfeito se um lote seguinte falhar."""
+    repositorio = repositorio or repositorios.obter()
+    formato = (formato or detectar_formato(caminho)).lower()
+    if formato not in LEITORES:
+        raise ValueError(f"Formato desconhecido: {formato!r} (opções: {', '.join(LEITORES)})")
+    relatorio = RelatorioImportacao()
+    inicio = time.perf_counter()
+
+    # utf-8-sig: tolera o BOM que planilhas costumam gravar no início do CSV
+    with open(caminho, "r", encoding="utf-8-sig", newline="") as arquivo:
+        registros = LEITORES[formato](arquivo)
+        while True:
+            lote = list(itertools.islice(registros, max(1, tamanho_lote)))
+            if not lote:
+                break
+            validos: List[Campos] = []
+            for numero, registro in lote:
+                campos, erro = validar(registro)
+                if erro is not None:
+                    relatorio.erros.append((numero, erro))
+                else:
+                    validos.append(campos)
+            relatorio.lidos += len(lote)
+            if not validos:
+                continue
+            primeiro = repositorio.reservar_ids_produto(len(validos))  # um bloco por lote
+            repositorio.inserir_produtos(
+                [Produto(primeiro + i, title, price, description, category)
+                 for i, (title, price, description, category) in enumerate(validos)]
+            )
+            relatorio.importados += len(validos)
+            relatorio.lotes += 1
+
+    relatorio.segundos = time.perf_counter() - inicio
+    log.info("Importação de %s: %d de %d linhas em %d lotes (%.0f linhas/s), %d erros",
+             caminho, relatorio.importados, relatorio.lidos, relatorio.lotes,
+             relatorio.por_segundo, len(relatorio.erros))
+    return relatorio
+
+
+def mostrar_relatorio(relatorio: RelatorioImportacao, limite_erros: int = 20) -> None:
+    import src.interface.interface as interface
+
+    interface.mensagem_sucesso(
+        f"✅ {relatorio.importados} de {relatorio.lidos} produtos importados em {relatorio.lotes} lote(s), "
+        f"{relatorio.segundos:.2f}s ({relatorio.por_segundo:,.0f} linhas/s)."
+    )
+    if relatorio.erros:
+        interface.mensagem_alerta(f"⚠️ {len(relatorio.erros)} linha(s) com erro:")
+        for numero, erro in relatorio.erros[:limite_erros]:
+            interface.mensagem_alerta(f"  linha {numero}: {erro}")
+        if len(relatorio.erros) > limite_erros:
+            interface.mensagem_alerta(f"  ... e mais {len(relatorio.erros) - limite_erros}.")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Importa produtos locais de um CSV ou JSONL.")
+    parser.add_argument("arquivo")
+    parser.add_argument("--formato", choices=sorted(LEITORES), help="padrão: pela extensão do arquivo")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="linhas por lote gravado")
+    args = parser.parse_args(argv)
+
+    relatorio = importar(args.arquivo, args.formato, args.lote)
+    mostrar_relatorio(relatorio)
+    return 1 if relatorio.erros and not relatorio.importados else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,285 @@
+"""
+indice_catalogo.py
+Catálogo em memória (Fake Store + produtos locais) com índice id -> produto,
+índice ordenado por preço (consultas de faixa por bisseção), facetas por
+categoria, índices de busca (texto, trigramas e trie de autocompletar) e a
+visão em colunas para agregados (catalogo_colunar), todos montados sob demanda.
+Cada instância é uma versão do catálogo; cadastros alteram a parte local no lugar.
+"""
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.models.produto import Produto
+from src.services.autocompletar import TrieProdutos
+from src.services.busca_fuzzy import IndiceTrigramas
+from src.services.busca_produtos import IndiceTexto
+from src.services.catalogo_colunar import CatalogoColunar
+
+# (preço, origem, id): origem 0 = API, 1 = local; desempata ids repetidos entre as partes
+ChavePreco = Tuple[float, int, int]
+_API, _LOCAL = 0, 1
+SEM_CATEGORIA = "sem categoria"
+
+_versoes = itertools.count(1)
+
+def _remover_ordenado(lista: List[ChavePreco], chave: ChavePreco) -> None:
+    i = bisect_left(lista, chave)
+    if i < len(lista) and lista[i] == chave:
+        del lista[i]
+
+
+def categoria_de(produto: Produto) -> str:
+    return produto.category or SEM_CATEGORIA
+
+
+class Faceta:
+    """Produtos de uma categoria, ordenados por preço: contagem e mín./máx. em O(1)."""
+    __slots__ = ("categoria", "chaves")
+
+    def __init__(self, categoria: str) -> None:
+        self.categoria = categoria
+        self.chaves: List[ChavePreco] = []
+
+    @property
+    def quantidade(self) -> int:
+        return len(self.chaves)
+
+    @property
+    def preco_min(self) -> float:
+        return self.chaves[0][0]
+
+    @property
+    def preco_max(self) -> float:
+        return self.chaves[-1][0]
+
+
+# nome -> (classe do índice, valor indexado a partir do produto). Todos expõem
+# adicionar(chave, valor) / remover(chave) e recebem chaves (origem, id).
+_INDICES_BUSCA = {
+    "texto": (IndiceTexto, lambda p: p),
+    "fuzzy": (IndiceTrigramas, lambda p: p.title),
+    "trie": (TrieProdutos, lambda p: p.title),
+}
+
+
+class Catalogo:
+    def __init__(self, produtos_api: Iterable[Produto] = (), produtos_locais: Iterable[Produto] = ()) -> None:
+        """Aceita Produto ou dicts no formato da Fake Store (convertidos uma vez aqui)."""
+        self.versao = next(_versoes)
+        self.criado_em = time.time()
+        self._lock = threading.RLock()
+        self._api: Dict[int, Produto] = {}
+        self._locais: Dict[int, Produto] = {}
+        for p in map(Produto.de, produtos_api):
+            self._api.setdefault(p.id, p)
+        for p in map(Produto.de, produtos_locais):
+            self._locais[p.id] = p
+        self._listas: Dict[str, List[Produto]] = {}
+        self._precos: Optional[List[ChavePreco]] = None  # montado na primeira consulta
+        self._facetas: Optional[Dict[str, Faceta]] = None
+        self._busca: Dict[str, Any] = {}
+        self._colunar: Optional[CatalogoColunar] = None
+
+    def __len__(self) -> int:
+        return len(self._api) + len(self._locais)
+
+    def __contains__(self, id_produto: object) -> bool:
+        return id_produto in self._api or id_produto in self._locais
+
+    def buscar(self, id_produto: int) -> Optional[Produto]:
+        """Busca em O(1); em caso de id repetido vale o produto da API, como antes."""
+        produto = self._api.get(id_produto)
+        return produto if produto is not None else self._locais.get(id_produto)
+
+    def buscar_local(self, id_produto: int) -> Optional[Produto]:
+        return self._locais.get(id_produto)
+
+    def _lista(self, nome: str) -> List[Produto]:
+        lista = self._listas.get(nome)
+        if lista is None:
+            with self._lock:
+                if nome == "api":
+                    lista = list(self._api.values())
+                elif nome == "locais":
+                    lista = list(self._locais.values())
+                else:
+                    lista = self._lista("api") + self._lista("locais")
+                self._listas[nome] = lista
+        return lista
+
+    @property
+    def produtos_api(self) -> List[Produto]:
+        return self._lista("api")
+
+    @property
+    def produtos_locais(self) -> List[Produto]:
+        return self._lista("locais")
+
+    @property
+    def todos(self) -> List[Produto]:
+        """Lista API + locais (materializada uma vez por versão; não modificar)."""
+        return self._lista("todos")
+
+    def _alterou(self) -> None:
+        self.versao = next(_versoes)
+        self._listas.pop("locais", None)
+        self._listas.pop("todos", None)
+        self._colunar = None
+
+    def salvar_local(self, produto: Produto) -> None:
+        """Insere ou substitui um produto local (mantém a posição se já existia)."""
+        produto = Produto.de(produto)
+        with self._lock:
+            antigo = self._locais.get(produto.id)
+            self._locais[produto.id] = produto
+            if antigo is not None:
+                self._desindexar_preco(antigo)
+            self._indexar_preco(produto)
+            for nome, indice in self._busca.items():
+                indice.adicionar((_LOCAL, produto.id), _INDICES_BUSCA[nome][1](produto))
+            self._alterou()
+
+    def remover_local(self, id_produto: int) -> Optional[Produto]:
+        with self._lock:
+            removido = self._locais.pop(id_produto, None)
+            if removido is not None:
+                self._desindexar_preco(removido)
+                for indice in self._busca.values():
+                    indice.remover((_LOCAL, id_produto))
+                self._alterou()
+            return removido
+
+    # --- índice de preços -------------------------------------------------
+
+    def _indice_precos(self) -> List[ChavePreco]:
+        if self._precos is None:
+            with self._lock:
+                if self._precos is None:
+                    chaves = [(float(p.price), _API, i) for i, p in self._api.items()]
+                    chaves += [(float(p.price), _LOCAL, i) for i, p in self._locais.items()]
+                    chaves.sort()
+                    self._precos = chaves
+        return self._precos
+
+    def _indexar_preco(self, produto: Produto) -> None:
+        chave = (float(produto.price), _LOCAL, produto.id)
+        if self._precos is not None:
+            insort(self._precos, chave)
+        if self._facetas is not None:
+            categoria = categoria_de(produto)
+            if categoria not in self._facetas:
+                self._facetas[categoria] = Faceta(categoria)
+            insort(self._facetas[categoria].chaves, chave)
+
+    def _desindexar_preco(self, produto: Produto) -> None:
+        chave = (float(produto.price), _LOCAL, produto.id)
+        if self._precos is not None:
+            _remover_ordenado(self._precos, chave)
+        if self._facetas is not None:
+            faceta = self._facetas.get(categoria_de(produto))
+            if faceta is not None:
+                _remover_ordenado(faceta.chaves, chave)
+                if not faceta.chaves:
+                    del self._facetas[faceta.categoria]
+
+    def _produtos(self, chaves: Iterable[ChavePreco]) -> List[Produto]:
+        return [self._por_chave(origem, i) for _, origem, i in chaves]
+
+    def _por_chave(self, origem: int, id_produto: int) -> Produto:
+        return (self._api if origem == _API else self._locais)[id_produto]
+
+    def faixa_preco(self, minimo: Optional[float] = None, maximo: Optional[float] = None,
+                    categoria: Optional[str] = None) -> List[Produto]:
+        """Produtos com minimo <= preço < maximo (opcionalmente de uma categoria), do mais barato ao mais caro."""
+        if categoria is None:
+            chaves = self._indice_precos()
+        else:
+            faceta = self._indice_facetas().get(categoria)
+            chaves = faceta.chaves if faceta is not None else []
+        with self._lock:
+            inicio = 0 if minimo is None else bisect_left(chaves, (float(minimo),))
+            fim = len(chaves) if maximo is None else bisect_left(chaves, (float(maximo),))
+            return self._produtos(chaves[inicio:fim])
+
+    def mais_baratos(self, n: int) -> List[Produto]:
+        chaves = self._indice_precos()
+        with self._lock:
+            return self._produtos(chaves[:max(n, 0)])
+
+    def mais_caros(self, n: int) -> List[Produto]:
+        chaves = self._indice_precos()
+        with self._lock:
+            return self._produtos(reversed(chaves[max(len(chaves) - n, 0):]))
+
+    # --- facetas por categoria -------------------------------------------
+
+    def _indice_facetas(self) -> Dict[str, Faceta]:
+        if self._facetas is None:
+            with self._lock:
+                if self._facetas is None:
+                    facetas: Dict[str, Faceta] = {}
+                    for origem, produtos in ((_API, self._api), (_LOCAL, self._locais)):
+                        for i, p in produtos.items():
+                            categoria = categoria_de(p)
+                            if categoria not in facetas:
+                                facetas[categoria] = Faceta(categoria)
+                            facetas[categoria].chaves.append((float(p.price), origem, i))
+                    for faceta in facetas.values():
+                        faceta.chaves.sort()
+                    self._facetas = facetas
+        return self._facetas
+
+    def facetas(self) -> List[Faceta]:
+        """Categorias com contagem e faixa de preço, em ordem alfabética."""
+        facetas = self._indice_facetas()
+        with self._lock:
+            return sorted(facetas.values(), key=lambda f: f.categoria)
+
+    # --- visão em colunas ------------------------------------------------
+
+    def colunar(self) -> CatalogoColunar:
+        """Colunas de `todos` para filtros e agregados sobre o catálogo inteiro."""
+        colunar = self._colunar
+        if colunar is None:
+            with self._lock:
+                if self._colunar is None:
+                    self._colunar = CatalogoColunar(self.todos, categoria_de)
+                colunar = self._colunar
+        return colunar
+
+    # --- índices de busca --------------------------------------------------
+
+    def _indice_busca(self, nome: str) -> Any:
+        indice = self._busca.get(nome)
+        if indice is None:
+            with self._lock:
+                indice = self._busca.get(nome)
+                if indice is None:
+                    classe, valor = _INDICES_BUSCA[nome]
+                    itens = [((_API, i), valor(p)) for i, p in self._api.items()]
+                    itens += [((_LOCAL, i), valor(p)) for i, p in self._locais.items()]
+                    indice = self._busca[nome] = classe(itens)
+        return indice
+
+    def buscar_texto(self, consulta: str, limite: int = 20) -> List[Produto]:
+        """Produtos cujo título, descrição ou categoria casam com a consulta, por relevância."""
+        indice = self._indice_busca("texto")
+        with self._lock:
+            return [self._por_chave(*chave) for chave, _ in indice.buscar(consulta, limite)]
+
+    def buscar_parecidos(self, consulta: str, limite: int = 10) -> List[Tuple[Produto, float]]:
+        """Títulos parecidos com a consulta (tolerante a erros), com a similaridade de 0 a 1."""
+        indice = self._indice_busca("fuzzy")
+        with self._lock:
+            return [(self._por_chave(*chave), similaridade) for chave, similaridade in indice.buscar(consulta, limite)]
+
+    def sugerir(self, prefixo: str, k: int = 10) -> List[Produto]:
+        """Autocompletar: até k produtos cujo título (ou palavra dele) começa com o prefixo."""
+        indice = self._indice_busca("trie")
+        with self._lock:
+            return [self._por_chave(*chave) for chave in indice.sugerir(prefixo, k)]
@@ -0,0 +1,260 @@
+"""
+agregacao_pedidos.py
+Agregação paralela de arquivos de pedidos ("datahora;[itens]" por linha:
+Pedidos.txt e as partições do histórico). O trabalho pesado é o json.loads de
+cada linha, preso a um núcleo pelo GIL; aqui os arquivos são cortados em
+trechos em fronteiras de linha e cada trecho é lido e somado num processo de
+um ProcessPoolExecutor. Os parciais (pedidos, itens, total, somas por produto)
+são juntados no fim. Abaixo de LIMIAR_PARALELO bytes tudo roda no próprio
+processo, onde subir um pool custaria mais do que economiza.
+
+Benchmark: python -m src.utils.agregacao_pedidos Pedidos.txt --benchmark [--gerar 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from src.utils.logs import get_logger
+
+LIMIAR_PARALELO = int(os.environ.get("LOJA_LIMIAR_PARALELO", str(4 * 1024 * 1024)))  # bytes
+TRECHOS_POR_PROCESSO = 4  # mais trechos que processos: quem termina antes pega outro
+
+log = get_logger("agregacao_pedidos")
+
+Trecho = Tuple[str, int, int]  # (caminho, início, fim) em bytes; início sempre no começo de uma linha
+R = TypeVar("R")
+
+
+class Agregado:
+    """Parcial de um trecho ou soma de vários; por_produto: id -> [nome, quantidade, soma]."""
+    __slots__ = ("pedidos", "itens", "total", "invalidos", "por_produto")
+
+    def __init__(self) -> None:
+        self.pedidos = 0
+        self.itens = 0
+        self.total = 0.0
+        self.invalidos = 0  # linhas ilegíveis puladas
+        self.por_produto: Dict[Any, List[Any]] = {}
+
+    def acrescentar(self, itens: Sequence[Dict[str, Any]]) -> None:
+        for item in itens:
+            preco = float(item["preco"])
+            produto = self.por_produto.get(item["id"])
+            if produto is None:
+                self.por_produto[item["id"]] = [item["nome"], 1, preco]
+            else:
+                produto[1] += 1
+                produto[2] += preco
+            self.total += preco
+        self.itens += len(itens)
+        self.pedidos += 1
+
+    def juntar(self, outro: "Agregado") -> "Agregado":
+        self.pedidos += outro.pedidos
+        self.itens += outro.itens
+        self.total += outro.total
+        self.invalidos += outro.invalidos
+        for id_produto, (nome, quantidade, soma) in outro.por_produto.items():
+            produto = self.por_produto.get(id_produto)
+            if produto is None:
+                self.por_produto[id_produto] = [nome, quantidade, soma]
+            else:
+                produto[1] += quantidade
+                produto[2] += soma
+        return self
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Formato JSON (as chaves de produto viram lista, para não perderem o tipo)."""
+        return {"pedidos": self.pedidos, "itens": self.itens, "total": self.total, "invalidos": self.invalidos,
+                "produtos": [[id_produto, *valores] for id_produto, valores in self.por_produto.items()]}
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> "Agregado":
+        agregado = cls()
+        agregado.pedidos, agregado.itens = dados["pedidos"], dados["itens"]
+        agregado.total, agregado.invalidos = dados["total"], dados.get("invalidos", 0)
+        agregado.por_produto = {p[0]: list(p[1:]) for p in dados["produtos"]}
+        return agregado
+
+
+# --- divisão em trechos ---
+
+def dividir(caminho: str, partes: int, fim: Optional[int] = None) -> List[Trecho]:
+    """Até `partes` trechos de tamanhos parecidos dos primeiros `fim` bytes (padrão:
+    o arquivo todo), cada corte avançado até o início da linha seguinte."""
+    tamanho = os.path.getsize(caminho) if fim is None else fim
+    if not tamanho:
+        return []
+    passo = max(1, math.ceil(tamanho / max(1, partes)))
+    cortes = [0]
+    with open(caminho, "rb") as f:
+        for posicao in range(passo, tamanho, passo):
+            f.seek(posicao - 1)
+            f.readline()  # termina a linha cortada (ou só o "\n", se o corte caiu num começo de linha)
+            if cortes[-1] < f.tell() < tamanho:
+                cortes.append(f.tell())
+    cortes.append(tamanho)
+    return [(caminho, inicio, fim) for inicio, fim in zip(cortes, cortes[1:])]
+
+
+def _linhas(trecho: Trecho) -> Iterator[Tuple[int, bytes]]:
+    caminho, inicio, fim = trecho
+    with open(caminho, "rb") as f:
+        f.seek(inicio)
+        for linha in f:
+            if inicio >= fim:
+                return
+            yield inicio, linha
+            inicio += len(linha)
+
+
+def _itens(linha: bytes) -> Optional[List[Dict[str, Any]]]:
+    """Itens de uma linha de pedido; None para linha vazia ou removida, ValueError se ilegível."""
+    if not linha.strip():
+        return None
+    itens = json.loads(linha.partition(b";")[2])
+    if not isinstance(itens, list):
+        raise ValueError("itens não são uma lista")
+    return itens
+
+
+# --- trabalho de cada processo (funções de módulo: o pool as importa pelo nome) ---
+
+def agregar_trecho(trecho: Trecho) -> Agregado:
+    agregado = Agregado()
+    for _, linha in _linhas(trecho):
+        try:
+            itens = _itens(linha)
+            if itens is not None:
+                agregado.acrescentar(itens)
+        except (ValueError, TypeError, KeyError):
+            agregado.invalidos += 1
+    return agregado
+
+
+def posicoes_trecho(trecho: Trecho) -> Tuple[array, array, array]:
+    """(inícios, tamanhos, totais) de cada pedido legível do trecho, em arrays (pickle barato)."""
+    inicios, tamanhos, totais = array("q"), array("q"), array("d")
+    for inicio, linha in _linhas(trecho):
+        try:
+            itens = _itens(linha)
+            if itens is None:
+                continue
+            total = sum(float(item["preco"]) for item in itens)
+        except (ValueError, TypeError, KeyError):
+            continue
+        inicios.append(inicio)
+        tamanhos.append(len(linha))
+        totais.append(total)
+    return inicios, tamanhos, totais
+
+
+# --- execução ---
+
+def _processos(bytes_totais: int, processos: Optional[int], limiar: int) -> int:
+    if processos is None:
+        processos = os.cpu_count() or 1
+    return 1 if bytes_totais < limiar else max(1, processos)
+
+
+def _partes(processos: int) -> int:
+    return processos * TRECHOS_POR_PROCESSO if processos > 1 else 1
+
+
+def _mapear(funcao: Callable[[Trecho], R], trechos: List[Trecho], processos: int) -> Iterator[R]:
+    """funcao em cada trecho, resultados na ordem dos trechos."""
+    if processos <= 1 or len(trechos) <= 1:
+        yield from map(funcao, trechos)
+        return
+    with ProcessPoolExecutor(max_workers=min(processos, len(trechos))) as pool:
+        yield from pool.map(funcao, trechos)
+
+
+def agregar(caminhos: Union[str, Iterable[str]], processos: Optional[int] = None,
+            limiar: int = LIMIAR_PARALELO) -> Agregado:
+    """Soma os pedidos de um ou mais arquivos; em paralelo quando passam do limiar."""
+    caminhos = [caminhos] if isinstance(caminhos, str) else [c for c in caminhos]
+    tamanhos = {c: os.path.getsize(c) for c in caminhos if os.path.exists(c)}
+    # arquivos vazios (Pedidos.txt depois do pagamento) não têm trechos
+    tamanhos = {c: tamanho for c, tamanho in tamanhos.items() if tamanho}
+    total_bytes = sum(tamanhos.values())
+    n = _processos(total_bytes, processos, limiar)
+    # cada arquivo recebe trechos na proporção do seu tamanho (partições pequenas ficam inteiras)
+    trechos = [t for c, tamanho in tamanhos.items()
+               for t in dividir(c, math.ceil(_partes(n) * tamanho / total_bytes), tamanho)]
+    agregado = Agregado()
+    for parcial in _mapear(agregar_trecho, trechos, n):
+        agregado.juntar(parcial)
+    if agregado.invalidos:
+        log.warning("%d linha(s) de pedido ilegíveis ignoradas na agregação", agregado.invalidos)
+    return agregado
+
+
+def posicoes(caminho: str, processos: Optional[int] = None, limiar: int = LIMIAR_PARALELO,
+             fim: Optional[int] = None) -> Iterator[Tuple[int, int, float]]:
+    """(início, tamanho, total) de cada pedido legível dos primeiros `fim` bytes do
+    arquivo, em ordem; os trechos são lidos em paralelo quando passam do limiar."""
+    fim = os.path.getsize(caminho) if fim is None else fim
+    n = _processos(fim, processos, limiar)
+    for inicios, tamanhos, totais in _mapear(posicoes_trecho, dividir(caminho, _partes(n), fim), n):
+        yield from zip(inicios, tamanhos, totais)
+
+
+# --- benchmark ---
+
+def gerar_arquivo(caminho: str, linhas: int, semente: int = 42) -> None:
+    """Arquivo de pedidos sintético (1 a 5 itens de 50 produtos) para medir a agregação."""
+    aleatorio = random.Random(semente)
+    with open(caminho, "w") as f:
+        for n in range(linhas):
+            itens = [{"id": p, "nome": f"Produto {p}", "preco": round(p * 1.5, 2)}
+                     for p in (aleatorio.randint(1, 50) for _ in range(aleatorio.randint(1, 5)))]
+            f.write(f"2025-08-{1 + n % 28:02d} 12:00:00;{json.dumps(itens)}\n")
+
+
+def benchmark(caminho: str, contagens: Iterable[int]) -> List[Tuple[int, float]]:
+    """[(processos, segundos)] agregando o arquivo inteiro com cada nº de processos."""
+    resultados = []
+    for processos in contagens:
+        inicio = time.perf_counter()
+        agregar(caminho, processos=processos, limiar=0)
+        resultados.append((processos, time.perf_counter() - inicio))
+    return resultados
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Agrega arquivos de pedidos em paralelo.")
+    parser.add_argument("arquivos", nargs="+")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: nº de núcleos")
+    parser.add_argument("--benchmark", action="store_true", help="mede 1, 2, 4... processos até o nº de núcleos")
+    parser.add_argument("--gerar", type=int, metavar="LINHAS", help="antes, grava um arquivo sintético com LINHAS pedidos")
+    args = parser.parse_args(argv)
+
+    if args.gerar:
+        gerar_arquivo(args.arquivos[0], args.gerar)
+    if args.benchmark:
+        nucleos = args.processos or os.cpu_count() or 1
+        contagens = sorted({1, nucleos} | {2 ** k for k in range(1, nucleos.bit_length()) if 2 ** k <= nucleos})
+        resultados = benchmark(args.arquivos[0], contagens)
+        base = resultados[0][1]
+        tamanho = os.path.getsize(args.arquivos[0]) / 1024 / 1024
+        for processos, segundos in resultados:
+            print(f"{processos:>3} processo(s): {segundos:7.3f}s  {tamanho / segundos:8.1f} MiB/s  {base / segundos:5.2f}x")
+        return 0
+
+    agregado = agregar(args.arquivos, processos=args.processos)
+    print(f"{agregado.pedidos} pedidos, {agregado.itens} itens, total R$ {agregado.total:.2f}, "
+          f"{len(agregado.por_produto)} produtos, {agregado.invalidos} linhas ilegíveis")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
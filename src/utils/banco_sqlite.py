@@ -0,0 +1,446 @@
+"""
+banco_sqlite.py
+Backend opcional em SQLite (modo WAL) para produtos locais, pedidos e usuários,
+usado pelo RepositorioSqlite (LOJA_BACKEND=sqlite). Na primeira abertura o banco
+é criado e os arquivos antigos (produtos_local.txt, Pedidos.txt, db.json) são
+migrados uma única vez.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import src.utils.particoes_pedidos as particoes_pedidos
+from src.models.produto import Produto
+from src.utils.agregacao_pedidos import Agregado
+from src.utils.logs import get_logger
+
+DB_SQLITE_PATH = os.environ.get("LOJA_SQLITE_PATH", "loja.db")
+VERSAO_ESQUEMA = 4
+
+log = get_logger("banco_sqlite")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS produtos (
+    id          INTEGER PRIMARY KEY,
+    title       TEXT NOT NULL,
+    price       REAL NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    category    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_produtos_preco ON produtos(price);
+CREATE INDEX IF NOT EXISTS idx_produtos_categoria ON produtos(category, price);
+
+CREATE TABLE IF NOT EXISTS pedidos (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    datahora TEXT NOT NULL,
+    total    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pedidos_datahora ON pedidos(datahora);
+
+CREATE TABLE IF NOT EXISTS itens_pedido (
+    pedido_id  INTEGER NOT NULL REFERENCES pedidos(id) ON DELETE CASCADE,
+    posicao    INTEGER NOT NULL,
+    produto_id INTEGER NOT NULL,
+    nome       TEXT NOT NULL,
+    preco      REAL NOT NULL,
+    PRIMARY KEY (pedido_id, posicao)
+);
+CREATE INDEX IF NOT EXISTS idx_itens_produto ON itens_pedido(produto_id);
+
+-- histórico de todos os pedidos gravados; não é apagado no pagamento
+CREATE TABLE IF NOT EXISTS historico_pedidos (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    datahora TEXT NOT NULL,
+    total    REAL NOT NULL,
+    itens    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_historico_datahora ON historico_pedidos(datahora);
+
+-- vendas somadas por dia, atualizadas a cada pedido arquivado (painéis não varrem o histórico)
+CREATE TABLE IF NOT EXISTS vendas_dia (
+    dia     TEXT PRIMARY KEY,
+    pedidos INTEGER NOT NULL,
+    itens   INTEGER NOT NULL,
+    receita REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS vendas_produto_dia (
+    dia        TEXT NOT NULL,
+    produto_id INTEGER NOT NULL,
+    nome       TEXT NOT NULL,
+    quantidade INTEGER NOT NULL,
+    receita    REAL NOT NULL,
+    PRIMARY KEY (dia, produto_id)
+);
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    id       TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email    TEXT NOT NULL UNIQUE,
+    dados    TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS recuperacoes (
+    token     TEXT PRIMARY KEY,
+    user_id   TEXT NOT NULL,
+    expira_em INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sequencias (
+    nome    TEXT PRIMARY KEY,
+    proximo INTEGER NOT NULL
+);
+"""
+
+# Uma conexão por thread (sqlite3 não compartilha conexões entre threads por padrão)
+_local = threading.local()
+
+
+def conectar() -> sqlite3.Connection:
+    caminho = os.path.abspath(DB_SQLITE_PATH)
+    conexoes: Dict[str, sqlite3.Connection] = getattr(_local, "conexoes", None) or {}
+    _local.conexoes = conexoes
+    conn = conexoes.get(caminho)
+    if conn is None:
+        conn = sqlite3.connect(caminho, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # seguro em WAL; fsync só no checkpoint
+        conn.execute("PRAGMA foreign_keys=ON")
+        conexoes[caminho] = conn
+        _preparar(conn)
+    return conn
+
+
+def fechar() -> None:
+    """Fecha as conexões desta thread (usado em testes e ao sair)."""
+    for conn in (getattr(_local, "conexoes", None) or {}).values():
+        conn.close()
+    _local.conexoes = {}
+
+
+def _versao(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _preparar(conn: sqlite3.Connection) -> None:
+    versao = _versao(conn)
+    if versao >= VERSAO_ESQUEMA:
+        return
+    conn.executescript(_ESQUEMA)  # idempotente: só cria o que falta
+    if versao == 0:
+        migrar_arquivos(conn)
+        return
+    with conn:
+        if versao < 3:  # histórico novo: começa com os pedidos ainda pendentes
+            for datahora, itens in listar_pedidos(conn=conn):
+                _arquivar_pedido(conn, itens, datahora)
+        elif versao < 4:  # vendas por dia: somadas uma vez a partir do histórico
+            for linha in conn.execute("SELECT datahora, itens FROM historico_pedidos ORDER BY id").fetchall():
+                _somar_vendas(conn, json.loads(linha["itens"]), linha["datahora"])
+        conn.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+
+
+def migrar_arquivos(conn: Optional[sqlite3.Connection] = None) -> Dict[str, int]:
+    """Importa produtos_local.txt, Pedidos.txt, o histórico de pedidos e db.json numa
+    transação só, junto com a marca de versão do esquema: roda uma vez, na criação
+    do banco. Os arquivos originais ficam intactos."""
+    import src.utils.manipulacaoArquivos as manipulacaoArquivos
+    from src.auth import auth_manipulacao  # import tardio: auth não é dependência de utils
+
+    conn = conn or conectar()
+    if _versao(conn) > 0:
+        return {}
+    produtos = manipulacaoArquivos.lerProdutosLocais()
+    pedidos = manipulacaoArquivos.lerPedidos()
+    db = auth_manipulacao.carregar_db()
+    with conn:
+        _inserir_produtos(conn, produtos)
+        for datahora, itens in pedidos:
+            _inserir_pedido(conn, itens, datahora, arquivar=False)  # já estão nas partições
+        for datahora, itens in manipulacaoArquivos.lerHistoricoPedidos():
+            _arquivar_pedido(conn, itens, datahora)
+        _substituir_usuarios(conn, db)
+        conn.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+    contagem = {"produtos": len(produtos), "pedidos": len(pedidos), "usuarios": len(db["usuarios"])}
+    if any(contagem.values()):
+        log.info("Migração para SQLite concluída: %s", contagem)
+    return contagem
+
+
+# --- produtos ----------------------------------------------------------------
+
+def _produto(linha: sqlite3.Row) -> Produto:
+    return Produto(linha["id"], linha["title"], linha["price"], linha["description"], linha["category"])
+
+
+def _inserir_produtos(conn: sqlite3.Connection, produtos: Iterable[Dict[str, Any]]) -> None:
+    conn.executemany(
+        "INSERT INTO produtos (id, title, price, description, category) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET title = excluded.title, price = excluded.price, "
+        "description = excluded.description, category = excluded.category",
+        [(p["id"], p["title"], float(p["price"]), p.get("description", ""), p.get("category")) for p in produtos],
+    )
+
+
+def salvar_produto(id_produto: int, title: str, price: float, description: str,
+                   category: Optional[str] = None) -> None:
+    conn = conectar()
+    with conn:
+        _inserir_produtos(conn, [{"id": id_produto, "title": title, "price": price,
+                                  "description": description, "category": category}])
+
+
+def salvar_produtos(produtos: Iterable[Produto]) -> None:
+    """Grava vários produtos numa transação só (todos ou nenhum)."""
+    conn = conectar()
+    with conn:
+        _inserir_produtos(conn, produtos)
+
+
+def excluir_produto(id_produto: int) -> None:
+    conn = conectar()
+    with conn:
+        conn.execute("DELETE FROM produtos WHERE id = ?", (id_produto,))
+
+
+def listar_produtos() -> List[Produto]:
+    return [_produto(l) for l in conectar().execute("SELECT * FROM produtos ORDER BY id")]
+
+
+def buscar_produto(id_produto: int) -> Optional[Produto]:
+    linha = conectar().execute("SELECT * FROM produtos WHERE id = ?", (id_produto,)).fetchone()
+    return _produto(linha) if linha is not None else None
+
+
+def produtos_por_preco(minimo: Optional[float] = None, maximo: Optional[float] = None,
+                       categoria: Optional[str] = None) -> List[Produto]:
+    """minimo <= preço < maximo, do mais barato ao mais caro (usa os índices de preço/categoria)."""
+    filtros, parametros = [], []
+    if categoria is not None:
+        filtros.append("category = ?")
+        parametros.append(categoria)
+    if minimo is not None:
+        filtros.append("price >= ?")
+        parametros.append(float(minimo))
+    if maximo is not None:
+        filtros.append("price < ?")
+        parametros.append(float(maximo))
+    onde = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    sql = f"SELECT * FROM produtos {onde} ORDER BY price, id"
+    return [_produto(l) for l in conectar().execute(sql, parametros)]
+
+
+def reservar_ids_produto(quantidade: int, primeiro: int) -> int:
+    """Reserva `quantidade` IDs de produto e retorna o primeiro. BEGIN IMMEDIATE
+    trava a escrita, então dois processos nunca recebem o mesmo bloco. A sequência
+    nasce em max(primeiro, maior id cadastrado + 1)."""
+    conn = conectar()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        linha = conn.execute("SELECT proximo FROM sequencias WHERE nome = 'produtos'").fetchone()
+        if linha is not None:
+            inicio = linha["proximo"]
+        else:
+            maior = conn.execute("SELECT COALESCE(MAX(id), 0) FROM produtos").fetchone()[0]
+            inicio = max(primeiro, maior + 1)
+        conn.execute(
+            "INSERT INTO sequencias (nome, proximo) VALUES ('produtos', ?) "
+            "ON CONFLICT(nome) DO UPDATE SET proximo = excluded.proximo",
+            (inicio + quantidade,),
+        )
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return inicio
+
+
+# --- pedidos -----------------------------------------------------------------
+
+def _somar_vendas(conn: sqlite3.Connection, itens: Sequence[Dict[str, Any]], datahora: Any) -> None:
+    dia = particoes_pedidos.chave(str(datahora), "dia")
+    conn.execute(
+        "INSERT INTO vendas_dia (dia, pedidos, itens, receita) VALUES (?, 1, ?, ?) "
+        "ON CONFLICT(dia) DO UPDATE SET pedidos = pedidos + 1, itens = itens + excluded.itens, "
+        "receita = receita + excluded.receita",
+        (dia, len(itens), sum(float(i["preco"]) for i in itens)),
+    )
+    conn.executemany(
+        "INSERT INTO vendas_produto_dia (dia, produto_id, nome, quantidade, receita) VALUES (?, ?, ?, 1, ?) "
+        "ON CONFLICT(dia, produto_id) DO UPDATE SET quantidade = quantidade + 1, receita = receita + excluded.receita",
+        [(dia, i["id"], i["nome"], float(i["preco"])) for i in itens],
+    )
+
+
+def _arquivar_pedido(conn: sqlite3.Connection, itens: Sequence[Dict[str, Any]], datahora: Any) -> None:
+    conn.execute(
+        "INSERT INTO historico_pedidos (datahora, total, itens) VALUES (?, ?, ?)",
+        (str(datahora), sum(float(i["preco"]) for i in itens), json.dumps(list(itens))),
+    )
+    _somar_vendas(conn, itens, datahora)
+
+
+def _inserir_pedido(conn: sqlite3.Connection, itens: Sequence[Dict[str, Any]], datahora: Any,
+                    arquivar: bool = True) -> int:
+    if arquivar:
+        _arquivar_pedido(conn, itens, datahora)
+    total = sum(float(i["preco"]) for i in itens)
+    cursor = conn.execute("INSERT INTO pedidos (datahora, total) VALUES (?, ?)", (str(datahora), total))
+    pedido_id = cursor.lastrowid
+    conn.executemany(
+        "INSERT INTO itens_pedido (pedido_id, posicao, produto_id, nome, preco) VALUES (?, ?, ?, ?, ?)",
+        [(pedido_id, n, i["id"], i["nome"], float(i["preco"])) for n, i in enumerate(itens)],
+    )
+    return pedido_id
+
+
+def inserir_pedido(itens: Sequence[Dict[str, Any]], datahora: Any) -> int:
+    conn = conectar()
+    with conn:
+        return _inserir_pedido(conn, itens, datahora)
+
+
+def listar_pedidos(inicio: Optional[str] = None, fim: Optional[str] = None,
+                   conn: Optional[sqlite3.Connection] = None) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """[(datahora, itens)] em ordem de gravação; inicio <= datahora < fim pelo índice de data."""
+    filtros, parametros = [], []
+    if inicio is not None:
+        filtros.append("p.datahora >= ?")
+        parametros.append(str(inicio))
+    if fim is not None:
+        filtros.append("p.datahora < ?")
+        parametros.append(str(fim))
+    onde = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    linhas = (conn or conectar()).execute(
+        "SELECT p.id, p.datahora, i.produto_id, i.nome, i.preco FROM pedidos p "
+        f"LEFT JOIN itens_pedido i ON i.pedido_id = p.id {onde} ORDER BY p.id, i.posicao",
+        parametros,
+    )
+    pedidos: Dict[int, Tuple[str, List[Dict[str, Any]]]] = {}
+    for l in linhas:
+        _, itens = pedidos.setdefault(l["id"], (l["datahora"], []))
+        if l["produto_id"] is not None:
+            itens.append({"id": l["produto_id"], "nome": l["nome"], "preco": l["preco"]})
+    return list(pedidos.values())
+
+
+def buscar_pedido(id_pedido: int) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    return _buscar_pedido(conectar(), id_pedido)
+
+
+def _buscar_pedido(conn: sqlite3.Connection, id_pedido: int) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    linha = conn.execute("SELECT datahora FROM pedidos WHERE id = ?", (id_pedido,)).fetchone()
+    if linha is None:
+        return None
+    itens = conn.execute(
+        "SELECT produto_id, nome, preco FROM itens_pedido WHERE pedido_id = ? ORDER BY posicao", (id_pedido,)
+    )
+    return linha["datahora"], [{"id": i["produto_id"], "nome": i["nome"], "preco": i["preco"]} for i in itens]
+
+
+def remover_pedido(id_pedido: int) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """Apaga um pedido (e seus itens, em cascata) e o retorna; None se não existe."""
+    conn = conectar()
+    with conn:
+        pedido = _buscar_pedido(conn, id_pedido)
+        conn.execute("DELETE FROM pedidos WHERE id = ?", (id_pedido,))
+    return pedido
+
+
+def historico_pedidos(inicio: Any = None, fim: Any = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Pedidos do histórico com inicio <= datahora < fim, pelo índice de data, em ordem de data."""
+    filtros, parametros = [], []
+    if inicio is not None:
+        filtros.append("datahora >= ?")
+        parametros.append(str(inicio))
+    if fim is not None:
+        filtros.append("datahora < ?")
+        parametros.append(str(fim))
+    onde = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    cursor = conectar().execute(f"SELECT datahora, itens FROM historico_pedidos {onde} ORDER BY datahora, id",
+                                parametros)
+    for linha in cursor:
+        yield linha["datahora"], json.loads(linha["itens"])
+
+
+def vendas_por_dia(inicio: Any = None, fim: Any = None) -> Dict[str, Agregado]:
+    """{dia: Agregado} com inicio <= dia < fim, lido das tabelas de vendas por dia."""
+    filtros, parametros = [], []
+    if inicio is not None:
+        filtros.append("dia >= ?")
+        parametros.append(str(inicio)[:10])
+    if fim is not None:
+        filtros.append("dia < ?")
+        parametros.append(str(fim)[:10])
+    if filtros:
+        filtros.append("dia != ?")
+        parametros.append(particoes_pedidos.SEM_DATA)
+    onde = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    conn = conectar()
+    por_dia: Dict[str, Agregado] = {}
+    for linha in conn.execute(f"SELECT dia, pedidos, itens, receita FROM vendas_dia {onde} ORDER BY dia", parametros):
+        vendas = por_dia[linha["dia"]] = Agregado()
+        vendas.pedidos, vendas.itens, vendas.total = linha["pedidos"], linha["itens"], linha["receita"]
+    for linha in conn.execute(
+            f"SELECT dia, produto_id, nome, quantidade, receita FROM vendas_produto_dia {onde}", parametros):
+        por_dia[linha["dia"]].por_produto[linha["produto_id"]] = [linha["nome"], linha["quantidade"], linha["receita"]]
+    return por_dia
+
+
+def total_pedidos() -> float:
+    return conectar().execute("SELECT COALESCE(SUM(total), 0) FROM pedidos").fetchone()[0]
+
+
+def resumo_pedidos() -> Tuple[int, float]:
+    quantidade, total = conectar().execute("SELECT COUNT(*), COALESCE(SUM(total), 0) FROM pedidos").fetchone()
+    return quantidade, float(total)
+
+
+def apagar_pedidos() -> None:
+    conn = conectar()
+    with conn:
+        conn.execute("DELETE FROM pedidos")
+
+
+# --- usuários ----------------------------------------------------------------
+
+def _substituir_usuarios(conn: sqlite3.Connection, dados: Dict[str, Any]) -> None:
+    conn.execute("DELETE FROM usuarios")
+    conn.execute("DELETE FROM recuperacoes")
+    conn.executemany(
+        "INSERT INTO usuarios (id, username, email, dados) VALUES (?, ?, ?, ?)",
+        [(u["id"], u["username"], u["email"], json.dumps(u, ensure_ascii=False)) for u in dados["usuarios"]],
+    )
+    conn.executemany(
+        "INSERT INTO recuperacoes (token, user_id, expira_em) VALUES (?, ?, ?)",
+        [(token, r["user_id"], r["expira_em"]) for token, r in dados["recuperacoes"].items()],
+    )
+
+
+def carregar_usuarios() -> Dict[str, Any]:
+    """Mesmo formato do db.json: {"usuarios": [...], "recuperacoes": {token: {...}}}."""
+    conn = conectar()
+    usuarios = [json.loads(l["dados"]) for l in conn.execute("SELECT dados FROM usuarios ORDER BY rowid")]
+    recuperacoes = {l["token"]: {"user_id": l["user_id"], "expira_em": l["expira_em"]}
+                    for l in conn.execute("SELECT * FROM recuperacoes")}
+    return {"usuarios": usuarios, "recuperacoes": recuperacoes}
+
+
+def salvar_usuarios(dados: Dict[str, Any]) -> None:
+    conn = conectar()
+    with conn:
+        _substituir_usuarios(conn, dados)
+
+
+def buscar_usuario(login: str) -> Optional[Dict[str, Any]]:
+    """Busca por username ou e-mail pelos índices únicos, sem carregar a base toda."""
+    linha = conectar().execute(
+        "SELECT dados FROM usuarios WHERE username = ? UNION ALL SELECT dados FROM usuarios WHERE email = ? LIMIT 1",
+        (login, login),
+    ).fetchone()
+    return json.loads(linha["dados"]) if linha is not None else None
@@ -0,0 +1,89 @@
+"""
+cache_arquivos.py
+Cache de leitura compartilhado para arquivos que são lidos inteiros e
+interpretados (produtos_local.txt, db.json). A entrada vale enquanto a
+assinatura do arquivo (st_mtime_ns, st_size, st_ino) não muda; fora isso o
+arquivo é lido e interpretado de novo. Quem grava chama invalidar().
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+Assinatura = Tuple[int, int, int]
+
+# Um arquivo regravado dentro da resolução do mtime pode manter a mesma
+# assinatura; só guardamos leituras de arquivos que não mudam há esse tempo.
+JANELA_INSTAVEL_NS = 1_000_000_000
+
+_FALTA = object()
+_lock = threading.Lock()
+_entradas: Dict[str, Tuple[Assinatura, Any]] = {}
+_contadores: Dict[str, Dict[str, int]] = {}
+
+
+def assinatura(caminho: str) -> Optional[Assinatura]:
+    try:
+        st = os.stat(caminho)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _contar(chave: str, tipo: str) -> None:
+    contadores = _contadores.setdefault(chave, {"acertos": 0, "faltas": 0})
+    contadores[tipo] += 1
+
+
+def ler(caminho: str, interpretar: Callable[[], T], copiar: Callable[[T], T] = lambda v: v) -> T:
+    """Retorna copiar(valor em cache) se o arquivo não mudou; senão, interpretar().
+    Sem stat possível (arquivo inexistente, por exemplo) a leitura não passa pelo cache."""
+    chave = os.path.abspath(caminho)
+    antes = assinatura(caminho)
+    if antes is None:
+        return interpretar()
+
+    with _lock:
+        entrada = _entradas.get(chave)
+        if entrada is not None and entrada[0] == antes:
+            _contar(chave, "acertos")
+            valor = entrada[1]
+        else:
+            _contar(chave, "faltas")
+            valor = _FALTA
+    if valor is not _FALTA:
+        return copiar(valor)
+
+    valor = interpretar()
+    # só guarda se o arquivo não mudou durante a leitura e não acabou de ser gravado
+    if assinatura(caminho) == antes and time.time_ns() - antes[0] >= JANELA_INSTAVEL_NS:
+        with _lock:
+            _entradas[chave] = (antes, valor)
+        return copiar(valor)
+    return valor
+
+
+def invalidar(caminho: str) -> None:
+    with _lock:
+        _entradas.pop(os.path.abspath(caminho), None)
+
+
+def estatisticas(caminho: Optional[str] = None) -> Dict[str, int]:
+    """Acertos e faltas de um arquivo, ou a soma de todos."""
+    with _lock:
+        if caminho is not None:
+            return dict(_contadores.get(os.path.abspath(caminho), {"acertos": 0, "faltas": 0}))
+        return {
+            "acertos": sum(c["acertos"] for c in _contadores.values()),
+            "faltas": sum(c["faltas"] for c in _contadores.values()),
+        }
+
+
+def limpar() -> None:
+    """Esvazia o cache e zera os contadores (usado em testes)."""
+    with _lock:
+        _entradas.clear()
+        _contadores.clear()
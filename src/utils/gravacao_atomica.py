@@ -0,0 +1,209 @@
+"""
+gravacao_atomica.py
+Camada de escrita segura para os arquivos da loja.
+- gravar_atomico: conteúdo novo num temporário ao lado do destino, fsync e
+  os.replace; uma queda deixa o arquivo antigo ou o novo, nunca um pela metade.
+- anexar / substituir: group commit. Uma thread gravadora junta tudo o que
+  chega dentro de JANELA_COMMIT e faz um único commit durável por arquivo
+  (uma escrita e um fsync), liberando de uma vez todos os que esperavam.
+"""
+from __future__ import annotations
+
+import atexit
+import locale
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+from src.utils.logs import get_logger
+
+JANELA_COMMIT = float(os.environ.get("LOJA_JANELA_COMMIT_MS", "2")) / 1000
+CODIFICACAO_TEXTO = locale.getpreferredencoding(False)  # a de open() em modo texto, usada nos anexos
+
+Dados = Union[str, bytes]
+
+log = get_logger("gravacao")
+
+
+def _bytes(dados: Dados, codificacao: str) -> bytes:
+    return dados if isinstance(dados, bytes) else dados.encode(codificacao)
+
+
+def _sincronizar_diretorio(caminho: str) -> None:
+    """Torna o próprio os.replace durável (no Windows não há como abrir diretório)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(caminho)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def gravar_atomico(caminho: str, dados: Union[Dados, Iterable[bytes]], codificacao: str = "utf-8") -> None:
+    """Substitui o arquivo inteiro de forma atômica; aceita texto, bytes ou blocos de bytes."""
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    partes = [dados] if isinstance(dados, (str, bytes)) else dados
+    fd = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        try:
+            for parte in partes:
+                visao = memoryview(_bytes(parte, codificacao))
+                while visao:
+                    visao = visao[os.write(fd, visao):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        raise
+    _sincronizar_diretorio(caminho)
+
+
+def _anexar_duravel(caminho: str, texto: str) -> None:
+    with open(caminho, "a") as f:
+        f.write(texto)
+        f.flush()
+        fd = f.fileno()
+        if isinstance(fd, int):  # só arquivos de verdade têm o que sincronizar
+            os.fsync(fd)
+
+
+def _anexar_bytes_duravel(caminho: str, dados: bytes) -> None:
+    fd = os.open(caminho, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        visao = memoryview(dados)
+        while visao:
+            visao = visao[os.write(fd, visao):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Commit:
+    """Uma escrita enfileirada; esperar() retorna quando ela está em disco."""
+    __slots__ = ("caminho", "substitui", "dados", "codificacao", "_feito", "erro")
+
+    def __init__(self, caminho: str, substitui: bool, dados: Dados, codificacao: str) -> None:
+        self.caminho = caminho
+        self.substitui = substitui
+        self.dados = dados
+        self.codificacao = codificacao
+        self._feito = threading.Event()
+        self.erro: Optional[BaseException] = None
+
+    @property
+    def feito(self) -> bool:
+        return self._feito.is_set()
+
+    def esperar(self) -> None:
+        self._feito.wait()
+        if self.erro is not None:
+            raise self.erro
+
+
+class GravadorAgrupado:
+    def __init__(self, janela: float = JANELA_COMMIT) -> None:
+        self.janela = janela
+        self._cond = threading.Condition()
+        self._fila: List[Commit] = []
+        self._em_voo: List[Commit] = []
+        self._thread: Optional[threading.Thread] = None
+        self.commits = 0  # lotes gravados (para medir o agrupamento)
+
+    def enfileirar(self, caminho: str, dados: Dados, substitui: bool = False, codificacao: str = "utf-8") -> Commit:
+        commit = Commit(caminho, substitui, dados, codificacao)
+        with self._cond:
+            self._fila.append(commit)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._laco, name="group-commit", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return commit
+
+    def descarregar(self) -> None:
+        """Espera tudo o que já foi enfileirado chegar ao disco."""
+        with self._cond:
+            pendentes = self._fila + self._em_voo
+        for commit in pendentes:
+            commit._feito.wait()
+
+    def _laco(self) -> None:
+        while True:
+            with self._cond:
+                while not self._fila:
+                    self._cond.wait()
+            time.sleep(self.janela)  # deixa os escritores concorrentes entrarem no mesmo lote
+            with self._cond:
+                lote, self._fila = self._fila, []
+                self._em_voo = lote
+            self._gravar(lote)
+            with self._cond:
+                self._em_voo = []
+            self.commits += 1
+
+    def _gravar(self, lote: List[Commit]) -> None:
+        por_arquivo: Dict[str, List[Commit]] = {}
+        for commit in lote:
+            por_arquivo.setdefault(commit.caminho, []).append(commit)
+        for caminho, commits in por_arquivo.items():
+            # na ordem de chegada: substituir descarta o que veio antes; anexar soma ao fim
+            substituto: Optional[bytes] = None
+            anexos: List[Dados] = []
+            for commit in commits:
+                if commit.substitui:
+                    substituto = _bytes(commit.dados, commit.codificacao)
+                    anexos = []
+                else:
+                    anexos.append(commit.dados)
+            try:
+                if substituto is not None:
+                    gravar_atomico(caminho, [substituto] + [_bytes(a, CODIFICACAO_TEXTO) for a in anexos])
+                elif all(isinstance(a, str) for a in anexos):
+                    _anexar_duravel(caminho, "".join(anexos))
+                else:  # anexos em bytes vão direto, sem a tradução do modo texto
+                    _anexar_bytes_duravel(caminho, b"".join(_bytes(a, CODIFICACAO_TEXTO) for a in anexos))
+            except BaseException as e:
+                log.error("Falha no commit de %s: %s", caminho, e)
+                for commit in commits:
+                    commit.erro = e
+            for commit in commits:
+                commit._feito.set()
+
+
+_gravador = GravadorAgrupado()
+atexit.register(_gravador.descarregar)
+
+
+def anexar(caminho: str, texto: str) -> None:
+    """Acrescenta texto ao fim do arquivo e retorna quando está em disco."""
+    _gravador.enfileirar(caminho, texto).esperar()
+
+
+def enfileirar_anexo(caminho: str, dados: Dados) -> Commit:
+    """Como anexar, sem esperar: quem chama decide quando chamar esperar().
+    Aceita também bytes, gravados como estão."""
+    return _gravador.enfileirar(caminho, dados)
+
+
+def substituir(caminho: str, dados: Dados, codificacao: str = "utf-8") -> None:
+    """Troca o conteúdo inteiro do arquivo (atomicamente) e retorna quando está em disco."""
+    _gravador.enfileirar(caminho, dados, substitui=True, codificacao=codificacao).esperar()
+
+
+def enfileirar_substituicao(caminho: str, dados: Dados, codificacao: str = "utf-8") -> Commit:
+    """Como substituir, sem esperar (para arquivos derivados, que podem ser refeitos)."""
+    return _gravador.enfileirar(caminho, dados, substitui=True, codificacao=codificacao)
+
+
+def descarregar() -> None:
+    _gravador.descarregar()
+
+
+def estatisticas() -> Dict[str, int]:
+    return {"commits": _gravador.commits}
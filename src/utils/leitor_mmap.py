@@ -0,0 +1,216 @@
+"""
+leitor_mmap.py
+Leitura preguiçosa via mmap de produtos_local.txt e Pedidos.txt. O arquivo é
+mapeado em vez de lido para objetos Python; o índice guarda só o deslocamento
+de cada linha (array de inteiros, montado sob demanda) e o registro só é
+decodificado quando acessado. A visão é do tamanho do arquivo na abertura:
+o que for acrescentado depois não aparece.
+"""
+from __future__ import annotations
+
+import json
+import locale
+import mmap
+import os
+from array import array
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar, Union, overload
+
+from src.models.produto import Produto
+
+T = TypeVar("T")
+
+# mesma codificação que open() usa em modo texto ao gravar os arquivos
+CODIFICACAO = locale.getpreferredencoding(False)
+EXCLUSAO = b"-"
+CAMPOS_PRODUTO = (4, 5)  # id;title;price;description[;category]
+REMOVIDO = ord(" ")  # primeiro byte de um pedido removido no lugar
+
+
+def decodificar_pedido(linha: bytes) -> Tuple[str, List[Dict[str, Any]]]:
+    """"datahora;[json]" -> (datahora, itens). ValueError se a linha estiver corrompida."""
+    datahora, separador, itens = linha.decode(CODIFICACAO).strip().partition(";")
+    if not separador:
+        raise ValueError(f"Pedido sem separador: {linha[:40]!r}")
+    return datahora, json.loads(itens)
+
+
+def decodificar_produto(linha: bytes) -> Produto:
+    """"id;title;price;description[;category]" -> produto. ValueError se a linha estiver corrompida."""
+    partes = linha.decode(CODIFICACAO).strip().split(";")
+    if len(partes) not in CAMPOS_PRODUTO:
+        raise ValueError(f"Produto com {len(partes)} campos: {linha[:40]!r}")
+    id_, title, price, description = partes[:4]
+    categoria = partes[4] if len(partes) == 5 and partes[4] else None
+    return Produto(int(id_), title, float(price), description, categoria)
+
+
+class ArquivoLinhas(Sequence, Generic[T]):
+    """Sequência somente leitura das linhas não vazias de um arquivo.
+    arquivo[i] decodifica uma linha (ValueError se corrompida); a iteração
+    percorre o mapa sem montar o índice e pula as linhas corrompidas."""
+
+    def __init__(self, caminho: str, decodificar: Callable[[bytes], T]) -> None:
+        self.caminho = caminho
+        self._decodificar = decodificar
+        self._mapa: Optional[mmap.mmap] = None
+        self._inicios = array("q")
+        self._varrido = 0  # bytes já percorridos pelo índice
+        try:
+            with open(caminho, "rb") as f:
+                if os.fstat(f.fileno()).st_size:  # mmap não aceita arquivo vazio
+                    self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            pass
+        self._tamanho = len(self._mapa) if self._mapa is not None else 0
+
+    # --- acesso bruto ---
+    def _linhas(self, inicio: int = 0) -> Iterator[Tuple[int, int]]:
+        """(início, fim) de cada linha não vazia a partir de `inicio`, sem copiar bytes."""
+        mapa, tamanho = self._mapa, self._tamanho
+        while inicio < tamanho:
+            fim = mapa.find(b"\n", inicio)
+            if fim == -1:
+                fim = tamanho
+            if fim > inicio and not (fim - inicio == 1 and mapa[inicio] == 13):  # ignora "" e "\r"
+                yield inicio, fim
+            inicio = fim + 1
+
+    def _bruta(self, inicio: int) -> bytes:
+        fim = self._mapa.find(b"\n", inicio)
+        return self._mapa[inicio:fim if fim != -1 else self._tamanho]
+
+    def _indexar_ate(self, posicao: Optional[int]) -> None:
+        """Estende o índice até conter `posicao` (None: o arquivo todo)."""
+        if self._varrido >= self._tamanho:
+            return
+        for inicio, fim in self._linhas(self._varrido):
+            self._inicios.append(inicio)
+            self._varrido = fim + 1
+            if posicao is not None and len(self._inicios) > posicao:
+                return
+        self._varrido = self._tamanho
+
+    def deslocamento(self, posicao: int) -> int:
+        """Byte onde começa o registro `posicao`."""
+        if posicao < 0:
+            posicao += len(self)
+        self._indexar_ate(posicao)
+        if not 0 <= posicao < len(self._inicios):
+            raise IndexError(posicao)
+        return self._inicios[posicao]
+
+    def brutos(self) -> Iterator[bytes]:
+        """Cada registro ainda codificado (útil para copiar sem decodificar)."""
+        for inicio, fim in self._linhas():
+            yield self._mapa[inicio:fim]
+
+    # --- protocolo de sequência ---
+    def __len__(self) -> int:
+        self._indexar_ate(None)
+        return len(self._inicios)
+
+    def __bool__(self) -> bool:
+        self._indexar_ate(0)  # basta achar a primeira linha
+        return len(self._inicios) > 0
+
+    @overload
+    def __getitem__(self, posicao: int) -> T: ...
+
+    @overload
+    def __getitem__(self, posicao: slice) -> List[T]: ...
+
+    def __getitem__(self, posicao: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(posicao, slice):
+            return [self[i] for i in range(*posicao.indices(len(self)))]
+        return self._decodificar(self._bruta(self.deslocamento(posicao)))
+
+    def __iter__(self) -> Iterator[T]:
+        for bruta in self.brutos():
+            try:
+                yield self._decodificar(bruta)
+            except ValueError:
+                continue
+
+    # --- ciclo de vida ---
+    def fechar(self) -> None:
+        """Libera o mapa; obrigatório antes de truncar ou substituir o arquivo no Windows."""
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        self._tamanho = self._varrido = 0
+        self._inicios = array("q")
+
+    def __enter__(self) -> "ArquivoLinhas[T]":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fechar()
+
+
+class Pedidos(ArquivoLinhas[Tuple[str, List[Dict[str, Any]]]]):
+    """Pedidos.txt: uma linha por pedido, na ordem de gravação. Pedidos
+    removidos (linha coberta de espaços, ver livro_pedidos) ficam de fora."""
+
+    def __init__(self, caminho: str) -> None:
+        super().__init__(caminho, decodificar_pedido)
+
+    def _linhas(self, inicio: int = 0) -> Iterator[Tuple[int, int]]:
+        for inicio, fim in super()._linhas(inicio):
+            if self._mapa[inicio] != REMOVIDO:
+                yield inicio, fim
+
+
+class ProdutosLocais(ArquivoLinhas[Produto]):
+    """produtos_local.txt visto como os produtos vivos do log, na ordem de
+    cadastro. Reaplicar o log só lê o ID de cada linha: o índice é {id:
+    deslocamento do registro mais recente}, e o produto é decodificado no acesso."""
+
+    def __init__(self, caminho: str) -> None:
+        super().__init__(caminho, decodificar_produto)
+        self._vivos: Optional[Dict[int, int]] = None
+
+    def _reaplicar(self) -> Dict[int, int]:
+        if self._vivos is None:
+            vivos: Dict[int, int] = {}
+            for inicio, fim in self._linhas():
+                separador = self._mapa.find(b";", inicio, fim)
+                if separador == -1:
+                    continue
+                chave = self._mapa[inicio:separador]
+                if chave == EXCLUSAO:
+                    try:
+                        vivos.pop(int(self._mapa[separador + 1:fim]), None)
+                    except ValueError:
+                        pass
+                    continue
+                # upsert válido tem 4 ou 5 campos (categoria opcional); a contagem dispensa decodificar o texto
+                if self._mapa[inicio:fim].count(b";") + 1 not in CAMPOS_PRODUTO:
+                    continue
+                try:
+                    vivos[int(chave)] = inicio
+                except ValueError:
+                    continue
+            self._vivos = vivos
+            self._inicios = array("q", vivos.values())
+            self._varrido = self._tamanho
+        return self._vivos
+
+    def _indexar_ate(self, posicao: Optional[int]) -> None:
+        self._reaplicar()  # só o log inteiro diz quem está vivo
+
+    def ids(self) -> List[int]:
+        return list(self._reaplicar())
+
+    def buscar(self, id_produto: int) -> Optional[Produto]:
+        """Produto pelo ID sem decodificar os demais."""
+        inicio = self._reaplicar().get(id_produto)
+        return None if inicio is None else self._decodificar(self._bruta(inicio))
+
+    def brutos(self) -> Iterator[bytes]:
+        for inicio in self._reaplicar().values():
+            yield self._bruta(inicio)
+
+    def fechar(self) -> None:
+        super().fechar()
+        self._vivos = {}
@@ -0,0 +1,351 @@
+"""
+livro_pedidos.py
+Livro-razão e índice dos pedidos pendentes de Pedidos.txt.
+- Livro: quantidade e valor total, somados em O(1) a cada pedido gravado, para
+  o pagamento não reler o arquivo (salvo em Pedidos.total).
+- Índice: cada pedido recebe um ID estável e o índice guarda id -> (início,
+  tamanho) da linha (Pedidos.idx, registros binários). Buscar um pedido é um
+  seek e uma leitura; remover (pagar ou cancelar) cobre a linha com espaços no
+  lugar, sem mexer na posição das demais.
+O livro guarda até qual byte (e de qual inode) do arquivo ele vale. Se o
+arquivo cresceu por fora, só o trecho novo é lido; se foi trocado ou o livro
+se perdeu, livro e índice são refeitos em streaming, uma linha por vez.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Tuple
+
+import src.utils.agregacao_pedidos as agregacao_pedidos
+import src.utils.gravacao_atomica as gravacao_atomica
+from src.utils.logs import get_logger
+
+log = get_logger("livro_pedidos")
+
+
+class Livro(NamedTuple):
+    inode: Optional[int]  # None: o arquivo ainda não existia
+    tamanho: int  # bytes do arquivo já somados e indexados
+    quantidade: int  # pedidos pendentes (sem os removidos)
+    total: float
+    indexados: int = 0  # registros no índice (com os removidos)
+    proximo_id: int = 1
+
+
+VAZIO = Livro(None, 0, 0, 0.0)
+
+
+class Indice:
+    """id -> (início, tamanho) em três arrays de int64. Os IDs são dados em
+    ordem crescente, então a busca é por bisect, sem dict por pedido."""
+    __slots__ = ("ids", "inicios", "tamanhos")
+
+    def __init__(self) -> None:
+        self.ids, self.inicios, self.tamanhos = array("q"), array("q"), array("q")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def acrescentar(self, id_pedido: int, inicio: int, tamanho: int) -> bytes:
+        """Registra o pedido e retorna o registro já no formato de Pedidos.idx."""
+        self.ids.append(id_pedido)
+        self.inicios.append(inicio)
+        self.tamanhos.append(tamanho)
+        return array("q", (id_pedido, inicio, tamanho)).tobytes()
+
+    def localizar(self, id_pedido: int) -> Optional[Tuple[int, int]]:
+        i = bisect_left(self.ids, id_pedido)
+        if i < len(self.ids) and self.ids[i] == id_pedido:
+            return self.inicios[i], self.tamanhos[i]
+        return None
+
+    def truncar(self, quantidade: int) -> None:
+        del self.ids[quantidade:], self.inicios[quantidade:], self.tamanhos[quantidade:]
+
+    def para_bytes(self) -> bytes:
+        return array("q", itertools.chain.from_iterable(zip(self.ids, self.inicios, self.tamanhos))).tobytes()
+
+    @classmethod
+    def de_bytes(cls, dados: bytes) -> "Indice":
+        registros = array("q")
+        registros.frombytes(dados[:len(dados) - len(dados) % (3 * registros.itemsize)])
+        indice = cls()
+        indice.ids, indice.inicios, indice.tamanhos = registros[0::3], registros[1::3], registros[2::3]
+        return indice
+
+
+class _Anexo:
+    """Pedido na fila do group commit, somado ao livro quando chega ao disco."""
+    __slots__ = ("commit", "id", "total", "tamanho")
+
+    def __init__(self, commit: gravacao_atomica.Commit, id_pedido: int, total: float, tamanho: int) -> None:
+        self.commit = commit
+        self.id = id_pedido
+        self.total = total
+        self.tamanho = tamanho
+
+
+class _Arquivo:
+    """Estado de um arquivo de pedidos neste processo."""
+    __slots__ = ("livro", "indice", "valido", "pendentes")
+
+    def __init__(self) -> None:
+        self.livro = VAZIO
+        self.indice = Indice()
+        self.valido = False  # False: refazer livro e índice antes de usar
+        self.pendentes: Deque[_Anexo] = deque()  # na ordem em que entram no arquivo
+
+
+_lock = threading.Lock()
+_arquivos: Dict[str, _Arquivo] = {}  # por caminho absoluto
+
+
+def caminho_livro(caminho: str) -> str:
+    return os.path.splitext(caminho)[0] + ".total"
+
+
+def caminho_indice(caminho: str) -> str:
+    return os.path.splitext(caminho)[0] + ".idx"
+
+
+def total_itens(itens: Iterable[Mapping[str, Any]]) -> float:
+    return sum(float(item["preco"]) for item in itens)
+
+
+def _total_linha(linha: bytes) -> float:
+    return total_itens(json.loads(linha.partition(b";")[2]))
+
+
+def varrer(arquivo: IO[bytes], inicio: int = 0) -> Iterator[Tuple[int, int, float]]:
+    """(início, tamanho, total) de cada pedido de `inicio` até o fim do arquivo
+    (binário), uma linha por vez. Linhas removidas (só espaços) ou ilegíveis
+    ficam de fora; as ilegíveis são registradas no log."""
+    arquivo.seek(inicio)
+    for linha in arquivo:
+        posicao, inicio = inicio, inicio + len(linha)
+        if not linha.strip():
+            continue
+        try:
+            yield posicao, len(linha), _total_linha(linha)
+        except (ValueError, TypeError, KeyError) as e:
+            log.warning("Pedido ilegível ignorado no livro: %r (%s)", linha[:40], e)
+
+
+def _somar(caminho: str, livro: Livro, indice: Indice) -> Tuple[Livro, bytes]:
+    """livro mais os pedidos gravados depois de livro.tamanho, que entram no
+    índice com os próximos IDs; retorna também os registros novos do índice."""
+    novos = bytearray()
+    quantidade, total, proximo = livro.quantidade, livro.total, livro.proximo_id
+    with open(caminho, "rb") as f:
+        estado = os.fstat(f.fileno())
+        if livro.tamanho:
+            pedidos: Iterable[Tuple[int, int, float]] = varrer(f, livro.tamanho)
+        else:  # o arquivo inteiro: em trechos paralelos quando ele é grande
+            pedidos = agregacao_pedidos.posicoes(caminho, fim=estado.st_size)
+        for inicio, tamanho, valor in pedidos:
+            novos += indice.acrescentar(proximo, inicio, tamanho)
+            proximo += 1
+            quantidade += 1
+            total += valor
+        fim = f.tell() if livro.tamanho else estado.st_size
+    return Livro(estado.st_ino, fim, quantidade, total, len(indice), proximo), bytes(novos)
+
+
+def refazer(caminho: str, primeiro_id: int = 1) -> Tuple[Livro, Indice]:
+    """Recalcula livro e índice lendo o arquivo inteiro (ver agregacao_pedidos.posicoes)."""
+    indice = Indice()
+    livro, _ = _somar(caminho, VAZIO._replace(proximo_id=primeiro_id), indice)
+    return livro, indice
+
+
+def _estado(caminho: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(caminho)
+    except FileNotFoundError:
+        return None
+
+
+def _anexar_indice(caminho: str, registros: bytes) -> None:
+    # derivado do arquivo de pedidos: sem fsync, um índice incompleto é refeito
+    fd = os.open(caminho_indice(caminho), os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        visao = memoryview(registros)
+        while visao:
+            visao = visao[os.write(fd, visao):]
+    finally:
+        os.close(fd)
+
+
+def _salvar(caminho: str, arquivo: _Arquivo, livro: Livro) -> None:
+    arquivo.livro = livro
+    # sem esperar o fsync: um livro perdido ou velho é detectado e refeito
+    gravacao_atomica.enfileirar_substituicao(caminho_livro(caminho), json.dumps(livro._asdict()))
+
+
+def _carregar(caminho: str) -> _Arquivo:
+    """Estado em memória ou, na primeira vez no processo, o salvo ao lado do arquivo."""
+    chave = os.path.abspath(caminho)
+    arquivo = _arquivos.get(chave)
+    if arquivo is None:
+        arquivo = _arquivos[chave] = _Arquivo()
+        if not os.path.exists(caminho):
+            # arquivo apagado ao sair: o livro sobrevive e os IDs não recomeçam
+            # (os pedidos antigos continuam no histórico com os seus)
+            arquivo.valido = True
+            if os.path.exists(caminho_livro(caminho)):
+                try:
+                    with open(caminho_livro(caminho), encoding="utf-8") as f:
+                        arquivo.livro = VAZIO._replace(proximo_id=Livro(**json.load(f)).proximo_id)
+                except (OSError, ValueError, TypeError):
+                    log.warning("Livro de pedidos ilegível; os IDs de pedido recomeçam em 1")
+            return arquivo
+        try:
+            with open(caminho_livro(caminho), encoding="utf-8") as f:
+                arquivo.livro = Livro(**json.load(f))
+            with open(caminho_indice(caminho), "rb") as f:
+                arquivo.indice = Indice.de_bytes(f.read())
+        except (OSError, ValueError, TypeError):
+            return arquivo
+        if len(arquivo.indice) >= arquivo.livro.indexados:
+            arquivo.valido = True
+            if len(arquivo.indice) > arquivo.livro.indexados:  # registros de depois do último livro salvo
+                arquivo.indice.truncar(arquivo.livro.indexados)
+                gravacao_atomica.gravar_atomico(caminho_indice(caminho), arquivo.indice.para_bytes())
+    return arquivo
+
+
+def _aplicar_feitos(caminho: str, arquivo: _Arquivo) -> None:
+    """Soma ao livro e ao índice, na ordem do arquivo, os anexos que já chegaram ao disco."""
+    livro, novos, aplicados = arquivo.livro, bytearray(), 0
+    while arquivo.pendentes and arquivo.pendentes[0].commit.feito:
+        anexo = arquivo.pendentes.popleft()
+        aplicados += 1
+        if anexo.commit.erro is not None:
+            arquivo.valido = False  # não dá para saber quanto da escrita chegou ao arquivo
+        elif arquivo.valido:
+            novos += arquivo.indice.acrescentar(anexo.id, livro.tamanho, anexo.tamanho)
+            livro = Livro(livro.inode, livro.tamanho + anexo.tamanho, livro.quantidade + 1,
+                          livro.total + anexo.total, len(arquivo.indice), anexo.id + 1)
+    if not aplicados or not arquivo.valido:
+        return
+    if livro.inode is None:
+        estado = _estado(caminho)
+        livro = livro._replace(inode=estado.st_ino) if estado is not None else livro
+    if novos:
+        _anexar_indice(caminho, bytes(novos))
+    _salvar(caminho, arquivo, livro)
+
+
+def _em_dia(caminho: str, arquivo: _Arquivo) -> Livro:
+    """Livro e índice conferidos com o arquivo como ele está agora (chamar sob _lock)."""
+    if arquivo.pendentes:
+        gravacao_atomica.descarregar()
+        _aplicar_feitos(caminho, arquivo)
+    livro, estado = arquivo.livro, _estado(caminho)
+    if estado is None:
+        if not arquivo.valido or livro.tamanho:
+            arquivo.indice, arquivo.valido = Indice(), True
+            gravacao_atomica.gravar_atomico(caminho_indice(caminho), b"")
+            _salvar(caminho, arquivo, VAZIO._replace(proximo_id=livro.proximo_id))
+    elif not arquivo.valido or livro.inode not in (None, estado.st_ino) or livro.tamanho > estado.st_size:
+        # livro perdido ou de outro arquivo: IDs novos a partir do último dado
+        novo, arquivo.indice = refazer(caminho, livro.proximo_id)
+        arquivo.valido = True
+        gravacao_atomica.gravar_atomico(caminho_indice(caminho), arquivo.indice.para_bytes())
+        _salvar(caminho, arquivo, novo)
+    elif livro.tamanho < estado.st_size or livro.inode is None:
+        novo, registros = _somar(caminho, livro, arquivo.indice)  # gravado por outro processo
+        if registros:
+            _anexar_indice(caminho, registros)
+        _salvar(caminho, arquivo, novo)
+    return arquivo.livro
+
+
+def anexar(caminho: str, linha: str, total: float) -> int:
+    """Grava a linha do pedido (group commit) e retorna o ID dado a ele. Quando
+    a linha está em disco, o total entra no livro e a posição, no índice."""
+    # bytes que a linha ocupa no arquivo (anexos são gravados em modo texto)
+    tamanho = len(linha.encode(gravacao_atomica.CODIFICACAO_TEXTO)) + linha.count("\n") * (len(os.linesep) - 1)
+    with _lock:
+        arquivo = _carregar(caminho)
+        # com anexos em voo o arquivo ainda não tem os bytes deles; confere só quando está parado
+        if not arquivo.pendentes or not arquivo.valido:
+            _em_dia(caminho, arquivo)
+        id_pedido = arquivo.livro.proximo_id + len(arquivo.pendentes)
+        commit = gravacao_atomica.enfileirar_anexo(caminho, linha)
+        arquivo.pendentes.append(_Anexo(commit, id_pedido, total, tamanho))
+    try:
+        commit.esperar()
+    finally:
+        with _lock:
+            _aplicar_feitos(caminho, arquivo)
+    return id_pedido
+
+
+def resumo(caminho: str) -> Tuple[int, float]:
+    """(quantidade, total) dos pedidos do arquivo; O(1) quando o livro confere com ele."""
+    with _lock:
+        livro = _em_dia(caminho, _carregar(caminho))
+        return livro.quantidade, livro.total
+
+
+def buscar(caminho: str, id_pedido: int) -> Optional[bytes]:
+    """Linha do pedido (um seek e uma leitura); None se não existe ou foi removido."""
+    with _lock:
+        arquivo = _carregar(caminho)
+        _em_dia(caminho, arquivo)
+        local = arquivo.indice.localizar(id_pedido)
+        if local is None:
+            return None
+        inicio, tamanho = local
+        with open(caminho, "rb") as f:
+            f.seek(inicio)
+            linha = f.read(tamanho)
+    return linha if linha.strip() else None
+
+
+def remover(caminho: str, id_pedido: int) -> Optional[bytes]:
+    """Tira o pedido dos pendentes (pago ou cancelado) cobrindo a linha com
+    espaços no lugar, e o desconta do livro. Retorna a linha removida."""
+    with _lock:
+        arquivo = _carregar(caminho)
+        livro = _em_dia(caminho, arquivo)
+        local = arquivo.indice.localizar(id_pedido)
+        if local is None:
+            return None
+        inicio, tamanho = local
+        with open(caminho, "r+b") as f:
+            f.seek(inicio)
+            linha = f.read(tamanho)
+            conteudo = linha.rstrip(b"\r\n")
+            if not conteudo.strip():
+                return None  # já removido
+            valor = _total_linha(conteudo)
+            f.seek(inicio)
+            f.write(b" " * len(conteudo))
+            f.flush()
+            os.fsync(f.fileno())
+        quantidade = livro.quantidade - 1
+        _salvar(caminho, arquivo, livro._replace(quantidade=quantidade,
+                                                 total=livro.total - valor if quantidade else 0.0))
+    return linha
+
+
+def esvaziar(caminho: str) -> None:
+    """Troca o arquivo por um vazio (atomicamente) e zera livro e índice junto;
+    os IDs seguem de onde pararam."""
+    with _lock:
+        arquivo = _carregar(caminho)
+        proximo_id = _em_dia(caminho, arquivo).proximo_id
+        gravacao_atomica.substituir(caminho, "")
+        arquivo.indice, arquivo.valido = Indice(), True
+        gravacao_atomica.gravar_atomico(caminho_indice(caminho), b"")
+        estado = _estado(caminho)
+        _salvar(caminho, arquivo, VAZIO._replace(inode=estado.st_ino if estado is not None else None,
+                                                 proximo_id=proximo_id))
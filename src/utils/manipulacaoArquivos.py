@@ -1,39 +1,227 @@
 import os
 import json
+import shutil
+import threading
 from datetime import datetime
 
-def gravarProdutoFakeStore(id, title, price, description):
-    with open("produtos_local.txt", "a") as f:
-        f.write(f"{id};{title};{price};{description}\n")
+import src.utils.cache_arquivos as cache_arquivos
+import src.utils.gravacao_atomica as gravacao_atomica
+import src.utils.leitor_mmap as leitor_mmap
+import src.utils.livro_pedidos as livro_pedidos
+import src.utils.particoes_pedidos as particoes_pedidos
+from src.models.produto import ItemPedido, Produto
+
+# produtos_local.txt é um log só de acréscimos: "id;title;price;description"
+# cria/substitui o produto e "-;id" o exclui. Quem lê reaplica o log do início;
+# a compactação reescreve só os produtos vivos quando o lixo acumula.
+PRODUTOS_LOCAIS = "produtos_local.txt"
+PEDIDOS = "Pedidos.txt"
+SEQUENCIA_PRODUTOS = "produtos_local.seq"  # próximo ID livre (ver sequencia_ids)
+HISTORICO_PEDIDOS = "historico_pedidos"  # partições por data de todos os pedidos (ver particoes_pedidos)
+EXCLUSAO = "-"
+COMPACTAR_APOS = 100  # registros obsoletos tolerados antes de compactar
+
+_lock_produtos = threading.Lock()
+_obsoletos = 0
+_compactacao = None
+
+def _anexar_registro(linha):
+    # Enfileira sob a trava (compactação e lotes descarregam a fila antes de tocar
+    # no log) e espera o group commit fora dela, junto com outros escritores
+    with _lock_produtos:
+        commit = gravacao_atomica.enfileirar_anexo(PRODUTOS_LOCAIS, linha)
+    commit.esperar()
+    cache_arquivos.invalidar(PRODUTOS_LOCAIS)
+
+def _reaplicar_log(linhas):
+    """Retorna ({id: produto} na ordem de cadastro, nº de registros válidos lidos)."""
+    produtos = {}
+    registros = 0
+    for linha in linhas:
+        partes = linha.strip().split(";")
+        if len(partes) in leitor_mmap.CAMPOS_PRODUTO:  # categoria opcional no 5º campo
+            id_, title, price, description = partes[:4]
+            categoria = partes[4] if len(partes) == 5 and partes[4] else None
+            produtos[int(id_)] = Produto(int(id_), title, float(price), description, categoria)
+        elif len(partes) == 2 and partes[0] == EXCLUSAO and partes[1].isdigit():
+            produtos.pop(int(partes[1]), None)
+        else:
+            continue
+        registros += 1
+    return produtos, registros
+
+def _registrar_obsoletos(quantidade):
+    global _obsoletos
+    _obsoletos += quantidade
+    if _obsoletos >= COMPACTAR_APOS:
+        agendarCompactacao()
+
+def _registro_produto(id, title, price, description, category=None):
+    # "id;title;price;description[;category]": sem categoria, o formato antigo de 4 campos
+    registro = f"{id};{title};{price};{description}"
+    return f"{registro};{category}\n" if category else registro + "\n"
+
+def gravarProdutoFakeStore(id, title, price, description, category=None):
+    _anexar_registro(_registro_produto(id, title, price, description, category))
+
+def gravarProdutosEmLote(produtos):
+    """Acrescenta um lote inteiro numa troca atômica (cópia do log + lote num
+    temporário, fsync, os.replace): depois de uma queda o log tem o lote todo ou nada dele."""
+    texto = "".join(_registro_produto(p.id, p.title, p.price, p.description, p.category) for p in produtos)
+    if not texto:
+        return
+    with _lock_produtos:
+        gravacao_atomica.descarregar()  # anexos ainda na fila entram antes da cópia
+        temporario = PRODUTOS_LOCAIS + ".tmp"
+        if os.path.exists(PRODUTOS_LOCAIS):
+            shutil.copyfile(PRODUTOS_LOCAIS, temporario)
+        with open(temporario, "a+b") as f:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":  # última linha sem quebra (editada à mão)
+                    texto = "\n" + texto
+            f.write(texto.encode(leitor_mmap.CODIFICACAO))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, PRODUTOS_LOCAIS)
+        cache_arquivos.invalidar(PRODUTOS_LOCAIS)
+
+def atualizarProdutoLocal(id, title, price, description, category=None):
+    """Edição em O(1) de E/S: um registro novo sobrepõe o anterior na leitura."""
+    gravarProdutoFakeStore(id, title, price, description, category)
+    _registrar_obsoletos(1)
+
+def excluirProdutoLocal(id):
+    _anexar_registro(f"{EXCLUSAO};{id}\n")
+    _registrar_obsoletos(2)  # o registro do produto e o próprio marcador de exclusão
 
 def lerProdutosLocais():
+    # Sem mudança no arquivo, reaproveita o log já reaplicado (cópia rasa por produto)
+    return cache_arquivos.ler(PRODUTOS_LOCAIS, _interpretarProdutosLocais, lambda ps: [p.copiar() for p in ps])
+
+def _interpretarProdutosLocais():
+    global _obsoletos
     try:
-        with open("produtos_local.txt", "r") as f:
-            produtos = []
-            for linha in f:
-                partes = linha.strip().split(";")
-                if len(partes) == 4:
-                    id_, title, price, description = partes
-                    produtos.append({
-                        "id": int(id_),
-                        "title": title,
-                        "price": float(price),
-                        "description": description
-                    })
-            return produtos
+        with open(PRODUTOS_LOCAIS, "r") as f:
+            produtos, registros = _reaplicar_log(f)
     except FileNotFoundError:
         return []
+    _obsoletos = registros - len(produtos)
+    if _obsoletos >= COMPACTAR_APOS:
+        agendarCompactacao()
+    return list(produtos.values())
+
+def compactarProdutosLocais():
+    """Reescreve o log só com os produtos vivos (arquivo temporário + troca atômica)."""
+    global _obsoletos
+    with _lock_produtos:
+        gravacao_atomica.descarregar()
+        if not os.path.exists(PRODUTOS_LOCAIS):
+            return
+        temporario = PRODUTOS_LOCAIS + ".tmp"
+        # copia os registros vivos como estão, sem decodificar produto algum
+        with abrirProdutosLocais() as log, open(temporario, "wb") as f:
+            for registro in log.brutos():
+                f.write(registro.rstrip(b"\r") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, PRODUTOS_LOCAIS)
+        cache_arquivos.invalidar(PRODUTOS_LOCAIS)
+        _obsoletos = 0
+
+def agendarCompactacao():
+    """Compacta numa thread em segundo plano (uma por vez)."""
+    global _compactacao
+    if _compactacao is not None and _compactacao.is_alive():
+        return
+    _compactacao = threading.Thread(target=compactarProdutosLocais, name="compactacao-produtos", daemon=True)
+    _compactacao.start()
+
+def aguardarCompactacao(timeout=None):
+    if _compactacao is not None:
+        _compactacao.join(timeout)
 
 def gravarPedidos(listaPedido, datahora):
     # Convertemos para lista de dicts para evitar problemas com json.dumps em tuplas
-    lista_dict = [{"id": item[0], "nome": item[1], "preco": item[2]} for item in listaPedido]
-    with open("Pedidos.txt", "a") as f:
-        f.write(f"{datahora};{json.dumps(lista_dict)}\n")
+    lista_dict = [ItemPedido.de(item).para_dict() for item in listaPedido]
+    # group commit: pedidos fechados ao mesmo tempo dividem uma escrita e um fsync;
+    # o livro de pedidos soma o total e indexa a posição quando ele chega ao disco.
+    # A mesma linha vai para a partição do dia no histórico, no mesmo lote,
+    # e entra no resumo de vendas da partição.
+    linha = f"{datahora};{json.dumps(lista_dict)}\n"
+    historico = particoes_pedidos.abrir(HISTORICO_PEDIDOS)
+    arquivado = historico.anexar(str(datahora), linha, lista_dict)
+    id_pedido = livro_pedidos.anexar(PEDIDOS, linha, livro_pedidos.total_itens(lista_dict))
+    historico.confirmar(arquivado)
+    return id_pedido
+
+def buscarPedido(id_pedido):
+    """(datahora, itens) do pedido pelo ID: um seek e uma leitura via índice; None se não existe."""
+    linha = livro_pedidos.buscar(PEDIDOS, id_pedido)
+    return None if linha is None else leitor_mmap.decodificar_pedido(linha)
+
+def removerPedido(id_pedido):
+    """Tira um pedido dos pendentes (pago ou cancelado) e o retorna; None se não existe."""
+    linha = livro_pedidos.remover(PEDIDOS, id_pedido)
+    return None if linha is None else leitor_mmap.decodificar_pedido(linha)
+
+def lerPedidos():
+    """[(datahora, itens)] de Pedidos.txt, ignorando linhas corrompidas."""
+    pedidos = []
+    try:
+        arquivo = lerArquivo(PEDIDOS, "r")
+    except FileNotFoundError:
+        return pedidos
+    with arquivo:
+        for linha in arquivo:
+            partes = linha.strip().split(";", 1)
+            try:
+                pedidos.append((partes[0], json.loads(partes[1])))
+            except (IndexError, ValueError):
+                continue
+    return pedidos
+
+def abrirProdutosLocais():
+    """Produtos vivos de produtos_local.txt, decodificados só no acesso (feche após o uso)."""
+    return leitor_mmap.ProdutosLocais(PRODUTOS_LOCAIS)
+
+def abrirPedidos():
+    """Pedidos.txt mapeado em memória: acesso aleatório e iteração sem carregar o
+    arquivo inteiro (feche antes de apagar os pedidos)."""
+    return leitor_mmap.Pedidos(PEDIDOS)
+
+def lerHistoricoPedidos(inicio=None, fim=None):
+    """Pedidos já gravados (pagos ou não) com inicio <= datahora < fim, lidos só
+    das partições que cruzam o período; gerador, na ordem das partições."""
+    return particoes_pedidos.abrir(HISTORICO_PEDIDOS).consultar(inicio, fim)
+
+def vendasPorDia(inicio=None, fim=None):
+    """{dia: Agregado} dos pedidos gravados com inicio <= dia < fim, somando os
+    resumos das partições (sem reler os pedidos)."""
+    por_dia = {}
+    for chave, resumo in particoes_pedidos.abrir(HISTORICO_PEDIDOS).resumos(inicio, fim).items():
+        dia = chave[:particoes_pedidos.TAMANHO_CHAVE["dia"]] if chave != particoes_pedidos.SEM_DATA else chave
+        if dia in por_dia:
+            por_dia[dia].juntar(resumo)
+        else:
+            por_dia[dia] = resumo
+    return por_dia
+
+def resumoPedidos():
+    """(quantidade, valor total) dos pedidos, pelo livro de pedidos, sem reler o arquivo."""
+    return livro_pedidos.resumo(PEDIDOS)
+
+def apagarPedidos():
+    # arquivo vazio trocado atomicamente, em vez de truncar o original no lugar
+    livro_pedidos.esvaziar(PEDIDOS)
 
 def lerArquivo(nome, modo="r"):
     return open(nome, modo)
 
 def apagarArquivosTemporarios():
-    for arquivo in ["produtos_local.txt", "Pedidos.txt"]:
+    # o atexit do group commit roda depois deste (registrado antes): um commit
+    # ainda na fila recriaria os arquivos apagados, então descarrega primeiro
+    gravacao_atomica.descarregar()
+    for arquivo in [PRODUTOS_LOCAIS, PEDIDOS]:
         if os.path.exists(arquivo):
             os.remove(arquivo)
@@ -0,0 +1,255 @@
+"""
+particoes_pedidos.py
+Histórico de pedidos particionado por tempo. Todo pedido gravado vai também
+para o arquivo da sua partição (um por dia, ou por hora com
+LOJA_PARTICAO=hora) numa pasta própria, no mesmo formato "datahora;[itens]" de
+Pedidos.txt. O manifesto (manifesto.json) guarda, por partição, o menor e o
+maior datahora, o nº de linhas e o tamanho em bytes. Uma consulta por período
+abre só as partições que cruzam o intervalo, então o custo acompanha a janela
+pedida e não o histórico inteiro.
+Cada partição tem também um resumo de vendas (<partição>.resumo.json: pedidos,
+itens, receita e somas por produto), atualizado a cada pedido anexado; painéis
+leem os resumos em vez de reler as linhas. Um resumo que não cobre o tamanho
+atual da partição é refeito a partir do arquivo dela.
+Pedidos.txt continua sendo a fila de pendentes (zerada no pagamento); as
+partições não são apagadas.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import src.utils.agregacao_pedidos as agregacao_pedidos
+import src.utils.gravacao_atomica as gravacao_atomica
+import src.utils.leitor_mmap as leitor_mmap
+from src.utils.logs import get_logger
+
+GRANULARIDADE = os.environ.get("LOJA_PARTICAO", "dia")
+TAMANHO_CHAVE = {"dia": len("AAAA-MM-DD"), "hora": len("AAAA-MM-DD HH")}
+MANIFESTO = "manifesto.json"
+EXTENSAO = ".txt"
+RESUMO = ".resumo.json"
+SEM_DATA = "sem-data"  # pedidos cujo datahora não começa por uma data
+_DATA = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+log = get_logger("particoes_pedidos")
+
+Pedido = Tuple[str, List[Dict[str, Any]]]
+
+
+class Particao(NamedTuple):
+    minimo: str  # menor datahora gravado na partição
+    maximo: str
+    linhas: int
+    tamanho: int  # bytes; se o arquivo não bate, a partição é relida
+
+
+def chave(datahora: str, granularidade: str = GRANULARIDADE) -> str:
+    """Partição do pedido: "2025-08-18" por dia, "2025-08-18T10" por hora."""
+    if not _DATA.match(datahora):
+        return SEM_DATA
+    return datahora[:TAMANHO_CHAVE[granularidade]].replace(" ", "T")
+
+
+def _limite(valor: Any) -> Optional[str]:
+    # date/datetime/str viram o mesmo texto ISO gravado nos pedidos, comparável como string
+    return None if valor is None else str(valor)
+
+
+def no_periodo(chave_particao: str, inicio: Any = None, fim: Any = None) -> bool:
+    """Partição inteira dentro de inicio <= dia < fim (limites de dia, "AAAA-MM-DD").
+    Partições sem data só entram quando não há limite."""
+    inicio, fim = _limite(inicio), _limite(fim)
+    if chave_particao == SEM_DATA:
+        return inicio is None and fim is None
+    dia = chave_particao[:TAMANHO_CHAVE["dia"]]
+    return (inicio is None or dia >= inicio[:TAMANHO_CHAVE["dia"]]) and \
+        (fim is None or dia < fim[:TAMANHO_CHAVE["dia"]])
+
+
+class Historico:
+    """Partições de uma pasta. Use abrir(pasta): uma instância por pasta no processo."""
+
+    def __init__(self, pasta: str) -> None:
+        self.pasta = pasta
+        self._lock = threading.Lock()
+        self._particoes: Optional[Dict[str, Particao]] = None
+        self._resumos: Dict[str, Tuple[int, agregacao_pedidos.Agregado]] = {}  # chave -> (bytes cobertos, resumo)
+
+    def caminho(self, chave_particao: str) -> str:
+        return os.path.join(self.pasta, chave_particao + EXTENSAO)
+
+    def caminho_resumo(self, chave_particao: str) -> str:
+        return os.path.join(self.pasta, chave_particao + RESUMO)
+
+    # --- manifesto ---
+    def _ler_particao(self, chave_particao: str) -> Particao:
+        minimo = maximo = None
+        linhas = 0
+        with leitor_mmap.Pedidos(self.caminho(chave_particao)) as pedidos:
+            for datahora, _ in pedidos:
+                minimo = datahora if minimo is None else min(minimo, datahora)
+                maximo = datahora if maximo is None else max(maximo, datahora)
+                linhas += 1
+        tamanho = os.path.getsize(self.caminho(chave_particao))
+        return Particao(minimo or "", maximo or "", linhas, tamanho)
+
+    def _carregar(self) -> Dict[str, Particao]:
+        """Manifesto conferido com os arquivos da pasta; partições que não batem são relidas."""
+        if self._particoes is not None:
+            return self._particoes
+        salvo: Dict[str, Particao] = {}
+        caminho_manifesto = os.path.join(self.pasta, MANIFESTO)
+        if os.path.exists(caminho_manifesto):
+            try:
+                with open(caminho_manifesto, encoding="utf-8") as f:
+                    salvo = {k: Particao(*v) for k, v in json.load(f).items()}
+            except (OSError, ValueError, TypeError) as e:
+                log.warning("Manifesto de pedidos ilegível, relendo as partições: %s", e)
+        particoes: Dict[str, Particao] = {}
+        if os.path.isdir(self.pasta):
+            for entrada in os.scandir(self.pasta):
+                if not entrada.name.endswith(EXTENSAO):
+                    continue
+                chave_particao = entrada.name[:-len(EXTENSAO)]
+                particao = salvo.get(chave_particao)
+                if particao is None or particao.tamanho != entrada.stat().st_size:
+                    particao = self._ler_particao(chave_particao)
+                particoes[chave_particao] = particao
+        self._particoes = particoes
+        if particoes != salvo:
+            self._salvar()
+        return particoes
+
+    def _salvar(self) -> None:
+        # derivado das partições: sem esperar o fsync, um manifesto velho é corrigido na leitura
+        gravacao_atomica.enfileirar_substituicao(
+            os.path.join(self.pasta, MANIFESTO),
+            json.dumps({k: list(p) for k, p in sorted(self._particoes.items())}),
+        )
+
+    def manifesto(self) -> Dict[str, Particao]:
+        with self._lock:
+            return dict(self._carregar())
+
+    # --- resumos de vendas ---
+    def _resumo_salvo(self, chave_particao: str, tamanho: int) -> Optional[agregacao_pedidos.Agregado]:
+        """Resumo da partição se o em memória ou o do disco cobre exatamente `tamanho` bytes."""
+        if not tamanho:
+            return agregacao_pedidos.Agregado()
+        em_memoria = self._resumos.get(chave_particao)
+        if em_memoria is not None and em_memoria[0] == tamanho:
+            return em_memoria[1]
+        caminho = self.caminho_resumo(chave_particao)
+        if not os.path.exists(caminho):
+            return None
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+            if dados["tamanho"] != tamanho:
+                return None
+            resumo = agregacao_pedidos.Agregado.de_dict(dados)
+        except (OSError, ValueError, TypeError, KeyError, IndexError) as e:
+            log.warning("Resumo de vendas %s ilegível: %s", caminho, e)
+            return None
+        self._resumos[chave_particao] = (tamanho, resumo)
+        return resumo
+
+    def _guardar_resumo(self, chave_particao: str, tamanho: int, resumo: agregacao_pedidos.Agregado) -> None:
+        self._resumos[chave_particao] = (tamanho, resumo)
+        # derivado, como o manifesto: se ficar para trás, é refeito da partição
+        gravacao_atomica.enfileirar_substituicao(
+            self.caminho_resumo(chave_particao), json.dumps({"tamanho": tamanho, **resumo.para_dict()}))
+
+    def _resumo(self, chave_particao: str) -> agregacao_pedidos.Agregado:
+        tamanho = self._carregar()[chave_particao].tamanho
+        resumo = self._resumo_salvo(chave_particao, tamanho)
+        if resumo is None:
+            # as linhas já contadas no manifesto precisam estar no arquivo antes de relê-lo
+            gravacao_atomica.descarregar()
+            log.info("Refazendo o resumo de vendas da partição %s", chave_particao)
+            resumo = agregacao_pedidos.agregar(self.caminho(chave_particao))
+            self._guardar_resumo(chave_particao, tamanho, resumo)
+        return resumo
+
+    def resumos(self, inicio: Any = None, fim: Any = None) -> Dict[str, agregacao_pedidos.Agregado]:
+        """Resumo de vendas (cópia) de cada partição com inicio <= dia < fim, sem ler pedidos
+        quando os resumos estão em dia."""
+        with self._lock:
+            return {k: agregacao_pedidos.Agregado().juntar(self._resumo(k))
+                    for k, p in sorted(self._carregar().items()) if p.linhas and no_periodo(k, inicio, fim)}
+
+    # --- gravação ---
+    def anexar(self, datahora: str, linha: str,
+               itens: Optional[List[Dict[str, Any]]] = None) -> gravacao_atomica.Commit:
+        """Enfileira a linha na partição do pedido (mesmo group commit de
+        Pedidos.txt) e já a conta no manifesto e no resumo de vendas; confirme
+        com confirmar(commit). `itens` evita reler o JSON da linha."""
+        dados = linha.encode(leitor_mmap.CODIFICACAO)
+        if itens is None:
+            itens = json.loads(linha.partition(";")[2])
+        with self._lock:
+            particoes = self._carregar()
+            if not particoes:
+                os.makedirs(self.pasta, exist_ok=True)
+            chave_particao = chave(datahora)
+            atual = particoes.get(chave_particao)
+            resumo = self._resumo_salvo(chave_particao, atual.tamanho if atual else 0)
+            if resumo is None:
+                self._resumos.pop(chave_particao, None)  # refeito na próxima consulta
+            else:
+                resumo.acrescentar(itens)
+                self._guardar_resumo(chave_particao, (atual.tamanho if atual else 0) + len(dados), resumo)
+            if atual is None:
+                particoes[chave_particao] = Particao(datahora, datahora, 1, len(dados))
+            else:
+                particoes[chave_particao] = Particao(min(atual.minimo, datahora), max(atual.maximo, datahora),
+                                                    atual.linhas + 1, atual.tamanho + len(dados))
+            commit = gravacao_atomica.enfileirar_anexo(self.caminho(chave_particao), dados)
+            self._salvar()
+        return commit
+
+    def confirmar(self, commit: gravacao_atomica.Commit) -> None:
+        try:
+            commit.esperar()
+        except BaseException:
+            with self._lock:
+                self._particoes = None  # o manifesto em memória contou uma linha que não foi gravada
+                self._resumos.clear()
+            raise
+
+    # --- consulta ---
+    def particoes(self, inicio: Any = None, fim: Any = None) -> List[str]:
+        """Partições, em ordem, com algum pedido em inicio <= datahora < fim (pelo manifesto)."""
+        inicio, fim = _limite(inicio), _limite(fim)
+        with self._lock:
+            return sorted(
+                k for k, p in self._carregar().items()
+                if p.linhas and (inicio is None or p.maximo >= inicio) and (fim is None or p.minimo < fim)
+            )
+
+    def consultar(self, inicio: Any = None, fim: Any = None) -> Iterator[Pedido]:
+        """Pedidos com inicio <= datahora < fim, partição a partição, sem carregar nenhuma inteira."""
+        limite_inicio, limite_fim = _limite(inicio), _limite(fim)
+        for chave_particao in self.particoes(inicio, fim):
+            with leitor_mmap.Pedidos(self.caminho(chave_particao)) as pedidos:
+                for datahora, itens in pedidos:
+                    if (limite_inicio is None or datahora >= limite_inicio) and \
+                            (limite_fim is None or datahora < limite_fim):
+                        yield datahora, itens
+
+
+_historicos: Dict[str, Historico] = {}
+_lock = threading.Lock()
+
+
+def abrir(pasta: str) -> Historico:
+    with _lock:
+        chave_pasta = os.path.abspath(pasta)
+        historico = _historicos.get(chave_pasta)
+        if historico is None:
+            historico = _historicos[chave_pasta] = Historico(pasta)
+        return historico
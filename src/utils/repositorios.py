@@ -0,0 +1,439 @@
+"""
+repositorios.py
+Interface única de armazenamento para produtos locais, pedidos e usuários, com
+três backends: memória (testes e caminhos quentes), arquivo (formato atual:
+produtos_local.txt, Pedidos.txt, db.json) e SQLite. O backend vem de
+LOJA_BACKEND (memoria | arquivo | sqlite; padrão: arquivo).
+"""
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import src.utils.banco_sqlite as banco_sqlite
+import src.utils.cache_arquivos as cache_arquivos
+import src.utils.manipulacaoArquivos as manipulacaoArquivos
+import src.utils.particoes_pedidos as particoes_pedidos
+import src.utils.sequencia_ids as sequencia_ids
+from src.models.produto import ItemPedido, Produto
+from src.utils.agregacao_pedidos import Agregado
+
+Pedido = Tuple[str, List[Dict[str, Any]]]  # (datahora, itens no formato gravado: {"id", "nome", "preco"})
+
+PRIMEIRO_ID_LOCAL = 21  # a Fake Store usa os IDs 1..20
+TAMANHO_BLOCO_IDS = int(os.environ.get("LOJA_BLOCO_IDS", "20"))
+
+
+def _itens_pedido(lista_pedido: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+    return [ItemPedido.de(item).para_dict() for item in lista_pedido]
+
+
+def _categoria(produto: Produto) -> Dict[str, Any]:
+    # só produtos com categoria ganham o 5º campo no log de produtos locais
+    return {"category": produto.category} if produto.category else {}
+
+
+class Repositorio(ABC):
+    nome = ""
+    busca_indexada = False  # buscar_usuario não varre a base inteira
+
+    def __init__(self) -> None:
+        self._lock_ids = threading.Lock()
+        self._ids_reservados = iter(())
+
+    def gerar_id_produto(self) -> int:
+        """Próximo ID do bloco reservado por este processo; só volta ao disco a
+        cada TAMANHO_BLOCO_IDS cadastros. IDs não usados de um bloco viram lacunas."""
+        with self._lock_ids:
+            id_produto = next(self._ids_reservados, None)
+            if id_produto is None:
+                inicio = self.reservar_ids_produto(TAMANHO_BLOCO_IDS)
+                self._ids_reservados = iter(range(inicio + 1, inicio + TAMANHO_BLOCO_IDS))
+                id_produto = inicio
+            return id_produto
+
+    @abstractmethod
+    def reservar_ids_produto(self, quantidade: int) -> int:
+        """Reserva de forma durável `quantidade` IDs consecutivos; retorna o primeiro."""
+
+    # --- produtos locais ---
+    @abstractmethod
+    def listar_produtos(self) -> List[Produto]: ...
+
+    @abstractmethod
+    def inserir_produto(self, produto: Produto) -> None: ...
+
+    @abstractmethod
+    def inserir_produtos(self, produtos: Sequence[Produto]) -> None:
+        """Grava um lote de produtos de forma atômica: todos ou nenhum."""
+
+    @abstractmethod
+    def atualizar_produto(self, produto: Produto) -> None: ...
+
+    def assinatura_produtos(self) -> Optional[Hashable]:
+        """Valor que muda sempre que os produtos locais mudam (o catálogo só é
+        remontado quando ele muda); None se o backend não sabe dizer."""
+        return None
+
+    @abstractmethod
+    def excluir_produto(self, id_produto: int) -> None: ...
+
+    # --- pedidos ---
+    @abstractmethod
+    def gravar_pedido(self, lista_pedido: Sequence[Sequence[Any]], datahora: Any) -> int:
+        """lista_pedido no formato do carrinho: [(id, nome, preço), ...]. Retorna o ID do pedido."""
+
+    @abstractmethod
+    def buscar_pedido(self, id_pedido: int) -> Optional[Pedido]: ...
+
+    @abstractmethod
+    def remover_pedido(self, id_pedido: int) -> Optional[Pedido]:
+        """Tira um pedido dos pendentes (pago ou cancelado) e o retorna; None se não existe."""
+
+    @abstractmethod
+    def listar_pedidos(self) -> List[Pedido]: ...
+
+    @contextmanager
+    def abrir_pedidos(self) -> Iterator[Sequence[Pedido]]:
+        """Pedidos como sequência somente leitura, válida dentro do with; backends
+        em arquivo a entregam preguiçosa para não carregar tudo em memória."""
+        yield self.listar_pedidos()
+
+    def resumo_pedidos(self) -> Tuple[int, float]:
+        """(quantidade de pedidos, valor total) a pagar. Padrão: percorre os pedidos;
+        os backends mantêm o resumo pronto."""
+        quantidade, total = 0, 0.0
+        with self.abrir_pedidos() as pedidos:
+            for _, itens in pedidos:
+                quantidade += 1
+                total += sum(float(item["preco"]) for item in itens)
+        return quantidade, total
+
+    @abstractmethod
+    def apagar_pedidos(self) -> None:
+        """Zera os pendentes; o histórico continua."""
+
+    @abstractmethod
+    def historico_pedidos(self, inicio: Any = None, fim: Any = None) -> Iterator[Pedido]:
+        """Todos os pedidos já gravados (pagos ou não) com inicio <= datahora < fim,
+        lidos só do trecho do histórico que cruza o período."""
+
+    def vendas_por_dia(self, inicio: Any = None, fim: Any = None) -> Dict[str, Agregado]:
+        """{dia "AAAA-MM-DD": Agregado} dos pedidos gravados com inicio <= dia < fim.
+        Padrão: percorre o histórico; os backends mantêm os agregados prontos."""
+        por_dia: Dict[str, Agregado] = {}
+        for datahora, itens in self.historico_pedidos():
+            dia = particoes_pedidos.chave(datahora, "dia")
+            if particoes_pedidos.no_periodo(dia, inicio, fim):
+                por_dia.setdefault(dia, Agregado()).acrescentar(itens)
+        return dict(sorted(por_dia.items()))
+
+    # --- usuários ---
+    @abstractmethod
+    def carregar_usuarios(self) -> Dict[str, Any]:
+        """Formato do db.json: {"usuarios": [...], "recuperacoes": {token: {...}}}."""
+
+    @abstractmethod
+    def salvar_usuarios(self, dados: Dict[str, Any]) -> None: ...
+
+    def buscar_usuario(self, login: str) -> Optional[Dict[str, Any]]:
+        for u in self.carregar_usuarios().get("usuarios", []):
+            if u.get("username") == login or u.get("email") == login:
+                return u
+        return None
+
+
+class RepositorioMemoria(Repositorio):
+    """Tudo em dicionários/listas do processo; nada sobrevive ao encerramento."""
+    nome = "memoria"
+    busca_indexada = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._proximo_id = PRIMEIRO_ID_LOCAL
+        self._produtos: Dict[int, Produto] = {}
+        self._alteracoes_produtos = 0
+        self._pedidos: Dict[int, Pedido] = {}  # na ordem de gravação
+        self._proximo_pedido = 1
+        self._total_pedidos = 0.0
+        self._historico: List[Pedido] = []
+        self._vendas: Dict[str, Agregado] = {}  # por dia
+        self._usuarios: Dict[str, Any] = {"usuarios": [], "recuperacoes": {}}
+        self._por_login: Dict[str, Dict[str, Any]] = {}
+
+    def listar_produtos(self) -> List[Produto]:
+        with self._lock:
+            return [p.copiar() for p in self._produtos.values()]
+
+    def reservar_ids_produto(self, quantidade: int) -> int:
+        with self._lock:
+            inicio = self._proximo_id
+            self._proximo_id += quantidade
+            return inicio
+
+    def inserir_produto(self, produto: Produto) -> None:
+        with self._lock:
+            copia = Produto.de(produto).copiar()
+            self._produtos[copia.id] = copia
+            self._alteracoes_produtos += 1
+
+    def inserir_produtos(self, produtos: Sequence[Produto]) -> None:
+        copias = [Produto.de(p).copiar() for p in produtos]
+        with self._lock:
+            self._produtos.update((p.id, p) for p in copias)
+            self._alteracoes_produtos += 1
+
+    atualizar_produto = inserir_produto
+
+    def excluir_produto(self, id_produto: int) -> None:
+        with self._lock:
+            self._produtos.pop(id_produto, None)
+            self._alteracoes_produtos += 1
+
+    def assinatura_produtos(self) -> Optional[Hashable]:
+        return self._alteracoes_produtos
+
+    def gravar_pedido(self, lista_pedido: Sequence[Sequence[Any]], datahora: Any) -> int:
+        itens = _itens_pedido(lista_pedido)
+        total = sum(float(item["preco"]) for item in itens)
+        with self._lock:
+            id_pedido = self._proximo_pedido
+            self._proximo_pedido += 1
+            self._pedidos[id_pedido] = (str(datahora), itens)
+            self._historico.append((str(datahora), itens))
+            self._vendas.setdefault(particoes_pedidos.chave(str(datahora), "dia"), Agregado()).acrescentar(itens)
+            self._total_pedidos += total
+            return id_pedido
+
+    def listar_pedidos(self) -> List[Pedido]:
+        with self._lock:
+            return [(datahora, [dict(i) for i in itens]) for datahora, itens in self._pedidos.values()]
+
+    def buscar_pedido(self, id_pedido: int) -> Optional[Pedido]:
+        with self._lock:
+            pedido = self._pedidos.get(id_pedido)
+            return None if pedido is None else (pedido[0], [dict(i) for i in pedido[1]])
+
+    def remover_pedido(self, id_pedido: int) -> Optional[Pedido]:
+        with self._lock:
+            pedido = self._pedidos.pop(id_pedido, None)
+            if pedido is not None:
+                self._total_pedidos -= sum(float(i["preco"]) for i in pedido[1])
+                if not self._pedidos:
+                    self._total_pedidos = 0.0  # sem resíduo de arredondamento
+            return pedido
+
+    def resumo_pedidos(self) -> Tuple[int, float]:
+        with self._lock:
+            return len(self._pedidos), self._total_pedidos
+
+    def apagar_pedidos(self) -> None:
+        with self._lock:
+            self._pedidos.clear()
+            self._total_pedidos = 0.0
+
+    def historico_pedidos(self, inicio: Any = None, fim: Any = None) -> Iterator[Pedido]:
+        inicio, fim = (None if v is None else str(v) for v in (inicio, fim))
+        with self._lock:
+            selecionados = [(d, [dict(i) for i in itens]) for d, itens in self._historico
+                            if (inicio is None or d >= inicio) and (fim is None or d < fim)]
+        return iter(selecionados)
+
+    def vendas_por_dia(self, inicio: Any = None, fim: Any = None) -> Dict[str, Agregado]:
+        with self._lock:
+            return {dia: Agregado().juntar(vendas) for dia, vendas in sorted(self._vendas.items())
+                    if particoes_pedidos.no_periodo(dia, inicio, fim)}
+
+    def carregar_usuarios(self) -> Dict[str, Any]:
+        with self._lock:
+            return copy.deepcopy(self._usuarios)  # quem chama altera e depois salva
+
+    def salvar_usuarios(self, dados: Dict[str, Any]) -> None:
+        dados = copy.deepcopy(dados)
+        dados.setdefault("usuarios", [])
+        dados.setdefault("recuperacoes", {})
+        with self._lock:
+            self._usuarios = dados
+            self._por_login = {}
+            for u in dados["usuarios"]:
+                for chave in ("username", "email"):
+                    if u.get(chave):
+                        self._por_login.setdefault(u[chave], u)
+
+    def buscar_usuario(self, login: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            u = self._por_login.get(login)
+            return copy.deepcopy(u) if u is not None else None
+
+
+class RepositorioArquivo(Repositorio):
+    """Formato atual em disco, via manipulacaoArquivos e auth_manipulacao."""
+    nome = "arquivo"
+
+    def listar_produtos(self) -> List[Produto]:
+        return manipulacaoArquivos.lerProdutosLocais()
+
+    def reservar_ids_produto(self, quantidade: int) -> int:
+        def inicial() -> int:
+            # só na criação da sequência: parte do maior ID já gravado (lê só os IDs do log)
+            with manipulacaoArquivos.abrirProdutosLocais() as log:
+                ids = log.ids()
+            return max([PRIMEIRO_ID_LOCAL] + [i + 1 for i in ids])
+
+        return sequencia_ids.reservar(manipulacaoArquivos.SEQUENCIA_PRODUTOS, quantidade, inicial)
+
+    def inserir_produto(self, produto: Produto) -> None:
+        p = Produto.de(produto)
+        manipulacaoArquivos.gravarProdutoFakeStore(p.id, p.title, p.price, p.description, **_categoria(p))
+
+    def inserir_produtos(self, produtos: Sequence[Produto]) -> None:
+        manipulacaoArquivos.gravarProdutosEmLote([Produto.de(p) for p in produtos])
+
+    def atualizar_produto(self, produto: Produto) -> None:
+        p = Produto.de(produto)
+        manipulacaoArquivos.atualizarProdutoLocal(p.id, p.title, p.price, p.description, **_categoria(p))
+
+    def excluir_produto(self, id_produto: int) -> None:
+        manipulacaoArquivos.excluirProdutoLocal(id_produto)
+
+    def assinatura_produtos(self) -> Optional[Hashable]:
+        # (mtime, tamanho, inode) do log; todo cadastro anexa e a compactação troca o arquivo
+        return cache_arquivos.assinatura(manipulacaoArquivos.PRODUTOS_LOCAIS) or "sem arquivo"
+
+    def gravar_pedido(self, lista_pedido: Sequence[Sequence[Any]], datahora: Any) -> int:
+        return manipulacaoArquivos.gravarPedidos(lista_pedido, datahora)
+
+    def listar_pedidos(self) -> List[Pedido]:
+        return manipulacaoArquivos.lerPedidos()
+
+    def buscar_pedido(self, id_pedido: int) -> Optional[Pedido]:
+        return manipulacaoArquivos.buscarPedido(id_pedido)
+
+    def remover_pedido(self, id_pedido: int) -> Optional[Pedido]:
+        return manipulacaoArquivos.removerPedido(id_pedido)
+
+    @contextmanager
+    def abrir_pedidos(self) -> Iterator[Sequence[Pedido]]:
+        with manipulacaoArquivos.abrirPedidos() as pedidos:
+            yield pedidos
+
+    def resumo_pedidos(self) -> Tuple[int, float]:
+        return manipulacaoArquivos.resumoPedidos()
+
+    def apagar_pedidos(self) -> None:
+        manipulacaoArquivos.apagarPedidos()
+
+    def historico_pedidos(self, inicio: Any = None, fim: Any = None) -> Iterator[Pedido]:
+        return manipulacaoArquivos.lerHistoricoPedidos(inicio, fim)
+
+    def vendas_por_dia(self, inicio: Any = None, fim: Any = None) -> Dict[str, Agregado]:
+        return manipulacaoArquivos.vendasPorDia(inicio, fim)
+
+    def carregar_usuarios(self) -> Dict[str, Any]:
+        from src.auth import auth_manipulacao  # import tardio: auth não é dependência de utils
+        return auth_manipulacao.carregar_db()
+
+    def salvar_usuarios(self, dados: Dict[str, Any]) -> None:
+        from src.auth import auth_manipulacao
+        auth_manipulacao.salvar_db(dados)
+
+
+class RepositorioSqlite(Repositorio):
+    """SQLite com índices (ver banco_sqlite); migra os arquivos na criação do banco."""
+    nome = "sqlite"
+    busca_indexada = True
+
+    def listar_produtos(self) -> List[Produto]:
+        return banco_sqlite.listar_produtos()
+
+    def reservar_ids_produto(self, quantidade: int) -> int:
+        return banco_sqlite.reservar_ids_produto(quantidade, PRIMEIRO_ID_LOCAL)
+
+    def inserir_produto(self, produto: Produto) -> None:
+        p = Produto.de(produto)
+        banco_sqlite.salvar_produto(p.id, p.title, p.price, p.description or "", p.category)
+
+    atualizar_produto = inserir_produto
+
+    def inserir_produtos(self, produtos: Sequence[Produto]) -> None:
+        banco_sqlite.salvar_produtos(map(Produto.de, produtos))
+
+    def excluir_produto(self, id_produto: int) -> None:
+        banco_sqlite.excluir_produto(id_produto)
+
+    def gravar_pedido(self, lista_pedido: Sequence[Sequence[Any]], datahora: Any) -> int:
+        return banco_sqlite.inserir_pedido(_itens_pedido(lista_pedido), datahora)
+
+    def listar_pedidos(self) -> List[Pedido]:
+        return banco_sqlite.listar_pedidos()
+
+    def buscar_pedido(self, id_pedido: int) -> Optional[Pedido]:
+        return banco_sqlite.buscar_pedido(id_pedido)
+
+    def remover_pedido(self, id_pedido: int) -> Optional[Pedido]:
+        return banco_sqlite.remover_pedido(id_pedido)
+
+    def resumo_pedidos(self) -> Tuple[int, float]:
+        return banco_sqlite.resumo_pedidos()
+
+    def apagar_pedidos(self) -> None:
+        banco_sqlite.apagar_pedidos()
+
+    def historico_pedidos(self, inicio: Any = None, fim: Any = None) -> Iterator[Pedido]:
+        return banco_sqlite.historico_pedidos(inicio, fim)
+
+    def vendas_por_dia(self, inicio: Any = None, fim: Any = None) -> Dict[str, Agregado]:
+        return banco_sqlite.vendas_por_dia(inicio, fim)
+
+    def carregar_usuarios(self) -> Dict[str, Any]:
+        return banco_sqlite.carregar_usuarios()
+
+    def salvar_usuarios(self, dados: Dict[str, Any]) -> None:
+        banco_sqlite.salvar_usuarios(dados)
+
+    def buscar_usuario(self, login: str) -> Optional[Dict[str, Any]]:
+        return banco_sqlite.buscar_usuario(login)
+
+
+BACKENDS = {cls.nome: cls for cls in (RepositorioMemoria, RepositorioArquivo, RepositorioSqlite)}
+
+_atual: Optional[Repositorio] = None
+_lock = threading.Lock()
+
+
+def criar(nome: str) -> Repositorio:
+    try:
+        return BACKENDS[nome.strip().lower()]()
+    except KeyError:
+        raise ValueError(f"Backend de armazenamento desconhecido: {nome!r} (opções: {', '.join(BACKENDS)})") from None
+
+
+def obter() -> Repositorio:
+    """Repositório configurado para este processo (criado na primeira chamada)."""
+    global _atual
+    if _atual is None:
+        with _lock:
+            if _atual is None:
+                _atual = criar(os.environ.get("LOJA_BACKEND", "arquivo"))
+    return _atual
+
+
+def configurar(backend: Union[str, Repositorio]) -> Repositorio:
+    """Troca o backend em uso (por nome ou instância), ex.: em testes e benchmarks."""
+    global _atual
+    with _lock:
+        _atual = criar(backend) if isinstance(backend, str) else backend
+    return _atual
+
+
+def reiniciar() -> None:
+    """Volta a ler LOJA_BACKEND na próxima chamada (usado em testes)."""
+    global _atual
+    with _lock:
+        _atual = None
+    banco_sqlite.fechar()
@@ -0,0 +1,52 @@
+"""
+sequencia_ids.py
+Sequência durável de IDs num arquivo texto, protegida por trava de arquivo
+(fcntl no Linux/macOS, msvcrt no Windows) para que vários processos nunca
+recebam o mesmo ID. Cada reserva entrega um bloco inteiro de uma vez.
+"""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from src.utils.gravacao_atomica import gravar_atomico
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_lock = threading.Lock()  # a trava de arquivo protege entre processos; esta, entre threads
+
+
+@contextmanager
+def _travar(caminho: str) -> Iterator[None]:
+    with _lock, open(caminho + ".lock", "a+") as trava:
+        if fcntl is not None:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+        else:
+            trava.seek(0)
+            msvcrt.locking(trava.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(trava, fcntl.LOCK_UN)
+            else:
+                trava.seek(0)
+                msvcrt.locking(trava.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def reservar(caminho: str, quantidade: int, inicial: Callable[[], int]) -> int:
+    """Reserva `quantidade` IDs consecutivos e retorna o primeiro. Se o arquivo
+    ainda não existe, a sequência começa em inicial() (chamado sob a trava)."""
+    with _travar(caminho):
+        try:
+            with open(caminho, "r") as f:
+                inicio = int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            inicio = inicial()
+        gravar_atomico(caminho, f"{inicio + quantidade}\n")
+    return inicio
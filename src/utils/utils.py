@@ -5,6 +5,7 @@ Funções utilitárias pequenas e reutilizáveis.
 from __future__ import annotations
 
 import time
+import unicodedata
 from typing import Dict, Any
 
 
@@ -15,3 +16,9 @@ def agora_epoch() -> int:
 def limpar_dict_seguro(d: Dict[str, Any], chaves_sensiveis: set[str]) -> Dict[str, Any]:
     """Retorna uma cópia sem chaves sensíveis (ex.: hashes e salts)."""
     return {k: v for k, v in d.items() if k not in chaves_sensiveis}
+
+
+def normalizar_texto(texto: str) -> str:
+    """Minúsculas e sem acentos ("Café com Açúcar" -> "cafe com acucar")."""
+    decomposto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold()
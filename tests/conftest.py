@@ -0,0 +1,29 @@
+import pytest
+import src.services.cache_catalogo as cache_catalogo
+import src.services.http_cliente as http_cliente
+import src.services.atualizador_catalogo as atualizador_catalogo
+import src.utils.manipulacaoArquivos as manipulacaoArquivos
+import src.utils.repositorios as repositorios
+import src.utils.cache_arquivos as cache_arquivos
+import src.utils.gravacao_atomica as gravacao_atomica
+
+
+@pytest.fixture(autouse=True)
+def isolar_estado(tmp_path, monkeypatch):
+    """Roda cada teste em um diretório temporário e com os caches zerados."""
+    monkeypatch.chdir(tmp_path)
+    cache_catalogo.limpar_cache()
+    http_cliente.reiniciar()
+    atualizador_catalogo.reiniciar()
+    monkeypatch.setattr(manipulacaoArquivos, "_obsoletos", 0)
+    monkeypatch.delenv("LOJA_BACKEND", raising=False)
+    repositorios.reiniciar()
+    cache_arquivos.limpar()
+    monkeypatch.setattr(gravacao_atomica._gravador, "janela", 0)  # sem espera por lote nos testes
+    yield
+    manipulacaoArquivos.aguardarCompactacao()  # antes de sair do diretório temporário
+    gravacao_atomica.descarregar()
+    repositorios.reiniciar()
+    atualizador_catalogo.reiniciar()
+    cache_catalogo.limpar_cache()
+    http_cliente.reiniciar()
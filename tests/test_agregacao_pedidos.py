@@ -0,0 +1,80 @@
+import pytest
+import os
+import src.utils.agregacao_pedidos as agregacao_pedidos
+import src.utils.livro_pedidos as livro_pedidos
+
+
+@pytest.fixture
+def arquivo_pedidos():
+    agregacao_pedidos.gerar_arquivo("Pedidos.txt", 2000)
+    with open("Pedidos.txt", "a") as f:
+        f.write("linha quebrada\n\n" + " " * 30 + "\n")  # ilegível, vazia e removida
+        f.write('2025-08-18 12:00:00;[{"id": 99, "nome": "Produto 99", "preco": 1.0}]\n')
+    return "Pedidos.txt"
+
+
+@pytest.mark.unitario_agregacao_pedidos
+def test_trechos_cortados_em_fronteiras_de_linha(arquivo_pedidos):
+    """Testa que os trechos cobrem o arquivo todo, sem sobras, e começam sempre no início de uma linha"""
+    trechos = agregacao_pedidos.dividir(arquivo_pedidos, 7)
+    with open(arquivo_pedidos, "rb") as f:
+        conteudo = f.read()
+
+    assert len(trechos) == 7
+    assert trechos[0][1] == 0 and trechos[-1][2] == len(conteudo)
+    assert all(a[2] == b[1] for a, b in zip(trechos, trechos[1:]))
+    assert all(conteudo[inicio - 1:inicio] == b"\n" for _, inicio, _ in trechos[1:])
+
+
+@pytest.mark.unitario_agregacao_pedidos
+def test_agregacao_paralela_igual_a_serial(arquivo_pedidos):
+    """Testa que juntar os parciais de vários processos dá o mesmo que uma passada só"""
+    serial = agregacao_pedidos.agregar(arquivo_pedidos, processos=1)
+    paralelo = agregacao_pedidos.agregar(arquivo_pedidos, processos=2, limiar=0)
+
+    assert (paralelo.pedidos, paralelo.itens, paralelo.invalidos) == (serial.pedidos, serial.itens, serial.invalidos)
+    assert (serial.pedidos, serial.invalidos) == (2001, 1)
+    assert paralelo.total == pytest.approx(serial.total)
+    assert paralelo.por_produto.keys() == serial.por_produto.keys()
+    for id_produto, (nome, quantidade, soma) in serial.por_produto.items():
+        assert paralelo.por_produto[id_produto][:2] == [nome, quantidade]
+        assert paralelo.por_produto[id_produto][2] == pytest.approx(soma)
+    assert serial.por_produto[99] == ["Produto 99", 1, 1.0]
+
+
+@pytest.mark.unitario_agregacao_pedidos
+def test_varias_particoes_numa_agregacao(arquivo_pedidos):
+    """Testa a agregação de vários arquivos de uma vez (ex.: as partições de um período)"""
+    with open("outro.txt", "w") as f:
+        f.write('2025-08-19 12:00:00;[{"id": 99, "nome": "Produto 99", "preco": 2.0}]\n')
+
+    agregado = agregacao_pedidos.agregar([arquivo_pedidos, "outro.txt", "inexistente.txt"], processos=2, limiar=0)
+    assert agregado.pedidos == 2002
+    assert agregado.por_produto[99] == ["Produto 99", 2, 3.0]
+
+
+@pytest.mark.unitario_agregacao_pedidos
+def test_posicoes_em_paralelo_refazem_o_livro(arquivo_pedidos):
+    """Testa que as posições lidas em paralelo batem com a leitura serial do livro de pedidos"""
+    with open(arquivo_pedidos, "rb") as f:
+        esperado = list(livro_pedidos.varrer(f))
+
+    assert list(agregacao_pedidos.posicoes(arquivo_pedidos, processos=2, limiar=0)) == esperado
+
+
+@pytest.mark.unitario_agregacao_pedidos
+def test_benchmark_mede_cada_numero_de_processos(arquivo_pedidos, capsys):
+    """Testa o benchmark pela linha de comando"""
+    assert agregacao_pedidos.main(["Pedidos.txt", "--benchmark", "--processos", "2"]) == 0
+    saida = capsys.readouterr().out
+    assert "  1 processo(s)" in saida and "  2 processo(s)" in saida
+
+
+@pytest.mark.unitario_agregacao_pedidos
+def test_arquivo_vazio_agrega_zero():
+    """Testa Pedidos.txt vazio (depois do pagamento): agregado zerado em vez de erro"""
+    open("Pedidos.txt", "w").close()
+
+    agregado = agregacao_pedidos.agregar("Pedidos.txt")
+    assert (agregado.pedidos, agregado.itens, agregado.total) == (0, 0, 0.0)
+    assert agregacao_pedidos.main(["Pedidos.txt"]) == 0
@@ -0,0 +1,69 @@
+import pytest
+from datetime import datetime
+import src.services.analise_vendas as analise_vendas
+import src.utils.repositorios as repositorios
+
+
+@pytest.fixture
+def repositorio():
+    repositorio = repositorios.configurar("memoria")
+    repositorio.gravar_pedido([(1, "Produto A", 10.0), (2, "Produto B", 50.0)], datetime(2025, 8, 18, 10, 0))
+    repositorio.gravar_pedido([(1, "Produto A", 10.0), (1, "Produto A", 10.0)], datetime(2025, 8, 18, 12, 0))
+    repositorio.gravar_pedido([(3, "Produto C", 5.0)], datetime(2025, 8, 19, 9, 0))
+    repositorio.apagar_pedidos()  # pagos: continuam nas vendas
+    return repositorio
+
+
+@pytest.mark.unitario_analise_vendas
+def test_receita_ticket_medio_e_itens_por_pedido(repositorio):
+    """Testa os totais do período e a receita dia a dia"""
+    vendas = analise_vendas.resumo()
+
+    assert (vendas.pedidos, vendas.receita) == (3, 85.0)
+    assert vendas.ticket_medio == pytest.approx(85.0 / 3)
+    assert vendas.itens_por_pedido == pytest.approx(5 / 3)
+    assert vendas.receita_por_dia() == [("2025-08-18", 2, 80.0), ("2025-08-19", 1, 5.0)]
+
+
+@pytest.mark.unitario_analise_vendas
+def test_mais_vendidos_por_quantidade_e_por_receita(repositorio):
+    """Testa os rankings de produtos pelos dois critérios e o corte em n"""
+    vendas = analise_vendas.resumo()
+
+    assert [p.nome for p in vendas.mais_vendidos(2, "quantidade")] == ["Produto A", "Produto B"]
+    assert vendas.mais_vendidos(1, "receita") == [analise_vendas.ProdutoVendido(2, "Produto B", 1, 50.0)]
+    with pytest.raises(ValueError):
+        vendas.mais_vendidos(1, "lucro")
+
+
+@pytest.mark.unitario_analise_vendas
+def test_periodo_usa_os_agregados_sem_reler_o_historico(repositorio, mocker):
+    """Testa o filtro por dia servido pelos agregados, sem percorrer os pedidos"""
+    historico = mocker.spy(repositorio, "historico_pedidos")
+
+    vendas = analise_vendas.resumo("2025-08-19", None)
+
+    assert (vendas.pedidos, vendas.receita) == (1, 5.0)
+    historico.assert_not_called()
+
+
+@pytest.mark.unitario_analise_vendas
+def test_relatorio_na_tela(repositorio, mocker):
+    """Testa o relatório pedido pelo menu: datas, tabelas, data inválida e período vazio"""
+    mocker.patch("builtins.input", side_effect=["2025-08-18", "", "", "18/08", ""])
+    mocker.patch("src.interface.interface.limpar_tela")
+    dias = mocker.patch("src.interface.interface.mostrar_tabela_vendas_por_dia")
+    rankings = mocker.patch("src.interface.interface.mostrar_tabela_mais_vendidos")
+    alerta = mocker.patch("src.interface.interface.mensagem_alerta")
+
+    analise_vendas.relatorio_vendas()
+
+    dias.assert_called_once_with([("2025-08-18", 2, 80.0), ("2025-08-19", 1, 5.0)])
+    assert rankings.call_count == 2
+
+    analise_vendas.relatorio_vendas()  # data fora do formato: cancela em vez de perguntar de novo
+    alerta.assert_called_once_with("❌ Use o formato AAAA-MM-DD.")
+    assert dias.call_count == 1
+
+    analise_vendas.mostrar_resumo(analise_vendas.resumo("2025-09-01"))
+    alerta.assert_called_with("⚠️ Nenhuma venda no período.")
@@ -0,0 +1,87 @@
+import pytest
+import threading
+import src.services.atualizador_catalogo as atualizador_catalogo
+
+PRODUTOS_API = [{"id": 1, "title": "Produto API", "price": 45.0}]
+PRODUTOS_LOCAIS = [{"id": 21, "title": "Produto Local", "price": 30.0, "description": "Desc"}]
+
+
+@pytest.mark.unitario_atualizador_catalogo
+def test_obter_catalogo_carrega_uma_vez(mocker):
+    """Testa que o snapshot é montado na primeira leitura e reaproveitado depois"""
+    mock_api = mocker.patch('src.services.catalogo.buscar_produtos_api', return_value=PRODUTOS_API)
+    mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value=PRODUTOS_LOCAIS)
+
+    primeiro = atualizador_catalogo.obter_catalogo()
+    segundo = atualizador_catalogo.obter_catalogo()
+
+    assert primeiro is segundo
+    assert primeiro.todos == PRODUTOS_API + PRODUTOS_LOCAIS
+    mock_api.assert_called_once()
+
+
+@pytest.mark.unitario_atualizador_catalogo
+def test_recarregar_troca_versao(mocker):
+    """Testa que recarregar publica uma versão nova sem alterar a anterior"""
+    mocker.patch('src.services.catalogo.buscar_produtos_api', return_value=PRODUTOS_API)
+    mock_locais = mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value=[])
+
+    antigo = atualizador_catalogo.obter_catalogo()
+    mock_locais.return_value = PRODUTOS_LOCAIS
+    novo = atualizador_catalogo.recarregar()
+
+    assert novo.versao == antigo.versao + 1
+    assert antigo.produtos_locais == []
+    assert atualizador_catalogo.obter_catalogo() is novo
+
+
+@pytest.mark.unitario_atualizador_catalogo
+def test_alteracoes_locais_sem_reler_arquivo(mocker):
+    """Testa que cadastros alteram o catálogo atual sem reler API nem arquivo"""
+    mock_api = mocker.patch('src.services.catalogo.buscar_produtos_api', return_value=PRODUTOS_API)
+    mock_locais = mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value=[])
+    catalogo = atualizador_catalogo.obter_catalogo()
+
+    atualizador_catalogo.salvar_local(PRODUTOS_LOCAIS[0])
+    assert atualizador_catalogo.obter_catalogo().todos == PRODUTOS_API + PRODUTOS_LOCAIS
+
+    atualizador_catalogo.remover_local(21)
+    assert catalogo.buscar(21) is None
+
+    mock_api.assert_called_once()
+    mock_locais.assert_called_once()
+
+
+@pytest.mark.unitario_atualizador_catalogo
+def test_thread_aquece_catalogo_em_segundo_plano(mocker):
+    """Testa que a thread de atualização publica o snapshot sem ninguém pedir"""
+    carregou = threading.Event()
+
+    def api_falsa(forcar=False):
+        carregou.set()
+        return PRODUTOS_API
+
+    mocker.patch('src.services.catalogo.buscar_produtos_api', side_effect=api_falsa)
+    mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value=[])
+
+    atualizador_catalogo.iniciar(intervalo=60)
+    assert carregou.wait(2)
+    atualizador_catalogo.parar()
+
+    assert atualizador_catalogo._snapshot is not None
+    assert atualizador_catalogo._snapshot.produtos_api == PRODUTOS_API
+
+
+@pytest.mark.unitario_atualizador_catalogo
+def test_atualizacao_sem_mudanca_mantem_versao_e_indices(mocker):
+    """Testa que a atualização periódica só publica versão nova quando API ou arquivo local mudam"""
+    from src.utils import manipulacaoArquivos
+    mocker.patch('src.services.catalogo.buscar_produtos_api', return_value=PRODUTOS_API)
+
+    atual = atualizador_catalogo.obter_catalogo()
+    assert atualizador_catalogo.recarregar(forcar_api=True, so_se_mudou=True) is atual
+
+    manipulacaoArquivos.gravarProdutoFakeStore(21, "Produto Local", 30.0, "Desc")
+    novo = atualizador_catalogo.recarregar(forcar_api=True, so_se_mudou=True)
+    assert novo.versao == atual.versao + 1
+    assert [p.id for p in novo.produtos_locais] == [21]
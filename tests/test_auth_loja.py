@@ -144,13 +144,18 @@ def test_iniciar_sistema_com_usuario(mocker):
     
     with patch('src.auth.auth_loja.tela_login', return_value=usuario):
         with patch('src.auth.auth_loja._abrir_menu_pos_login') as mock_abrir:
-            auth_loja.iniciar_sistema()
-            mock_abrir.assert_called_once_with(usuario)
+            with patch('src.auth.auth_loja.atualizador_catalogo') as mock_atualizador:
+                auth_loja.iniciar_sistema()
+                mock_abrir.assert_called_once_with(usuario)
+                mock_atualizador.iniciar.assert_called_once()
+                mock_atualizador.parar.assert_called_once()
 
 @pytest.mark.unitario_auth_loja
 def test_iniciar_sistema_sem_usuario(mocker):
     """Testa iniciar_sistema sem usuário logado"""
     with patch('src.auth.auth_loja.tela_login', return_value=None):
         with patch('src.auth.auth_loja._abrir_menu_pos_login') as mock_abrir:
-            auth_loja.iniciar_sistema()
-            mock_abrir.assert_not_called()
\ No newline at end of file
+            with patch('src.auth.auth_loja.atualizador_catalogo') as mock_atualizador:
+                auth_loja.iniciar_sistema()
+                mock_abrir.assert_not_called()
+                mock_atualizador.iniciar.assert_not_called()
\ No newline at end of file
@@ -114,16 +114,20 @@ def test_carregar_db_nao_dict(mocker):
 
 @pytest.mark.unitario_auth_manipulacao
 def test_salvar_db_com_ma_sucesso(mocker):
-    """Testa salvar_db usando manipulacaoArquivos com sucesso"""
+    """Testa que salvar_db grava de forma atômica mesmo com manipulacaoArquivos disponível"""
     dados = {"usuarios": [{"id": 1}], "recuperacoes": {}}
     
     # Mock para simular que ma existe e tem lerArquivo
     mock_ma = MagicMock()
+    substituir = mocker.spy(auth_manipulacao.gravacao_atomica, "substituir")
     
     with patch('src.auth.auth_manipulacao.ma', mock_ma):
         auth_manipulacao.salvar_db(dados)
         
-        mock_ma.lerArquivo.assert_called_once_with("db.json", "w")
+        mock_ma.lerArquivo.assert_not_called()
+        assert substituir.call_args[0][0] == "db.json"
+    with open("db.json", encoding="utf-8") as f:
+        assert json.load(f) == dados
 
 @pytest.mark.unitario_auth_manipulacao
 def test_salvar_db_com_ma_falha(mocker):
@@ -162,7 +166,7 @@ def test_salvar_db_estrutura_automatica(mocker):
 
 @pytest.mark.unitario_auth_manipulacao
 def test_salvar_db_excecao_geral(mocker):
-    """Testa salvar_db com exceção geral - versão simplificada"""
+    """Testa que uma falha em manipulacaoArquivos não afeta salvar_db (a gravação não passa por ele)"""
     dados = {"usuarios": [{"id": 1}], "recuperacoes": {}}
     
     # Mock que falha no ma.lerArquivo
@@ -171,11 +175,10 @@ def test_salvar_db_excecao_geral(mocker):
     
     with patch('src.auth.auth_manipulacao.ma', mock_ma):
         with patch('builtins.open', mock_open()):
-            # Deve conseguir salvar usando o fallback para open
+            # Grava pela troca atômica, sem tocar em ma.lerArquivo
             auth_manipulacao.salvar_db(dados)
             
-            # Verifica que ma.lerArquivo foi chamado (e falhou)
-            mock_ma.lerArquivo.assert_called_once_with("db.json", "w")
+            mock_ma.lerArquivo.assert_not_called()
 
 @pytest.mark.unitario_auth_manipulacao
 def test_ma_import_error():
@@ -0,0 +1,63 @@
+import pytest
+from src.services.autocompletar import TrieProdutos
+from src.services.indice_catalogo import Catalogo
+
+TITULOS = [
+    (1, "Suco de Laranja"),
+    (2, "Suco de Uva"),
+    (3, "Sorvete de Limão"),
+    (4, "Laranja Lima"),
+]
+
+
+@pytest.mark.unitario_autocompletar
+def test_sugere_pelo_inicio_do_titulo():
+    """Testa sugestões pelo começo do título, em ordem alfabética"""
+    trie = TrieProdutos(TITULOS)
+
+    assert trie.sugerir("suc") == [1, 2]
+    assert trie.sugerir("s") == [3, 1, 2]
+    assert trie.sugerir("xyz") == []
+
+
+@pytest.mark.unitario_autocompletar
+def test_sugere_por_palavra_do_meio_sem_acento():
+    """Testa que palavras do meio do título também completam, sem acentos"""
+    trie = TrieProdutos(TITULOS)
+
+    assert trie.sugerir("laranja") == [1, 4]
+    assert trie.sugerir("limao") == [3]
+    assert trie.sugerir("de") == []  # palavra vazia não vira entrada
+
+
+@pytest.mark.unitario_autocompletar
+def test_limite_k():
+    """Testa que no máximo k sugestões são devolvidas"""
+    trie = TrieProdutos((i, f"Produto {i:03d}") for i in range(100))
+
+    assert trie.sugerir("produto", k=3) == [0, 1, 2]
+
+
+@pytest.mark.unitario_autocompletar
+def test_remover_poda_a_trie():
+    """Testa que remover um título tira as sugestões e os nós vazios"""
+    trie = TrieProdutos(TITULOS)
+
+    trie.remover(2)
+    trie.adicionar(1, "Água Mineral")
+
+    assert trie.sugerir("suco") == []
+    assert trie.sugerir("agua") == [1]
+    assert "u" not in trie._raiz.filhos["s"].filhos
+    assert len(trie) == 3
+
+
+@pytest.mark.unitario_autocompletar
+def test_catalogo_sugerir_acompanha_cadastros():
+    """Testa o autocompletar pelo catálogo depois de cadastrar um produto local"""
+    catalogo = Catalogo([{"id": 1, "title": "Suco de Laranja", "price": 5.0}], [])
+    novo = {"id": 21, "title": "Suco Verde", "price": 7.0, "description": ""}
+
+    catalogo.salvar_local(novo)
+
+    assert [p["id"] for p in catalogo.sugerir("suco")] == [1, 21]
@@ -0,0 +1,111 @@
+import pytest
+import json
+from datetime import datetime
+import src.utils.banco_sqlite as banco_sqlite
+import src.utils.repositorios as repositorios
+from src.auth import usuarios
+
+
+@pytest.fixture(autouse=True)
+def repositorio():
+    return repositorios.configurar("sqlite")
+
+
+def _plano(sql, parametros=()):
+    linhas = banco_sqlite.conectar().execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+    return " ".join(l["detail"] for l in linhas)
+
+
+@pytest.mark.unitario_banco_sqlite
+def test_migracao_unica_dos_arquivos(repositorio):
+    """Testa que o banco novo importa o log de produtos, os pedidos e o db.json uma vez só"""
+    with open("produtos_local.txt", "w") as f:
+        f.write("21;Produto A;10.0;Desc A\n22;Produto B;20.0;Desc B\n-;22\n")
+    with open("Pedidos.txt", "w") as f:
+        f.write('2025-08-18 10:00:00;[{"id": 21, "nome": "Produto A", "preco": 10.0}]\n')
+    with open("db.json", "w") as f:
+        json.dump({"usuarios": [{"id": "u1", "username": "ana", "email": "ana@x.com"}], "recuperacoes": {}}, f)
+
+    assert repositorio.listar_produtos() == [
+        {"id": 21, "title": "Produto A", "price": 10.0, "description": "Desc A"}
+    ]
+    assert banco_sqlite.total_pedidos() == 10.0
+    assert repositorio.carregar_usuarios()["usuarios"][0]["username"] == "ana"
+
+    # Reabrir não migra de novo
+    banco_sqlite.fechar()
+    assert banco_sqlite.migrar_arquivos() == {}
+    assert len(banco_sqlite.listar_pedidos()) == 1
+
+
+@pytest.mark.unitario_banco_sqlite
+def test_produtos_sem_tocar_no_arquivo(repositorio):
+    """Testa cadastro, edição e exclusão pelo repositório sem criar produtos_local.txt"""
+    repositorio.inserir_produto({"id": 21, "title": "Produto A", "price": 10.0, "description": "Desc A"})
+    repositorio.inserir_produto({"id": 22, "title": "Produto B", "price": 20.0, "description": "Desc B"})
+    repositorio.atualizar_produto({"id": 21, "title": "Produto A2", "price": 30.0, "description": "Desc A2"})
+    repositorio.excluir_produto(22)
+
+    assert repositorio.listar_produtos() == [
+        {"id": 21, "title": "Produto A2", "price": 30.0, "description": "Desc A2"}
+    ]
+    with pytest.raises(FileNotFoundError):
+        open("produtos_local.txt")
+
+
+@pytest.mark.unitario_banco_sqlite
+def test_consultas_usam_indices():
+    """Testa que faixa de preço, categoria, data e login viram buscas indexadas"""
+    banco_sqlite.salvar_produto(1, "Camisa", 30.0, "", "roupas")
+    banco_sqlite.salvar_produto(2, "Anel", 500.0, "", "joias")
+    banco_sqlite.salvar_produto(3, "Calça", 80.0, "", "roupas")
+
+    assert [p["id"] for p in banco_sqlite.produtos_por_preco(maximo=100)] == [1, 3]
+    assert [p["id"] for p in banco_sqlite.produtos_por_preco(minimo=50, categoria="roupas")] == [3]
+    assert "idx_produtos_preco" in _plano("SELECT * FROM produtos WHERE price < ?", (100,))
+    assert "idx_produtos_categoria" in _plano("SELECT * FROM produtos WHERE category = ?", ("roupas",))
+    assert "idx_pedidos_datahora" in _plano("SELECT * FROM pedidos WHERE datahora >= ?", ("2025",))
+    assert "sqlite_autoindex_usuarios" in _plano("SELECT dados FROM usuarios WHERE email = ?", ("x",))
+
+
+@pytest.mark.unitario_banco_sqlite
+def test_pedidos_gravados_filtrados_e_quitados(repositorio):
+    """Testa o ciclo de pedidos: gravar, somar, filtrar por data e apagar"""
+    repositorio.gravar_pedido([(1, "Produto A", 10.0)], datetime(2025, 8, 18, 10, 0))
+    repositorio.gravar_pedido([(2, "Produto B", 20.0), (3, "Produto C", 5.5)], datetime(2025, 8, 19, 9, 0))
+
+    assert banco_sqlite.total_pedidos() == 35.5
+    assert banco_sqlite.listar_pedidos(inicio="2025-08-19") == [
+        ("2025-08-19 09:00:00", [{"id": 2, "nome": "Produto B", "preco": 20.0},
+                                 {"id": 3, "nome": "Produto C", "preco": 5.5}])
+    ]
+
+    repositorio.apagar_pedidos()
+    assert repositorio.listar_pedidos() == []
+
+
+@pytest.mark.unitario_banco_sqlite
+def test_banco_v3_ganha_vendas_por_dia_a_partir_do_historico(repositorio):
+    """Testa a atualização do esquema 3 para o 4: vendas por dia somadas do histórico existente"""
+    repositorio.gravar_pedido([(1, "Produto A", 10.0)], datetime(2025, 8, 18, 10, 0))
+    conn = banco_sqlite.conectar()
+    with conn:
+        conn.execute("DROP TABLE vendas_dia")
+        conn.execute("DROP TABLE vendas_produto_dia")
+        conn.execute("PRAGMA user_version = 3")
+    banco_sqlite.fechar()
+
+    vendas = banco_sqlite.vendas_por_dia()
+    assert (vendas["2025-08-18"].pedidos, vendas["2025-08-18"].total) == (1, 10.0)
+    assert vendas["2025-08-18"].por_produto == {1: ["Produto A", 1, 10.0]}
+
+
+@pytest.mark.unitario_banco_sqlite
+def test_usuarios_no_sqlite():
+    """Testa criação de usuário e login pelo índice de username/e-mail"""
+    ok, _ = usuarios.criar_usuario("ana", "Ana", "ana@x.com", "segredo", "Cor?", "azul")
+    assert ok
+
+    assert usuarios.buscar_usuario_por_login("ana@x.com")["username"] == "ana"
+    assert usuarios.validar_login("ana", "segredo")[0] is True
+    assert usuarios.buscar_usuario_por_login("ninguem") is None
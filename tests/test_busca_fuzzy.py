@@ -0,0 +1,66 @@
+import pytest
+from src.services.busca_fuzzy import IndiceTrigramas, trigramas
+from src.services.indice_catalogo import Catalogo
+
+TITULOS = {
+    1: "Suco de Laranja",
+    2: "Suco de Uva",
+    3: "Bife Acebolado",
+    4: "Pão de Queijo",
+}
+
+
+def _indice():
+    return IndiceTrigramas(TITULOS.items())
+
+
+@pytest.mark.unitario_busca_fuzzy
+def test_trigramas_sem_acento():
+    """Testa que os trigramas ignoram acentos e caixa"""
+    assert trigramas("Pão") == trigramas("pao")
+    assert "  p" in trigramas("pao")
+
+
+@pytest.mark.unitario_busca_fuzzy
+def test_busca_tolera_erro_de_digitacao():
+    """Testa que erros de digitação ainda encontram o produto certo em primeiro"""
+    assert _indice().buscar("suco larnja")[0][0] == 1
+    assert _indice().buscar("pao de qeijo")[0][0] == 4
+    assert _indice().buscar("suco laranja")[0][0] == 1
+
+
+@pytest.mark.unitario_busca_fuzzy
+def test_similaridade_minima_descarta_ruido():
+    """Testa que consultas sem relação não retornam nada"""
+    assert _indice().buscar("xyzw") == []
+    similaridade = _indice().buscar("Suco de Laranja")[0][1]
+    assert similaridade == pytest.approx(1.0)
+
+
+@pytest.mark.unitario_busca_fuzzy
+def test_poda_igual_a_varredura_completa():
+    """Testa que a poda de candidatos devolve o mesmo que comparar com todos os títulos"""
+    indice = _indice()
+    consulta = "suco de lranja"
+    q = trigramas(consulta)
+
+    esperado = {}
+    for chave, titulo in TITULOS.items():
+        t = trigramas(titulo)
+        similaridade = len(q & t) / len(q | t)
+        if similaridade >= 0.3:
+            esperado[chave] = similaridade
+
+    assert dict(indice.buscar(consulta, limite=10)) == pytest.approx(esperado)
+
+
+@pytest.mark.unitario_busca_fuzzy
+def test_catalogo_buscar_parecidos_com_cadastro():
+    """Testa a busca aproximada pelo catálogo depois de editar um título"""
+    catalogo = Catalogo([], [{"id": 21, "title": "Suco de Laranja", "price": 5.0, "description": ""}])
+    assert catalogo.buscar_parecidos("suco laranja")[0][0]["id"] == 21
+
+    catalogo.salvar_local({"id": 21, "title": "Suco de Abacaxi", "price": 5.0, "description": ""})
+
+    assert catalogo.buscar_parecidos("suco abacaxy")[0][0]["title"] == "Suco de Abacaxi"
+    assert catalogo.buscar_parecidos("laranja") == []
@@ -0,0 +1,98 @@
+import pytest
+from src.services.busca_produtos import IndiceTexto, tokenizar
+from src.services.indice_catalogo import Catalogo
+
+PRODUTOS = [
+    {"id": 1, "title": "Suco de Laranja", "price": 5.0, "description": "Suco natural", "category": "bebida"},
+    {"id": 2, "title": "Bife Acebolado", "price": 20.0, "description": "Bife com arroz e feijão", "category": "prato"},
+    {"id": 3, "title": "Café Expresso", "price": 4.0, "description": "Café forte", "category": "bebida"},
+]
+
+
+def _indice():
+    return IndiceTexto((p["id"], p) for p in PRODUTOS)
+
+
+@pytest.mark.unitario_busca_produtos
+def test_tokenizar_remove_acentos_e_stopwords():
+    """Testa a tokenização com acentos e palavras vazias"""
+    assert tokenizar("Bife com Arroz e Feijão") == ["bife", "arroz", "feijao"]
+
+
+@pytest.mark.unitario_busca_produtos
+def test_busca_ignora_acentos_e_ordena_por_relevancia():
+    """Testa que a busca casa sem acento e traz o título antes da descrição"""
+    indice = _indice()
+
+    assert [c for c, _ in indice.buscar("cafe")] == [3]
+    assert [c for c, _ in indice.buscar("feijão")] == [2]
+    # "bebida" casa na categoria de 1 e 3; "laranja" só no título de 1
+    assert [c for c, _ in indice.buscar("laranja bebida")][0] == 1
+
+
+@pytest.mark.unitario_busca_produtos
+def test_busca_por_prefixo_na_ultima_palavra():
+    """Testa que a última palavra digitada casa por prefixo"""
+    assert [c for c, _ in _indice().buscar("suco lar")] == [1]
+
+
+@pytest.mark.unitario_busca_produtos
+def test_indice_atualiza_incrementalmente():
+    """Testa edição e remoção de produtos no índice"""
+    indice = _indice()
+
+    indice.adicionar(1, {**PRODUTOS[0], "title": "Suco de Uva"})
+    assert indice.buscar("laranja") == []
+    assert [c for c, _ in indice.buscar("uva")] == [1]
+
+    indice.remover(1)
+    assert indice.buscar("suco") == []
+    assert len(indice) == 2
+
+
+@pytest.mark.unitario_busca_produtos
+def test_catalogo_buscar_texto_acompanha_cadastros():
+    """Testa a busca pelo catálogo depois de cadastrar um produto local"""
+    catalogo = Catalogo(PRODUTOS[:2], [PRODUTOS[2]])
+    assert catalogo.buscar_texto("expresso") == [PRODUTOS[2]]
+
+    novo = {"id": 21, "title": "Pão de Queijo", "price": 3.0, "description": "Porção"}
+    catalogo.salvar_local(novo)
+
+    assert catalogo.buscar_texto("pao queijo") == [novo]
+
+
+@pytest.mark.unitario_busca_produtos
+def test_adicionar_pedido_por_busca(mocker):
+    """Testa adicionar ao pedido digitando parte do nome em vez do ID"""
+    from src.pedidos import pedidos
+    mocker.patch('src.pedidos.pedidos.listaPedido', [])
+    mocker.patch('src.services.catalogo.buscar_produtos_api', return_value=PRODUTOS)
+    mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value=[])
+    mocker.patch('builtins.input', side_effect=['laranja', '1'])
+    mocker.patch('src.interface.interface.limpar_tela')
+    mock_tabela = mocker.patch('src.interface.interface.mostrar_tabela_produtos')
+    mocker.patch('src.interface.interface.mensagem_sucesso')
+    mocker.patch('src.interface.interface.pausar')
+
+    pedidos.adicionar_pedido()
+
+    mock_tabela.assert_called_with([PRODUTOS[0]])
+    assert pedidos.listaPedido == [(1, "Suco de Laranja", 5.0)]
+
+
+@pytest.mark.unitario_busca_produtos
+def test_tela_de_busca_do_catalogo(mocker):
+    """Testa a tela de busca do menu do catálogo"""
+    import src.services.catalogo as catalogo
+    mocker.patch('src.services.catalogo.buscar_produtos_api', return_value=PRODUTOS)
+    mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value=[])
+    mocker.patch('builtins.input', return_value='bife')
+    mocker.patch('src.interface.interface.limpar_tela')
+    mocker.patch('src.interface.interface.titulo')
+    mock_tabela = mocker.patch('src.interface.interface.mostrar_tabela_produtos')
+    mocker.patch('src.interface.interface.pausar')
+
+    catalogo.buscar_produtos()
+
+    mock_tabela.assert_called_once_with([PRODUTOS[1]])
@@ -0,0 +1,93 @@
+import pytest
+import os
+import time
+import json
+import src.utils.cache_arquivos as cache_arquivos
+from src.utils import manipulacaoArquivos
+from src.auth import auth_manipulacao
+
+
+def _envelhecer(caminho):
+    """Recua o mtime para fora da janela em que o cache não confia no arquivo."""
+    passado = time.time_ns() - 10 * cache_arquivos.JANELA_INSTAVEL_NS
+    os.utime(caminho, ns=(passado, passado))
+
+
+@pytest.mark.unitario_cache_arquivos
+def test_arquivo_inalterado_nao_e_reinterpretado():
+    """Testa acerto de cache enquanto (mtime, tamanho, inode) não mudam"""
+    with open("dados.txt", "w") as f:
+        f.write("a")
+    _envelhecer("dados.txt")
+    leituras = []
+
+    def interpretar():
+        leituras.append(1)
+        with open("dados.txt") as f:
+            return [f.read()]
+
+    assert cache_arquivos.ler("dados.txt", interpretar) == ["a"]
+    assert cache_arquivos.ler("dados.txt", interpretar) == ["a"]
+
+    assert len(leituras) == 1
+    assert cache_arquivos.estatisticas("dados.txt") == {"acertos": 1, "faltas": 1}
+
+
+@pytest.mark.unitario_cache_arquivos
+def test_troca_do_arquivo_invalida_a_entrada():
+    """Testa que um arquivo substituído (outro inode/tamanho) é lido de novo"""
+    with open("dados.txt", "w") as f:
+        f.write("a")
+    _envelhecer("dados.txt")
+    ler = lambda: cache_arquivos.ler("dados.txt", lambda: open("dados.txt").read())
+    assert ler() == "a"
+
+    with open("novo.txt", "w") as f:
+        f.write("bb")
+    _envelhecer("novo.txt")
+    os.replace("novo.txt", "dados.txt")
+
+    assert ler() == "bb"
+    assert cache_arquivos.estatisticas()["faltas"] == 2
+
+
+@pytest.mark.unitario_cache_arquivos
+def test_arquivo_recem_gravado_nao_entra_no_cache():
+    """Testa que leituras dentro da resolução do mtime não ficam guardadas"""
+    with open("dados.txt", "w") as f:
+        f.write("a")
+
+    cache_arquivos.ler("dados.txt", lambda: "a")
+    cache_arquivos.ler("dados.txt", lambda: "a")
+
+    assert cache_arquivos.estatisticas("dados.txt") == {"acertos": 0, "faltas": 2}
+
+
+@pytest.mark.unitario_cache_arquivos
+def test_produtos_locais_devolvem_copias_do_cache():
+    """Testa lerProdutosLocais com cache: a segunda leitura é acerto e não expõe o valor guardado"""
+    manipulacaoArquivos.gravarProdutoFakeStore(21, "Produto A", 10.0, "Desc A")
+    _envelhecer("produtos_local.txt")
+
+    primeira = manipulacaoArquivos.lerProdutosLocais()
+    primeira[0]["title"] = "alterado"
+    segunda = manipulacaoArquivos.lerProdutosLocais()
+
+    assert segunda[0]["title"] == "Produto A"
+    assert cache_arquivos.estatisticas("produtos_local.txt") == {"acertos": 1, "faltas": 1}
+
+
+@pytest.mark.unitario_cache_arquivos
+def test_carregar_db_usa_cache_e_salvar_invalida():
+    """Testa carregar_db com cache e a invalidação feita por salvar_db"""
+    with open("db.json", "w") as f:
+        json.dump({"usuarios": [{"id": "u1", "roles": ["cliente"]}], "recuperacoes": {}}, f)
+    _envelhecer("db.json")
+
+    db = auth_manipulacao.carregar_db()
+    db["usuarios"][0]["roles"].append("admin")
+    assert auth_manipulacao.carregar_db()["usuarios"][0]["roles"] == ["cliente"]
+
+    auth_manipulacao.salvar_db(db)
+    assert auth_manipulacao.carregar_db()["usuarios"][0]["roles"] == ["cliente", "admin"]
+    assert cache_arquivos.estatisticas("db.json") == {"acertos": 1, "faltas": 2}
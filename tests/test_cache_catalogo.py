@@ -0,0 +1,94 @@
+import pytest
+import json
+from unittest.mock import MagicMock
+import requests
+import src.services.cache_catalogo as cache_catalogo
+
+
+def _resposta(status=200, produtos=None, headers=None):
+    res = MagicMock()
+    res.status_code = status
+    res.json.return_value = produtos if produtos is not None else []
+    res.headers = headers or {}
+    res.raise_for_status.return_value = None
+    return res
+
+
+PRODUTOS = [
+    {"id": 1, "title": "Produto A", "price": 10.0},
+    {"id": 2, "title": "Produto B", "price": 20.0}
+]
+
+
+@pytest.mark.unitario_cache_catalogo
+def test_cache_dentro_do_ttl_nao_chama_api(mocker):
+    """Testa que a segunda leitura dentro do TTL não acessa a rede"""
+    mock_get = mocker.patch('src.services.cache_catalogo.http_cliente.get', return_value=_resposta(produtos=PRODUTOS))
+
+    assert cache_catalogo.obter_produtos() == PRODUTOS
+    assert cache_catalogo.obter_produtos() == PRODUTOS
+
+    mock_get.assert_called_once()
+
+
+@pytest.mark.unitario_cache_catalogo
+def test_cache_expirado_revalida_com_etag(mocker):
+    """Testa a revalidação condicional quando a API responde 304"""
+    mocker.patch.object(cache_catalogo, 'TTL_SEGUNDOS', 0)
+    mock_get = mocker.patch('src.services.cache_catalogo.http_cliente.get', side_effect=[
+        _resposta(produtos=PRODUTOS, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Sep 2025 10:00:00 GMT"}),
+        _resposta(status=304),
+    ])
+
+    cache_catalogo.obter_produtos()
+    resultado = cache_catalogo.obter_produtos()
+
+    assert resultado == PRODUTOS
+    _, kwargs = mock_get.call_args
+    assert kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert kwargs["headers"]["If-Modified-Since"] == "Mon, 01 Sep 2025 10:00:00 GMT"
+
+
+@pytest.mark.unitario_cache_catalogo
+def test_snapshot_sobrevive_reinicio(mocker):
+    """Testa que o snapshot em disco é usado após limpar a memória"""
+    mocker.patch('src.services.cache_catalogo.http_cliente.get', return_value=_resposta(produtos=PRODUTOS))
+    cache_catalogo.obter_produtos()
+
+    with open(cache_catalogo.SNAPSHOT_PATH, encoding="utf-8") as f:
+        assert json.load(f)["produtos"] == PRODUTOS
+
+    cache_catalogo.limpar_cache()
+    mock_get = mocker.patch('src.services.cache_catalogo.http_cliente.get')
+
+    assert cache_catalogo.obter_produtos() == PRODUTOS
+    mock_get.assert_not_called()
+
+
+@pytest.mark.unitario_cache_catalogo
+def test_falha_na_api_devolve_ultima_copia(mocker):
+    """Testa que, com a API fora do ar, o catálogo expirado continua disponível"""
+    mocker.patch.object(cache_catalogo, 'TTL_SEGUNDOS', 0)
+    mocker.patch('src.services.cache_catalogo.http_cliente.get', side_effect=[
+        _resposta(produtos=PRODUTOS),
+        requests.ConnectionError("fora do ar"),
+    ])
+
+    cache_catalogo.obter_produtos()
+
+    assert cache_catalogo.obter_produtos() == PRODUTOS
+
+
+@pytest.mark.unitario_cache_catalogo
+def test_disjuntor_aberto_serve_catalogo_antigo(mocker):
+    """Testa que com o disjuntor aberto o catálogo antigo é servido sem esperar a rede"""
+    import src.services.http_cliente as http_cliente
+    mocker.patch.object(cache_catalogo, 'TTL_SEGUNDOS', 0)
+    mocker.patch('src.services.cache_catalogo.http_cliente.get', side_effect=[
+        _resposta(produtos=PRODUTOS),
+        http_cliente.CircuitoAberto("aberto"),
+    ])
+
+    cache_catalogo.obter_produtos()
+
+    assert cache_catalogo.obter_produtos() == PRODUTOS
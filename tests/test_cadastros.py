@@ -34,6 +34,7 @@ def test_excluir_item(mocker):
     {"id": 2, "title": "Produto B para Manter", "price": 20.0, "description": "Desc B"}
     ]
     mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value = lista_falsa)
+    mocker.patch('src.services.catalogo.buscar_produtos_api', return_value = [])
     mocker.patch('builtins.input', side_effect = ['1', 'S'])
     mock_open = mocker.patch('builtins.open', mocker.mock_open())
 
@@ -45,10 +46,11 @@ def test_excluir_item(mocker):
 
     cadastros.excluir_item()
 
-    mock_open.assert_called_once_with("produtos_local.txt", "w")
+    # Só um marcador de exclusão no fim do log, sem reescrever o arquivo
+    mock_open.assert_called_once_with("produtos_local.txt", "a")
 
     handle = mock_open()
-    handle.write.assert_called_once_with('2;Produto B para Manter;20.0;Desc B\n')
+    handle.write.assert_called_once_with('-;1\n')
 
     print("\n✅ Teste exclusao passou com sucesso!")
 
@@ -62,6 +64,7 @@ def test_editar_item(mocker):
     {"id": 2, "title": "Produto B para Manter", "price": 20.0, "description": "Desc B"}
     ]
     mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value = lista_falsa)
+    mocker.patch('src.services.catalogo.buscar_produtos_api', return_value = [])
     mocker.patch('builtins.input', side_effect = ['1', 'TESTE', '0.0', 'TESTE'])
     mock_open = mocker.patch('builtins.open', mocker.mock_open())
 
@@ -73,15 +76,10 @@ def test_editar_item(mocker):
 
     cadastros.editar_item()
 
-    mock_open.assert_called_once_with("produtos_local.txt", "w")
+    # A edição é um registro novo no fim do log, sem reescrever o arquivo
+    mock_open.assert_called_once_with("produtos_local.txt", "a")
 
     handle = mock_open()
-
-    chamadas_esperadas = [
-        call('1;TESTE;0.0;TESTE\n'),
-        call('2;Produto B para Manter;20.0;Desc B\n')
-    ]
-    
-    handle.write.assert_has_calls(chamadas_esperadas)
+    handle.write.assert_called_once_with('1;TESTE;0.0;TESTE\n')
 
     print("\n✅ Teste editar passou com sucesso!")
\ No newline at end of file
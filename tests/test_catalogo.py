@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, call, ANY
 import requests
 import src.services.catalogo as catalogo
 
@@ -15,7 +15,7 @@ def test_buscar_produtos_api_sucesso(mocker):
     mock_response.json.return_value = mock_produtos
     mock_response.raise_for_status.return_value = None
     
-    with patch('src.services.catalogo.requests.get', return_value=mock_response):
+    with patch('src.services.cache_catalogo.http_cliente.get', return_value=mock_response):
         resultado = catalogo.buscar_produtos_api()
         
         assert resultado == mock_produtos
@@ -24,7 +24,7 @@ def test_buscar_produtos_api_sucesso(mocker):
 @pytest.mark.unitario_catalogo
 def test_buscar_produtos_api_falha(mocker):
     """Testa a busca de produtos quando a API falha"""
-    with patch('src.services.catalogo.requests.get', side_effect=requests.RequestException("Erro de conexão")):
+    with patch('src.services.cache_catalogo.http_cliente.get', side_effect=requests.RequestException("Erro de conexão")):
         resultado = catalogo.buscar_produtos_api()
         
         assert resultado == []  # Deve retornar lista vazia em caso de erro
@@ -35,7 +35,7 @@ def test_buscar_produtos_api_erro_http(mocker):
     mock_response = MagicMock()
     mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
     
-    with patch('src.services.catalogo.requests.get', return_value=mock_response):
+    with patch('src.services.cache_catalogo.http_cliente.get', return_value=mock_response):
         resultado = catalogo.buscar_produtos_api()
         
         assert resultado == []  # Deve retornar lista vazia em caso de erro HTTP
@@ -64,13 +64,13 @@ def test_exibir_catalogo_sucesso_com_promocao(mocker):
     with patch('builtins.input', return_value='S'):
         catalogo.exibir_catalogo()
         
-        # Verifica se mostrou apenas produtos com preço < 60
+        # Verifica se mostrou apenas produtos com preço < 60, do mais barato ao mais caro
         from src.interface.interface import mostrar_tabela_produtos
         expected_produtos = [
-            {"id": 1, "title": "Produto A", "price": 50.0},
-            {"id": 3, "title": "Produto Local", "price": 25.0}
+            {"id": 3, "title": "Produto Local", "price": 25.0},
+            {"id": 1, "title": "Produto A", "price": 50.0}
         ]
-        mostrar_tabela_produtos.assert_called_once_with(expected_produtos)
+        mostrar_tabela_produtos.assert_called_once_with(expected_produtos, versao=ANY)
 
 @pytest.mark.unitario_catalogo
 def test_exibir_catalogo_sucesso_sem_promocao(mocker):
@@ -99,7 +99,7 @@ def test_exibir_catalogo_sucesso_sem_promocao(mocker):
         # Verifica se mostrou todos os produtos
         from src.interface.interface import mostrar_tabela_produtos
         expected_produtos = produtos_api + produtos_locais
-        mostrar_tabela_produtos.assert_called_once_with(expected_produtos)
+        mostrar_tabela_produtos.assert_called_once_with(expected_produtos, versao=ANY)
 
 @pytest.mark.unitario_catalogo
 def test_exibir_catalogo_api_falha(mocker):
@@ -126,7 +126,7 @@ def test_exibir_catalogo_api_falha(mocker):
         
         # Verifica que mostrou os produtos locais
         from src.interface.interface import mostrar_tabela_produtos
-        mostrar_tabela_produtos.assert_called_once_with(produtos_locais)
+        mostrar_tabela_produtos.assert_called_once_with(produtos_locais, versao=ANY)
 
 @pytest.mark.unitario_catalogo
 def test_exibir_catalogo_sem_produtos(mocker):
@@ -168,7 +168,7 @@ def test_exibir_catalogo_input_invalido(mocker):
         
         # Verifica que mostrou todos os produtos (comportamento default)
         from src.interface.interface import mostrar_tabela_produtos
-        mostrar_tabela_produtos.assert_called_once_with(produtos_api)
+        mostrar_tabela_produtos.assert_called_once_with(produtos_api, versao=ANY)
 
 @pytest.mark.integracao_catalogo
 def test_exibir_catalogo_integracao(mocker):
@@ -195,4 +195,30 @@ def test_exibir_catalogo_integracao(mocker):
         
         # Verificações
         from src.interface.interface import mostrar_tabela_produtos
-        mostrar_tabela_produtos.assert_called_once()
\ No newline at end of file
+        mostrar_tabela_produtos.assert_called_once()
+
+
+@pytest.mark.unitario_catalogo
+def test_exibir_catalogo_filtrando_por_categoria(mocker):
+    """Testa o filtro por categoria vindo das facetas"""
+    produtos_api = [
+        {"id": 1, "title": "Camisa", "price": 30.0, "category": "roupas"},
+        {"id": 2, "title": "Anel", "price": 500.0, "category": "joias"},
+        {"id": 3, "title": "Calça", "price": 80.0, "category": "roupas"}
+    ]
+
+    mocker.patch('src.services.catalogo.buscar_produtos_api', return_value=produtos_api)
+    mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value=[])
+    mocker.patch('src.interface.interface.limpar_tela')
+    mocker.patch('src.interface.interface.titulo')
+    mock_facetas = mocker.patch('src.interface.interface.mostrar_tabela_facetas')
+    mock_tabela = mocker.patch('src.interface.interface.mostrar_tabela_produtos')
+    mocker.patch('src.interface.interface.pausar')
+
+    # Sem promoção; categoria 2 = "roupas" (joias vem antes em ordem alfabética)
+    with patch('builtins.input', side_effect=['N', '2']):
+        catalogo.exibir_catalogo()
+
+    facetas = mock_facetas.call_args[0][0]
+    assert [(f.categoria, f.quantidade) for f in facetas] == [("joias", 1), ("roupas", 2)]
+    mock_tabela.assert_called_once_with([produtos_api[0], produtos_api[2]], versao=ANY)
@@ -0,0 +1,65 @@
+import pytest
+import src.services.catalogo_colunar as catalogo_colunar
+from src.models.produto import Produto
+from src.services.indice_catalogo import Catalogo
+
+PRODUTOS = [
+    {"id": 1, "title": "Camisa", "price": 30.0, "category": "roupas"},
+    {"id": 2, "title": "Calça", "price": 80.0, "category": "roupas"},
+    {"id": 3, "title": "Anel", "price": 500.0, "category": "joias"},
+]
+LOCAIS = [Produto(21, "Caneca", 15.0, "Desc")]
+
+
+@pytest.fixture(params=["array", "numpy"])
+def backend(request, monkeypatch):
+    """Roda cada teste nas duas implementações (a de NumPy só se ele estiver instalado)."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(catalogo_colunar, "np", None)
+    return request.param
+
+
+@pytest.mark.unitario_catalogo_colunar
+def test_colunas_e_tabela_de_strings(backend):
+    """Testa que ids, preços e categorias viram colunas tipadas na ordem do catálogo"""
+    colunas = Catalogo(PRODUTOS, LOCAIS).colunar()
+
+    assert list(colunas.ids) == [1, 2, 3, 21]
+    assert list(colunas.precos) == [30.0, 80.0, 500.0, 15.0]
+    assert colunas.categorias == ["roupas", "joias", "sem categoria"]
+    assert list(colunas.codigos) == [0, 0, 1, 2]
+    assert colunas.titulos[3] == "Caneca"
+
+
+@pytest.mark.unitario_catalogo_colunar
+def test_filtros_e_agregados(backend):
+    """Testa máscaras de faixa de preço e categoria e os agregados sobre elas"""
+    colunas = Catalogo(PRODUTOS, LOCAIS).colunar()
+
+    baratos = colunas.selecionar(maximo=60)
+    assert colunas.contar(baratos) == 2
+    assert colunas.preco_medio(baratos) == 22.5
+    assert [p.id for p in colunas.produtos(baratos)] == [1, 21]
+
+    roupas_caras = colunas.selecionar(minimo=50, categoria="roupas")
+    assert [p.id for p in colunas.produtos(roupas_caras)] == [2]
+    assert colunas.contar(colunas.selecionar(categoria="eletronicos")) == 0
+    assert colunas.somar_precos() == 625.0
+
+    assert colunas.contagem_por_categoria() == {"roupas": 2, "joias": 1, "sem categoria": 1}
+    assert colunas.preco_medio_por_categoria() == {"roupas": 55.0, "joias": 500.0, "sem categoria": 15.0}
+
+
+@pytest.mark.unitario_catalogo_colunar
+def test_colunas_refeitas_apos_edicao(backend):
+    """Testa que cadastros locais descartam a visão em colunas da versão anterior"""
+    catalogo = Catalogo(PRODUTOS, LOCAIS)
+    antes = catalogo.colunar()
+    assert catalogo.colunar() is antes
+
+    catalogo.salvar_local(Produto(22, "Prato", 25.0, "Desc"))
+
+    assert catalogo.colunar() is not antes
+    assert catalogo.colunar().contar(catalogo.colunar().selecionar(maximo=60)) == 3
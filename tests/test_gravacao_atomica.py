@@ -0,0 +1,73 @@
+import pytest
+import os
+import json
+import threading
+import src.utils.gravacao_atomica as gravacao_atomica
+from src.auth import auth_manipulacao
+from src.utils import manipulacaoArquivos
+
+
+@pytest.mark.unitario_gravacao_atomica
+def test_falha_na_troca_preserva_o_original(mocker):
+    """Testa que um erro antes do os.replace deixa o arquivo antigo intacto e sem temporário"""
+    with open("dados.txt", "w") as f:
+        f.write("antigo")
+    mocker.patch("src.utils.gravacao_atomica.os.replace", side_effect=OSError("queda"))
+
+    with pytest.raises(OSError):
+        gravacao_atomica.gravar_atomico("dados.txt", "novo")
+
+    with open("dados.txt") as f:
+        assert f.read() == "antigo"
+    assert os.listdir(".") == ["dados.txt"]
+
+
+@pytest.mark.unitario_gravacao_atomica
+def test_escritas_concorrentes_viram_poucos_commits(monkeypatch):
+    """Testa o group commit: 20 pedidos simultâneos, todos gravados, em bem menos de 20 commits"""
+    monkeypatch.setattr(gravacao_atomica._gravador, "janela", 0.05)
+    antes = gravacao_atomica.estatisticas()["commits"]
+    largada = threading.Barrier(20)
+
+    def fechar_pedido(i):
+        largada.wait()
+        manipulacaoArquivos.gravarPedidos([(i, f"Produto {i}", 1.0)], f"2025-08-18 10:00:{i:02d}")
+
+    threads = [threading.Thread(target=fechar_pedido, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(p[1][0]["id"] for p in manipulacaoArquivos.lerPedidos()) == list(range(20))
+    assert gravacao_atomica.estatisticas()["commits"] - antes < 10
+
+
+@pytest.mark.unitario_gravacao_atomica
+def test_substituir_e_anexar_no_mesmo_lote_respeitam_a_ordem(monkeypatch):
+    """Testa que, num mesmo lote, o que vem depois de uma substituição é somado a ela"""
+    monkeypatch.setattr(gravacao_atomica._gravador, "janela", 0.05)
+    primeiro = gravacao_atomica.enfileirar_anexo("log.txt", "a\n")
+    gravacao_atomica._gravador.enfileirar("log.txt", "b\n", substitui=True)
+    ultimo = gravacao_atomica.enfileirar_anexo("log.txt", "c\n")
+    primeiro.esperar()
+    ultimo.esperar()
+
+    with open("log.txt") as f:
+        assert f.read() == "b\nc\n"
+
+
+@pytest.mark.unitario_gravacao_atomica
+def test_salvar_db_e_apagar_pedidos_trocam_o_arquivo():
+    """Testa que db.json e Pedidos.txt são regravados por troca, não no lugar"""
+    auth_manipulacao.salvar_db({"usuarios": [{"id": "u1", "nome": "Ana"}]})
+    inode = os.stat("db.json").st_ino
+    auth_manipulacao.salvar_db({"usuarios": [{"id": "u1", "nome": "Ana Maria"}]})
+
+    assert os.stat("db.json").st_ino != inode
+    with open("db.json", encoding="utf-8") as f:
+        assert json.load(f)["usuarios"][0]["nome"] == "Ana Maria"
+
+    manipulacaoArquivos.gravarPedidos([(1, "Produto A", 10.0)], "2025-08-18 10:00:00")
+    manipulacaoArquivos.apagarPedidos()
+    assert os.path.getsize("Pedidos.txt") == 0
@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import MagicMock
+import requests
+import src.services.http_cliente as http_cliente
+
+URL = "https://fakestoreapi.com/products"
+
+
+def _sessao_falsa(mocker, **kwargs):
+    sessao = MagicMock()
+    sessao.get.configure_mock(**kwargs)
+    mocker.patch('src.services.http_cliente.obter_sessao', return_value=sessao)
+    return sessao
+
+
+@pytest.mark.unitario_http_cliente
+def test_get_usa_timeout_padrao(mocker):
+    """Testa que toda chamada sai com timeout de conexão e leitura"""
+    sessao = _sessao_falsa(mocker, return_value=MagicMock(status_code=200))
+
+    http_cliente.get(URL)
+
+    sessao.get.assert_called_once_with(
+        URL, headers=None, timeout=(http_cliente.TIMEOUT_CONEXAO, http_cliente.TIMEOUT_LEITURA)
+    )
+
+
+@pytest.mark.unitario_http_cliente
+def test_sessao_compartilhada_com_pool_e_retentativas():
+    """Testa que a sessão é única e monta o adaptador com retentativas"""
+    sessao = http_cliente.obter_sessao()
+
+    assert http_cliente.obter_sessao() is sessao
+    adaptador = sessao.get_adapter(URL)
+    assert adaptador.max_retries.total == http_cliente.MAX_RETENTATIVAS
+    assert adaptador.max_retries.backoff_factor == http_cliente.BACKOFF_SEGUNDOS
+
+
+@pytest.mark.unitario_http_cliente
+def test_disjuntor_abre_e_falha_rapido(mocker):
+    """Testa que após LIMITE_FALHAS erros a chamada nem chega na rede"""
+    sessao = _sessao_falsa(mocker, side_effect=requests.ConnectionError("timeout"))
+
+    for _ in range(http_cliente.LIMITE_FALHAS):
+        with pytest.raises(requests.ConnectionError):
+            http_cliente.get(URL)
+
+    with pytest.raises(http_cliente.CircuitoAberto):
+        http_cliente.get(URL)
+
+    assert sessao.get.call_count == http_cliente.LIMITE_FALHAS
+    assert http_cliente.disjuntor_para(URL).estado == "aberto"
+
+
+@pytest.mark.unitario_http_cliente
+def test_disjuntor_meio_aberto_fecha_com_sucesso(mocker):
+    """Testa que, passado o tempo de espera, uma chamada bem-sucedida fecha o disjuntor"""
+    relogio = mocker.patch('src.services.http_cliente.time.monotonic', return_value=100.0)
+    disjuntor = http_cliente.disjuntor_para(URL)
+    for _ in range(http_cliente.LIMITE_FALHAS):
+        disjuntor.registrar_falha()
+    assert disjuntor.estado == "aberto"
+
+    relogio.return_value = 100.0 + http_cliente.TEMPO_ABERTO_SEGUNDOS
+    assert disjuntor.estado == "meio-aberto"
+
+    _sessao_falsa(mocker, return_value=MagicMock(status_code=200))
+    http_cliente.get(URL)
+
+    assert disjuntor.estado == "fechado"
+
+
+@pytest.mark.unitario_http_cliente
+def test_erro_5xx_conta_como_falha(mocker):
+    """Testa que respostas 5xx contam para abrir o disjuntor"""
+    _sessao_falsa(mocker, return_value=MagicMock(status_code=503))
+
+    for _ in range(http_cliente.LIMITE_FALHAS):
+        http_cliente.get(URL)
+
+    assert http_cliente.disjuntor_para(URL).estado == "aberto"
+
+
+@pytest.mark.unitario_http_cliente
+def test_chamada_de_teste_com_erro_inesperado_nao_trava_o_disjuntor(mocker):
+    """Testa que um erro fora de requests na chamada de teste reabre o disjuntor em vez de travá-lo"""
+    relogio = mocker.patch('src.services.http_cliente.time.monotonic', return_value=100.0)
+    disjuntor = http_cliente.disjuntor_para(URL)
+    for _ in range(http_cliente.LIMITE_FALHAS):
+        disjuntor.registrar_falha()
+
+    relogio.return_value = 100.0 + http_cliente.TEMPO_ABERTO_SEGUNDOS
+    _sessao_falsa(mocker, side_effect=ValueError("resposta ilegível"))
+    with pytest.raises(ValueError):
+        http_cliente.get(URL)
+    assert disjuntor.estado == "aberto"
+
+    relogio.return_value = 100.0 + 2 * http_cliente.TEMPO_ABERTO_SEGUNDOS
+    _sessao_falsa(mocker, return_value=MagicMock(status_code=200))
+    http_cliente.get(URL)
+    assert disjuntor.estado == "fechado"
@@ -0,0 +1,103 @@
+import pytest
+import json
+import src.utils.repositorios as repositorios
+from src.services import importacao_produtos
+from src.utils import manipulacaoArquivos
+
+
+@pytest.fixture(params=["memoria", "arquivo", "sqlite"])
+def repositorio(request):
+    return repositorios.configurar(request.param)
+
+
+@pytest.mark.unitario_importacao_produtos
+def test_importa_csv_e_relata_erros_por_linha(repositorio):
+    """Testa CSV com ';', colunas em português e linhas inválidas que não param a importação"""
+    with open("produtos.csv", "w", encoding="utf-8") as f:
+        f.write("nome;preco;descricao\n"
+                "Camisa;29,90;Algodão\n"
+                ";10;Sem nome\n"
+                "Calça;abc;Preço ruim\n"
+                "Boné;15;Aba reta\n")
+
+    relatorio = importacao_produtos.importar("produtos.csv")
+
+    assert (relatorio.lidos, relatorio.importados, relatorio.lotes) == (4, 2, 1)
+    assert relatorio.erros == [(3, "título obrigatório"), (4, "preço inválido: 'abc'")]
+    assert [(p["id"], p["title"], p["price"]) for p in repositorio.listar_produtos()] == [
+        (21, "Camisa", 29.9), (22, "Boné", 15.0)
+    ]
+
+
+@pytest.mark.unitario_importacao_produtos
+def test_importa_jsonl_em_lotes_com_bloco_de_ids(repositorio, mocker):
+    """Testa JSONL em lotes: um bloco de IDs e uma gravação por lote"""
+    linhas = [json.dumps({"title": f"Produto {i}", "price": i}) for i in range(5)]
+    linhas.insert(2, "{quebrado")
+    with open("produtos.jsonl", "w") as f:
+        f.write("\n".join(linhas) + "\n")
+    reservar = mocker.spy(repositorio, "reservar_ids_produto")
+    inserir = mocker.spy(repositorio, "inserir_produtos")
+
+    relatorio = importacao_produtos.importar("produtos.jsonl", tamanho_lote=2)
+
+    assert relatorio.importados == 5 and relatorio.lotes == 3
+    assert [n for n, _ in relatorio.erros] == [3]
+    assert [c.args[0] for c in reservar.call_args_list] == [2, 1, 2]
+    assert inserir.call_count == 3
+    assert sorted(p["id"] for p in repositorio.listar_produtos()) == list(range(21, 26))
+
+
+@pytest.mark.unitario_importacao_produtos
+def test_categoria_importada_volta_na_leitura(repositorio):
+    """Testa que a coluna de categoria é gravada e lida de volta em todos os backends"""
+    with open("produtos.csv", "w") as f:
+        f.write("title,price,category\nCamisa,10,roupas\nCaneca,5,\n")
+
+    importacao_produtos.importar("produtos.csv")
+    repositorio.inserir_produto({"id": 500, "title": "Boné", "price": 3.0, "description": "", "category": "roupas"})
+
+    assert [(p.title, p.category) for p in repositorio.listar_produtos()] == \
+        [("Camisa", "roupas"), ("Caneca", None), ("Boné", "roupas")]
+
+
+@pytest.mark.unitario_importacao_produtos
+def test_rejeita_separador_do_log():
+    """Testa que ';' ou quebra de linha no texto vira erro em vez de corromper o arquivo"""
+    assert importacao_produtos.validar({"title": "A;B", "price": "1"})[1] == \
+        "título não pode conter ';' nem quebra de linha"
+    assert importacao_produtos.validar({"title": "A", "price": "-1"})[1] == "preço inválido: '-1'"
+    assert importacao_produtos.validar({"Title": " A ", "Price": 2})[0] == ("A", 2.0, "", None)
+
+
+@pytest.mark.unitario_importacao_produtos
+def test_lote_no_arquivo_e_atomico(mocker):
+    """Testa que uma falha ao gravar o lote deixa produtos_local.txt como estava"""
+    repositorio = repositorios.configurar("arquivo")
+    manipulacaoArquivos.gravarProdutoFakeStore(21, "Antigo", 1.0, "Desc")
+    with open("produtos.csv", "w") as f:
+        f.write("title,price\nNovo A,1\nNovo B,2\n")
+    mocker.patch.object(repositorio, "reservar_ids_produto", return_value=22)
+    mocker.patch("src.utils.manipulacaoArquivos.os.replace", side_effect=OSError("disco cheio"))
+
+    with pytest.raises(OSError):
+        importacao_produtos.importar("produtos.csv", repositorio=repositorio)
+
+    with open("produtos_local.txt") as f:
+        assert f.read() == "21;Antigo;1.0;Desc\n"
+
+
+@pytest.mark.unitario_importacao_produtos
+def test_comando_importa_muitos_produtos(capsys):
+    """Testa o comando de linha de comando com 20 mil linhas no backend de arquivo"""
+    repositorios.configurar("arquivo")
+    with open("produtos.csv", "w") as f:
+        f.write("title,price,description\n")
+        f.writelines(f"SKU {i},{i % 100}.5,Item {i}\n" for i in range(20_000))
+
+    assert importacao_produtos.main(["produtos.csv", "--lote", "5000"]) == 0
+
+    with manipulacaoArquivos.abrirProdutosLocais() as produtos:
+        assert len(produtos) == 20_000
+        assert produtos[-1]["title"] == "SKU 19999"
+    assert "20000 de 20000 produtos importados em 4 lote(s)" in capsys.readouterr().out
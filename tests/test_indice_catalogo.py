@@ -0,0 +1,123 @@
+import pytest
+from src.models.produto import Produto
+from src.services.indice_catalogo import Catalogo
+
+# Produto já pronto: o catálogo guarda a própria instância, sem copiar
+PRODUTOS_API = [
+    Produto(1, "Produto API A", 10.0),
+    Produto(2, "Produto API B", 20.0)
+]
+PRODUTOS_LOCAIS = [
+    Produto(21, "Produto Local", 15.0, "Desc"),
+    Produto(22, "Outro Local", 5.0, "Desc")
+]
+
+
+@pytest.mark.unitario_indice_catalogo
+def test_buscar_por_id():
+    """Testa a busca por id na API e nos produtos locais"""
+    catalogo = Catalogo(PRODUTOS_API, PRODUTOS_LOCAIS)
+
+    assert catalogo.buscar(2) is PRODUTOS_API[1]
+    assert catalogo.buscar(21) is PRODUTOS_LOCAIS[0]
+    assert catalogo.buscar(99) is None
+    assert catalogo.buscar_local(1) is None
+    assert len(catalogo) == 4
+    assert catalogo.todos == PRODUTOS_API + PRODUTOS_LOCAIS
+
+
+@pytest.mark.unitario_indice_catalogo
+def test_id_repetido_prioriza_api():
+    """Testa que, com id repetido, vale o produto da API (mesma regra da busca linear antiga)"""
+    local_repetido = Produto(1, "Local com id da API", 1.0, "")
+    catalogo = Catalogo(PRODUTOS_API, [local_repetido])
+
+    assert catalogo.buscar(1) is PRODUTOS_API[0]
+    assert catalogo.buscar_local(1) is local_repetido
+
+
+@pytest.mark.unitario_indice_catalogo
+def test_salvar_local_atualiza_indice_e_versao():
+    """Testa que editar um produto mantém a posição e troca a versão"""
+    catalogo = Catalogo(PRODUTOS_API, PRODUTOS_LOCAIS)
+    versao = catalogo.versao
+    editado = {**PRODUTOS_LOCAIS[0], "title": "Editado"}
+
+    catalogo.salvar_local(editado)
+
+    assert catalogo.buscar(21)["title"] == "Editado"
+    assert catalogo.produtos_locais == [editado, PRODUTOS_LOCAIS[1]]
+    assert catalogo.versao > versao
+
+
+@pytest.mark.unitario_indice_catalogo
+def test_remover_local():
+    """Testa a remoção de produto local do índice"""
+    catalogo = Catalogo(PRODUTOS_API, PRODUTOS_LOCAIS)
+
+    assert catalogo.remover_local(21) is PRODUTOS_LOCAIS[0]
+    assert catalogo.remover_local(21) is None
+    assert 21 not in catalogo
+    assert catalogo.todos == PRODUTOS_API + [PRODUTOS_LOCAIS[1]]
+
+
+@pytest.mark.unitario_indice_catalogo
+def test_faixa_preco_por_bissecao():
+    """Testa consultas por faixa de preço (mínimo inclusivo, máximo exclusivo)"""
+    catalogo = Catalogo(PRODUTOS_API, PRODUTOS_LOCAIS)
+
+    assert [p["id"] for p in catalogo.faixa_preco(maximo=15)] == [22, 1]
+    assert [p["id"] for p in catalogo.faixa_preco(minimo=10, maximo=20)] == [1, 21]
+    assert [p["id"] for p in catalogo.faixa_preco(minimo=100)] == []
+    assert [p["id"] for p in catalogo.mais_baratos(2)] == [22, 1]
+    assert [p["id"] for p in catalogo.mais_caros(2)] == [2, 21]
+    assert [p["id"] for p in catalogo.mais_caros(10)] == [2, 21, 1, 22]
+
+
+@pytest.mark.unitario_indice_catalogo
+def test_indice_de_precos_acompanha_edicoes():
+    """Testa que cadastro, edição e exclusão mantêm o índice de preços"""
+    catalogo = Catalogo(PRODUTOS_API, PRODUTOS_LOCAIS)
+    catalogo.faixa_preco()  # força a montagem do índice
+
+    catalogo.salvar_local({**PRODUTOS_LOCAIS[1], "price": 99.0})
+    catalogo.salvar_local({"id": 23, "title": "Novo", "price": 1.0, "description": ""})
+    catalogo.remover_local(21)
+
+    assert [(p["id"], p["price"]) for p in catalogo.faixa_preco()] == [
+        (23, 1.0), (1, 10.0), (2, 20.0), (22, 99.0)
+    ]
+
+
+@pytest.mark.unitario_indice_catalogo
+def test_facetas_com_contagem_e_faixa_de_preco():
+    """Testa contagem e preço mínimo/máximo por categoria"""
+    api = [
+        {"id": 1, "title": "Camisa", "price": 30.0, "category": "roupas"},
+        {"id": 2, "title": "Calça", "price": 80.0, "category": "roupas"},
+        {"id": 3, "title": "Anel", "price": 500.0, "category": "joias"},
+    ]
+    catalogo = Catalogo(api, PRODUTOS_LOCAIS)
+
+    resumo = [(f.categoria, f.quantidade, f.preco_min, f.preco_max) for f in catalogo.facetas()]
+
+    assert resumo == [
+        ("joias", 1, 500.0, 500.0),
+        ("roupas", 2, 30.0, 80.0),
+        ("sem categoria", 2, 5.0, 15.0),
+    ]
+    assert [p["id"] for p in catalogo.faixa_preco(maximo=50, categoria="roupas")] == [1]
+    assert catalogo.faixa_preco(categoria="inexistente") == []
+
+
+@pytest.mark.unitario_indice_catalogo
+def test_facetas_acompanham_edicoes():
+    """Testa que editar a categoria/preço e excluir atualizam as facetas"""
+    catalogo = Catalogo([], PRODUTOS_LOCAIS)
+    catalogo.facetas()
+
+    catalogo.salvar_local({**PRODUTOS_LOCAIS[0], "category": "bebida", "price": 7.0})
+    catalogo.remover_local(22)
+
+    resumo = [(f.categoria, f.quantidade, f.preco_min) for f in catalogo.facetas()]
+    assert resumo == [("bebida", 1, 7.0)]
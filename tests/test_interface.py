@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+import src.interface.interface as interface
+
+
+def _produtos(n):
+    return [{"id": i, "title": f"Produto {i}", "price": float(i)} for i in range(1, n + 1)]
+
+
+def _ids_impressos(mock_tabela):
+    return [[p["id"] for p in chamada.args[0]] for chamada in mock_tabela.call_args_list]
+
+
+@pytest.fixture(autouse=True)
+def limpar_paginas():
+    interface._paginas_renderizadas.clear()
+    yield
+    interface._paginas_renderizadas.clear()
+
+
+@pytest.mark.unitario_interface
+def test_tabela_de_uma_pagina_nao_pede_navegacao(mocker):
+    """Testa que listas pequenas saem direto, sem prompt de página"""
+    mocker.patch.object(interface.console, 'print')
+    mock_tabela = mocker.patch('src.interface.interface._tabela_produtos', wraps=interface._tabela_produtos)
+
+    with patch('builtins.input') as mock_input:
+        interface.mostrar_tabela_produtos(_produtos(3), tamanho_pagina=5)
+
+    mock_input.assert_not_called()
+    assert _ids_impressos(mock_tabela) == [[1, 2, 3]]
+
+
+@pytest.mark.unitario_interface
+def test_navegacao_proxima_anterior_e_salto(mocker):
+    """Testa próxima, anterior e ir direto para uma página (limitada à última)"""
+    mocker.patch.object(interface.console, 'print')
+    mock_tabela = mocker.patch('src.interface.interface._tabela_produtos', wraps=interface._tabela_produtos)
+
+    with patch('builtins.input', side_effect=['P', 'A', '9', '']):
+        interface.mostrar_tabela_produtos(_produtos(7), tamanho_pagina=3)
+
+    assert _ids_impressos(mock_tabela) == [[1, 2, 3], [4, 5, 6], [1, 2, 3], [7]]
+
+
+@pytest.mark.unitario_interface
+def test_iterador_consumido_sob_demanda(mocker):
+    """Testa que de um iterador só são lidos os itens da página (mais um para saber se há próxima)"""
+    mocker.patch.object(interface.console, 'print')
+    lidos = []
+
+    def gerar():
+        for p in _produtos(100):
+            lidos.append(p["id"])
+            yield p
+
+    with patch('builtins.input', side_effect=['']):
+        interface.mostrar_tabela_produtos(gerar(), tamanho_pagina=10)
+
+    assert len(lidos) == 11
+
+
+@pytest.mark.unitario_interface
+def test_paginas_renderizadas_sao_reaproveitadas_por_versao(mocker):
+    """Testa o cache de páginas: mesma versão não formata de novo, versão nova formata"""
+    mocker.patch.object(interface.console, 'print')
+    mock_tabela = mocker.patch('src.interface.interface._tabela_produtos', wraps=interface._tabela_produtos)
+    produtos = _produtos(4)
+
+    with patch('builtins.input', side_effect=['', '', '']):
+        interface.mostrar_tabela_produtos(produtos, tamanho_pagina=2, versao=1)
+        interface.mostrar_tabela_produtos(produtos, tamanho_pagina=2, versao=1)
+        interface.mostrar_tabela_produtos(produtos, tamanho_pagina=2, versao=2)
+
+    assert mock_tabela.call_count == 2
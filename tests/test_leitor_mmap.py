@@ -0,0 +1,78 @@
+import pytest
+import src.utils.leitor_mmap as leitor_mmap
+from src.utils import manipulacaoArquivos
+
+
+def _gravar(caminho, texto):
+    with open(caminho, "w") as f:
+        f.write(texto)
+
+
+@pytest.mark.unitario_leitor_mmap
+def test_pedidos_acesso_aleatorio_sem_indexar_tudo():
+    """Testa que pedidos[i] só indexa até i e decodifica apenas a linha pedida"""
+    for i in range(1000):
+        manipulacaoArquivos.gravarPedidos([(i, f"Produto {i}", float(i))], f"2025-08-18 10:00:{i % 60:02d}")
+
+    with manipulacaoArquivos.abrirPedidos() as pedidos:
+        assert pedidos[2] == ("2025-08-18 10:00:02", [{"id": 2, "nome": "Produto 2", "preco": 2.0}])
+        assert len(pedidos._inicios) == 3
+        assert pedidos[-1][1][0]["id"] == 999
+        assert len(pedidos) == 1000
+        assert [p[1][0]["id"] for p in pedidos[10:13]] == [10, 11, 12]
+
+
+@pytest.mark.unitario_leitor_mmap
+def test_pedidos_iteracao_pula_linhas_corrompidas():
+    """Testa iteração em streaming: linhas vazias e corrompidas ficam de fora, como em lerPedidos"""
+    _gravar("Pedidos.txt", '2025-08-18;[{"id": 1, "nome": "A", "preco": 10.0}]\n\nlixo\n'
+                           '2025-08-19;[{"id": 2, "nome": "B", "preco": 5.5}]')
+
+    with leitor_mmap.Pedidos("Pedidos.txt") as pedidos:
+        assert list(pedidos) == manipulacaoArquivos.lerPedidos()
+        assert len(pedidos) == 3  # a linha corrompida ocupa posição...
+        with pytest.raises(ValueError):
+            pedidos[1]  # ...e acusa erro só quando acessada
+
+
+@pytest.mark.unitario_leitor_mmap
+def test_arquivo_inexistente_ou_vazio_e_sequencia_vazia():
+    """Testa que arquivo ausente ou vazio não quebra (mmap não mapeia tamanho zero)"""
+    with leitor_mmap.Pedidos("Pedidos.txt") as pedidos:
+        assert not pedidos and len(pedidos) == 0 and list(pedidos) == []
+    _gravar("Pedidos.txt", "")
+    with leitor_mmap.Pedidos("Pedidos.txt") as pedidos:
+        assert not pedidos
+        with pytest.raises(IndexError):
+            pedidos[0]
+
+
+@pytest.mark.unitario_leitor_mmap
+def test_produtos_locais_reaplica_log_sem_decodificar():
+    """Testa que a visão mapeada de produtos_local.txt bate com lerProdutosLocais"""
+    manipulacaoArquivos.gravarProdutoFakeStore(21, "Produto A", 10.0, "Desc A")
+    manipulacaoArquivos.gravarProdutoFakeStore(22, "Produto B", 20.0, "Desc B")
+    manipulacaoArquivos.gravarProdutoFakeStore(23, "Produto C", 30.0, "Desc C")
+    manipulacaoArquivos.atualizarProdutoLocal(21, "Produto A2", 15.0, "Desc A2")
+    manipulacaoArquivos.excluirProdutoLocal(22)
+
+    with manipulacaoArquivos.abrirProdutosLocais() as produtos:
+        assert produtos.ids() == [21, 23]
+        assert produtos.buscar(21)["title"] == "Produto A2"
+        assert produtos.buscar(22) is None
+        assert produtos[1]["id"] == 23
+        assert list(produtos) == manipulacaoArquivos.lerProdutosLocais()
+
+
+@pytest.mark.unitario_leitor_mmap
+def test_produtos_locais_com_e_sem_categoria():
+    """Testa ids() e buscar() num log que mistura registros de 4 e 5 campos"""
+    manipulacaoArquivos.gravarProdutoFakeStore(21, "Camisa", 10.0, "Desc", "roupas")
+    manipulacaoArquivos.gravarProdutoFakeStore(22, "Caneca", 5.0, "Desc")
+    manipulacaoArquivos.gravarProdutoFakeStore(23, "Anel", 50.0, "Desc", "joias")
+
+    with manipulacaoArquivos.abrirProdutosLocais() as produtos:
+        assert produtos.ids() == [21, 22, 23]
+        assert produtos.buscar(21).category == "roupas"
+        assert produtos.buscar(22).category is None
+        assert list(produtos) == manipulacaoArquivos.lerProdutosLocais()
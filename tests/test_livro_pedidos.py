@@ -0,0 +1,141 @@
+import pytest
+import os
+import json
+import threading
+import src.utils.livro_pedidos as livro_pedidos
+from src.utils import manipulacaoArquivos
+
+
+def _linha(datahora, *precos):
+    itens = [{"id": i, "nome": f"Produto {i}", "preco": p} for i, p in enumerate(precos, 1)]
+    return f"{datahora};{json.dumps(itens)}\n"
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_resumo_acompanha_os_pedidos_gravados_sem_reler_o_arquivo(mocker):
+    """Testa que cada gravarPedidos soma ao livro e que o resumo não lê Pedidos.txt"""
+    manipulacaoArquivos.gravarPedidos([(1, "Produto A", 10.0)], "2025-08-18 10:00:00")
+    manipulacaoArquivos.gravarPedidos([(2, "Produto B", 20.0), (3, "Produto C", 5.5)], "2025-08-18 11:00:00")
+
+    leitura = mocker.spy(livro_pedidos, "_somar")
+    assert manipulacaoArquivos.resumoPedidos() == (2, 35.5)
+    leitura.assert_not_called()
+
+    manipulacaoArquivos.apagarPedidos()
+    assert manipulacaoArquivos.resumoPedidos() == (0, 0.0)
+    leitura.assert_not_called()
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_livro_ausente_e_refeito_em_streaming():
+    """Testa o Pedidos.txt gravado por fora (sem livro): refeito pulando linhas ilegíveis"""
+    with open("Pedidos.txt", "w") as f:
+        f.write(_linha("2025-08-18", 10.0) + "linha quebrada\n" + _linha("2025-08-19", 2.0, 3.0))
+
+    assert manipulacaoArquivos.resumoPedidos() == (2, 15.0)
+    manipulacaoArquivos.gravacao_atomica.descarregar()
+    with open(livro_pedidos.caminho_livro("Pedidos.txt")) as f:
+        assert json.load(f)["quantidade"] == 2
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_arquivo_que_cresceu_por_fora_soma_so_o_trecho_novo(mocker):
+    """Testa que pedidos anexados por outro processo são lidos a partir do fim já somado"""
+    manipulacaoArquivos.gravarPedidos([(1, "Produto A", 10.0)], "2025-08-18 10:00:00")
+    tamanho = os.path.getsize("Pedidos.txt")
+    with open("Pedidos.txt", "a") as f:
+        f.write(_linha("2025-08-18 12:00:00", 7.0))
+
+    leitura = mocker.spy(livro_pedidos, "_somar")
+    assert manipulacaoArquivos.resumoPedidos() == (2, 17.0)
+    assert leitura.call_args.args[1].tamanho == tamanho
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_livro_salvo_vale_em_outro_processo(mocker):
+    """Testa que o livro em Pedidos.total é reaproveitado quando confere com o arquivo"""
+    manipulacaoArquivos.gravarPedidos([(1, "Produto A", 10.0)], "2025-08-18 10:00:00")
+    manipulacaoArquivos.gravacao_atomica.descarregar()
+    livro_pedidos._arquivos.clear()  # como um processo novo
+
+    leitura = mocker.spy(livro_pedidos, "_somar")
+    assert manipulacaoArquivos.resumoPedidos() == (1, 10.0)
+    leitura.assert_not_called()
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_pedidos_concorrentes_somam_todos(monkeypatch):
+    """Testa que pedidos gravados no mesmo group commit entram todos no livro"""
+    monkeypatch.setattr(manipulacaoArquivos.gravacao_atomica._gravador, "janela", 0.02)
+    largada = threading.Barrier(10)
+
+    def fechar_pedido(i):
+        largada.wait()
+        manipulacaoArquivos.gravarPedidos([(i, f"Produto {i}", float(i))], f"2025-08-18 10:00:{i:02d}")
+
+    threads = [threading.Thread(target=fechar_pedido, args=(i,)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert manipulacaoArquivos.resumoPedidos() == (10, 45.0)
+    assert livro_pedidos.refazer("Pedidos.txt")[0][2:4] == (10, 45.0)
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_pedido_buscado_pelo_id_com_uma_leitura(mocker):
+    """Testa que cada pedido recebe um ID e é lido pelo índice direto na sua posição"""
+    ids = [manipulacaoArquivos.gravarPedidos([(i, f"Produto {i}", float(i))], f"2025-08-18 10:00:{i:02d}")
+           for i in range(1, 6)]
+    assert ids == [1, 2, 3, 4, 5]
+
+    varredura = mocker.spy(livro_pedidos, "varrer")
+    assert manipulacaoArquivos.buscarPedido(4) == ("2025-08-18 10:00:04", [{"id": 4, "nome": "Produto 4", "preco": 4.0}])
+    assert manipulacaoArquivos.buscarPedido(99) is None
+    varredura.assert_not_called()
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_remover_pedido_mantem_os_demais_no_lugar():
+    """Testa pagar/cancelar um pedido: some das leituras e do livro, os outros IDs continuam valendo"""
+    for i in range(1, 4):
+        manipulacaoArquivos.gravarPedidos([(i, f"Produto {i}", 10.0 * i)], f"2025-08-18 10:00:{i:02d}")
+    tamanho = os.path.getsize("Pedidos.txt")
+
+    assert manipulacaoArquivos.removerPedido(2)[1][0]["nome"] == "Produto 2"
+    assert manipulacaoArquivos.removerPedido(2) is None
+    assert os.path.getsize("Pedidos.txt") == tamanho
+    assert manipulacaoArquivos.buscarPedido(3)[1][0]["preco"] == 30.0
+    assert [p[0] for p in manipulacaoArquivos.lerPedidos()] == ["2025-08-18 10:00:01", "2025-08-18 10:00:03"]
+    with manipulacaoArquivos.abrirPedidos() as pedidos:
+        assert len(pedidos) == 2
+    assert manipulacaoArquivos.resumoPedidos() == (2, 40.0)
+    assert livro_pedidos.refazer("Pedidos.txt")[0][2:4] == (2, 40.0)
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_indice_salvo_vale_em_outro_processo_e_ids_seguem_apos_pagamento():
+    """Testa que o índice em Pedidos.idx é reaproveitado e que apagar os pedidos não reinicia os IDs"""
+    manipulacaoArquivos.gravarPedidos([(1, "Produto A", 10.0)], "2025-08-18 10:00:00")
+    manipulacaoArquivos.gravarPedidos([(2, "Produto B", 20.0)], "2025-08-18 11:00:00")
+    manipulacaoArquivos.gravacao_atomica.descarregar()
+    livro_pedidos._arquivos.clear()  # como um processo novo
+
+    assert manipulacaoArquivos.buscarPedido(2)[0] == "2025-08-18 11:00:00"
+    manipulacaoArquivos.apagarPedidos()
+    assert manipulacaoArquivos.buscarPedido(2) is None
+    assert manipulacaoArquivos.gravarPedidos([(3, "Produto C", 5.0)], "2025-08-19 09:00:00") == 3
+
+
+@pytest.mark.unitario_livro_pedidos
+def test_ids_seguem_quando_pedidos_txt_e_apagado_ao_sair():
+    """Testa que, com Pedidos.txt apagado na saída, a sessão seguinte continua a numeração pelo livro"""
+    manipulacaoArquivos.gravarPedidos([(1, "Produto A", 10.0)], "2025-08-18 10:00:00")
+    manipulacaoArquivos.gravarPedidos([(2, "Produto B", 20.0)], "2025-08-18 11:00:00")
+    manipulacaoArquivos.gravacao_atomica.descarregar()
+    manipulacaoArquivos.apagarArquivosTemporarios()
+    livro_pedidos._arquivos.clear()  # como um processo novo
+
+    assert manipulacaoArquivos.resumoPedidos() == (0, 0.0)
+    assert manipulacaoArquivos.gravarPedidos([(3, "Produto C", 5.0)], "2025-08-19 09:00:00") == 3
@@ -165,6 +165,19 @@ def test_apagar_arquivos_temporarios_misto(mocker):
     mock_exists.assert_any_call("Pedidos.txt")
 
 
+@pytest.mark.unitario_arquivos
+def test_apagar_arquivos_temporarios_descarrega_a_fila_antes(monkeypatch):
+    """Testa que um anexo ainda na fila do group commit não recria o arquivo depois de apagado"""
+    import os
+    monkeypatch.setattr(manipulacaoArquivos.gravacao_atomica._gravador, "janela", 0.2)
+    manipulacaoArquivos.gravacao_atomica.enfileirar_anexo("Pedidos.txt", "2025-08-18 10:00:00;[]\n")
+
+    manipulacaoArquivos.apagarArquivosTemporarios()
+    manipulacaoArquivos.gravacao_atomica.descarregar()
+
+    assert not os.path.exists("Pedidos.txt")
+
+
 @pytest.mark.unitario_arquivos
 def test_conversao_preco_para_real(mocker):
     """Testa auxiliar para converter preço em centavos para formato real"""
@@ -178,3 +191,57 @@ def test_conversao_preco_para_real(mocker):
     assert formatar_preco(2599) == "25.99"
     assert formatar_preco(100) == "1.00"
     assert formatar_preco(5) == "0.05"
+
+
+@pytest.mark.unitario_arquivos
+def test_log_de_produtos_reaplica_edicoes_e_exclusoes():
+    """Testa que edição e exclusão só acrescentam registros e a leitura reaplica o log"""
+    manipulacaoArquivos.gravarProdutoFakeStore(21, "Produto A", 10.0, "Desc A")
+    manipulacaoArquivos.gravarProdutoFakeStore(22, "Produto B", 20.0, "Desc B")
+    manipulacaoArquivos.atualizarProdutoLocal(21, "Produto A2", 15.0, "Desc A2")
+    manipulacaoArquivos.excluirProdutoLocal(22)
+
+    with open("produtos_local.txt") as f:
+        assert f.read().splitlines() == [
+            "21;Produto A;10.0;Desc A",
+            "22;Produto B;20.0;Desc B",
+            "21;Produto A2;15.0;Desc A2",
+            "-;22",
+        ]
+    assert manipulacaoArquivos.lerProdutosLocais() == [
+        {"id": 21, "title": "Produto A2", "price": 15.0, "description": "Desc A2"}
+    ]
+
+
+@pytest.mark.unitario_arquivos
+def test_compactacao_em_segundo_plano_mantem_so_os_vivos(mocker):
+    """Testa que, passado o limite de registros obsoletos, o log é reescrito só com os vivos"""
+    mocker.patch.object(manipulacaoArquivos, 'COMPACTAR_APOS', 3)
+    manipulacaoArquivos.gravarProdutoFakeStore(21, "Produto A", 10.0, "Desc A")
+    manipulacaoArquivos.gravarProdutoFakeStore(22, "Produto B", 20.0, "Desc B")
+    antes = manipulacaoArquivos.lerProdutosLocais()
+
+    manipulacaoArquivos.atualizarProdutoLocal(21, "Produto A", 11.0, "Desc A")
+    manipulacaoArquivos.atualizarProdutoLocal(21, "Produto A", 12.0, "Desc A")
+    manipulacaoArquivos.atualizarProdutoLocal(21, "Produto A", 13.0, "Desc A")
+    manipulacaoArquivos.aguardarCompactacao(timeout=5)
+
+    with open("produtos_local.txt") as f:
+        assert f.read().splitlines() == ["21;Produto A;13.0;Desc A", "22;Produto B;20.0;Desc B"]
+    assert [p["id"] for p in antes] == [p["id"] for p in manipulacaoArquivos.lerProdutosLocais()]
+
+
+@pytest.mark.unitario_arquivos
+def test_compactacao_mantem_produtos_com_categoria():
+    """Testa que a compactação copia também os registros de 5 campos (com categoria)"""
+    manipulacaoArquivos.gravarProdutoFakeStore(21, "Camisa", 10.0, "Desc", "roupas")
+    manipulacaoArquivos.gravarProdutoFakeStore(22, "Caneca", 5.0, "Desc")
+    manipulacaoArquivos.gravarProdutoFakeStore(23, "Anel", 50.0, "Desc", "joias")
+    manipulacaoArquivos.atualizarProdutoLocal(22, "Caneca", 6.0, "Desc")
+
+    manipulacaoArquivos.compactarProdutosLocais()
+
+    with open("produtos_local.txt") as f:
+        assert f.read().splitlines() == ["21;Camisa;10.0;Desc;roupas", "22;Caneca;6.0;Desc", "23;Anel;50.0;Desc;joias"]
+    assert [(p.id, p.category) for p in manipulacaoArquivos.lerProdutosLocais()] == \
+        [(21, "roupas"), (22, None), (23, "joias")]
@@ -96,9 +96,11 @@ def test_menu_principal_integracao_completa(mocker):
         input_call_count += 1
         
         if input_call_count == 1:
-            return '1'  # Primeira chamada: entra em Cadastros
+            return '1'  # Primeira chamada: entra em Cadastros (mockado)
         elif input_call_count == 2:
-            return '4'  # Segunda chamada: volta do menu Cadastros
+            return '4'  # Segunda chamada: entra em Pedidos
+        elif input_call_count == 3:
+            return '6'  # Terceira chamada: volta do menu Pedidos
         else:
             return '5'  # Demais chamadas: sai do programa
     
@@ -1,7 +1,6 @@
 import pytest
 from src.pagamentos import pagamentos
 from src.interface import interface
-from src.utils import manipulacaoArquivos
 from unittest.mock import ANY
 
 @pytest.mark.unitario_pagamento
@@ -14,10 +13,10 @@ def test_realizar_pagamento(mocker):
     '2025-08-18;[{"id": 2, "nome": "Produto B", "preco": 20.0}, {"id": 3, "nome": "Produto C", "preco": 5.50}]'
     )
 
-    # CORREÇÕES NOS PATHS DOS MOCKS:
-    mocker.patch('src.utils.manipulacaoArquivos.lerArquivo', mocker.mock_open(read_data=pedidos_falsos))
-    mock_abrir_arquivo = mocker.patch('builtins.open', mocker.mock_open())
-    
+    # Pedidos.txt real: o pagamento lê o arquivo mapeado em memória
+    with open("Pedidos.txt", "w") as f:
+        f.write(pedidos_falsos)
+
     mocker.patch('builtins.input', return_value='1')
     mock_mensagem_sucesso = mocker.patch('src.interface.interface.mensagem_sucesso')
 
@@ -28,9 +27,7 @@ def test_realizar_pagamento(mocker):
     pagamentos.realizar_pagamento()
     mock_mensagem_sucesso.assert_any_call("✅ Pagamento de R$ 35.50 realizado via CRÉDITO!")
 
-    mock_abrir_arquivo.assert_called_once_with("Pedidos.txt", "w")
-
-    handle = mock_abrir_arquivo()
-    handle.truncate.assert_called_once()
+    with open("Pedidos.txt") as f:
+        assert f.read() == ""
 
     print("\n✅ O teste de realizar pagamento passou com sucesso")
\ No newline at end of file
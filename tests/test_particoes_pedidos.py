@@ -0,0 +1,107 @@
+import pytest
+import os
+import json
+import src.utils.particoes_pedidos as particoes_pedidos
+from src.utils import manipulacaoArquivos
+
+
+def _gravar(datahora, preco=10.0):
+    manipulacaoArquivos.gravarPedidos([(1, "Produto A", preco)], datahora)
+
+
+@pytest.mark.unitario_particoes_pedidos
+def test_pedidos_vao_para_a_particao_do_dia_com_manifesto():
+    """Testa um arquivo por dia e o manifesto com menor/maior datahora, linhas e bytes"""
+    _gravar("2025-08-18 09:00:00")
+    _gravar("2025-08-18 18:30:00")
+    _gravar("2025-08-19 10:00:00")
+    manipulacaoArquivos.gravacao_atomica.descarregar()
+
+    pasta = manipulacaoArquivos.HISTORICO_PEDIDOS
+    assert sorted(os.listdir(pasta)) == ["2025-08-18.resumo.json", "2025-08-18.txt",
+                                         "2025-08-19.resumo.json", "2025-08-19.txt", "manifesto.json"]
+    with open(os.path.join(pasta, "manifesto.json")) as f:
+        manifesto = json.load(f)
+    assert manifesto["2025-08-18"][:3] == ["2025-08-18 09:00:00", "2025-08-18 18:30:00", 2]
+    assert manifesto["2025-08-18"][3] == os.path.getsize(os.path.join(pasta, "2025-08-18.txt"))
+
+
+@pytest.mark.unitario_particoes_pedidos
+def test_consulta_por_periodo_abre_so_as_particoes_do_intervalo(mocker):
+    """Testa que só as partições que cruzam [inicio, fim) são lidas"""
+    for dia in range(10, 20):
+        _gravar(f"2025-08-{dia} 12:00:00", float(dia))
+
+    original = particoes_pedidos.leitor_mmap.Pedidos
+    abertos = []
+    mocker.patch.object(particoes_pedidos.leitor_mmap, "Pedidos",
+                        side_effect=lambda caminho: abertos.append(os.path.basename(caminho)) or original(caminho))
+
+    pedidos = list(manipulacaoArquivos.lerHistoricoPedidos("2025-08-15", "2025-08-17"))
+    assert [p[0] for p in pedidos] == ["2025-08-15 12:00:00", "2025-08-16 12:00:00"]
+    assert abertos == ["2025-08-15.txt", "2025-08-16.txt"]
+
+
+@pytest.mark.unitario_particoes_pedidos
+def test_historico_sobrevive_ao_pagamento():
+    """Testa que zerar os pendentes (pagamento) não apaga o histórico"""
+    _gravar("2025-08-18 09:00:00")
+    manipulacaoArquivos.apagarPedidos()
+    _gravar("2025-08-19 09:00:00")
+
+    assert manipulacaoArquivos.lerPedidos() == [("2025-08-19 09:00:00", [{"id": 1, "nome": "Produto A", "preco": 10.0}])]
+    assert [p[0] for p in manipulacaoArquivos.lerHistoricoPedidos()] == ["2025-08-18 09:00:00", "2025-08-19 09:00:00"]
+
+
+@pytest.mark.unitario_particoes_pedidos
+def test_manifesto_velho_e_corrigido_relendo_so_a_particao_alterada(mocker):
+    """Testa uma partição alterada por fora: só ela é relida ao abrir o histórico"""
+    _gravar("2025-08-18 09:00:00")
+    _gravar("2025-08-19 09:00:00")
+    manipulacaoArquivos.gravacao_atomica.descarregar()
+    with open(os.path.join(manipulacaoArquivos.HISTORICO_PEDIDOS, "2025-08-19.txt"), "a") as f:
+        f.write('2025-08-19 23:59:00;[{"id": 2, "nome": "Produto B", "preco": 1.0}]\n')
+
+    historico = particoes_pedidos.Historico(manipulacaoArquivos.HISTORICO_PEDIDOS)  # como um processo novo
+    releitura = mocker.spy(historico, "_ler_particao")
+    assert historico.manifesto()["2025-08-19"].maximo == "2025-08-19 23:59:00"
+    releitura.assert_called_once_with("2025-08-19")
+    assert len(list(historico.consultar("2025-08-19 12:00", None))) == 1
+
+
+@pytest.mark.unitario_particoes_pedidos
+def test_resumo_de_vendas_acompanha_cada_pedido_sem_reler_a_particao(mocker):
+    """Testa o resumo por partição atualizado no anexar, sem abrir as linhas na consulta"""
+    _gravar("2025-08-18 09:00:00", 10.0)
+    _gravar("2025-08-18 18:30:00", 5.0)
+    _gravar("2025-08-19 10:00:00", 2.0)
+
+    releitura = mocker.spy(particoes_pedidos.agregacao_pedidos, "agregar")
+    resumos = particoes_pedidos.abrir(manipulacaoArquivos.HISTORICO_PEDIDOS).resumos("2025-08-18", "2025-08-19")
+    assert list(resumos) == ["2025-08-18"]
+    assert (resumos["2025-08-18"].pedidos, resumos["2025-08-18"].total) == (2, 15.0)
+    assert resumos["2025-08-18"].por_produto == {1: ["Produto A", 2, 15.0]}
+    releitura.assert_not_called()
+
+
+@pytest.mark.unitario_particoes_pedidos
+def test_resumo_desatualizado_e_refeito_da_particao():
+    """Testa um resumo que não cobre a partição (linha anexada por fora): é refeito do arquivo"""
+    _gravar("2025-08-18 09:00:00", 10.0)
+    manipulacaoArquivos.gravacao_atomica.descarregar()
+    with open(os.path.join(manipulacaoArquivos.HISTORICO_PEDIDOS, "2025-08-18.txt"), "a") as f:
+        f.write('2025-08-18 23:59:00;[{"id": 2, "nome": "Produto B", "preco": 1.0}]\n')
+
+    historico = particoes_pedidos.Historico(manipulacaoArquivos.HISTORICO_PEDIDOS)  # como um processo novo
+    resumo = historico.resumos()["2025-08-18"]
+    assert (resumo.pedidos, resumo.total) == (2, 11.0)
+    assert particoes_pedidos.no_periodo("2025-08-18T10", "2025-08-18", "2025-08-19")
+    assert not particoes_pedidos.no_periodo(particoes_pedidos.SEM_DATA, "2025-08-18")
+
+
+@pytest.mark.unitario_particoes_pedidos
+def test_chave_por_dia_e_por_hora():
+    """Testa a chave da partição nas duas granularidades e para datas fora do padrão"""
+    assert particoes_pedidos.chave("2025-08-18 10:30:00") == "2025-08-18"
+    assert particoes_pedidos.chave("2025-08-18 10:30:00", "hora") == "2025-08-18T10"
+    assert particoes_pedidos.chave("ontem") == particoes_pedidos.SEM_DATA
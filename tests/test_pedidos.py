@@ -23,7 +23,7 @@ def test_adicionar_pedido(mocker):
     mock_response = mocker.Mock()
     mock_response.status_code = 200
     mock_response.json.return_value = produtos_api_falsos
-    mocker.patch('src.pedidos.pedidos.requests.get', return_value=mock_response)
+    mocker.patch('src.services.cache_catalogo.http_cliente.get', return_value=mock_response)
     
     # Mock para a leitura de ficheiro local
     mocker.patch('src.utils.manipulacaoArquivos.lerProdutosLocais', return_value=produtos_locais_falsos)
@@ -0,0 +1,44 @@
+import pytest
+import sys
+import json
+from src.models.produto import ItemPedido, Produto
+from src.utils import manipulacaoArquivos
+
+
+@pytest.mark.unitario_produto
+def test_produto_compacto_e_titulo_internado():
+    """Testa que Produto não tem dict por instância e que títulos iguais são o mesmo objeto"""
+    a = Produto(1, "".join(["Camisa ", "Azul"]), 30.0)
+    b = Produto.de({"id": 2, "title": "".join(["Camisa", " Azul"]), "price": 35.0, "image": "x.png"})
+
+    assert not hasattr(a, "__dict__")
+    assert a.title is b.title
+    assert sys.getsizeof(a) < sys.getsizeof({"id": 1, "title": a.title, "price": 30.0, "description": None})
+
+
+@pytest.mark.unitario_produto
+def test_produto_compativel_com_formato_dict():
+    """Testa acesso por chave, igualdade com o dict equivalente e cópia com alterações"""
+    p = Produto(21, "Produto A", 10.0, "Desc A")
+
+    assert p == {"id": 21, "title": "Produto A", "price": 10.0, "description": "Desc A"}
+    assert p["title"] == "Produto A" and p.get("category", "sem") == "sem"
+    assert dict(p) == p.para_dict()
+    with pytest.raises(KeyError):
+        p["rating"]
+
+    editado = p.copiar(price=12.0)
+    assert editado.price == 12.0 and p.price == 10.0
+
+
+@pytest.mark.unitario_produto
+def test_item_pedido_e_tupla_e_grava_no_formato_antigo():
+    """Testa que ItemPedido segue igual à tupla (id, nome, preço) e é gravado como antes"""
+    item = ItemPedido.do_produto(Produto(1, "Produto A", 10.0))
+
+    assert item == (1, "Produto A", 10.0)
+    manipulacaoArquivos.gravarPedidos([item, (2, "Produto B", 5.5)], "2025-08-18 10:00:00")
+    with open("Pedidos.txt") as f:
+        datahora, itens = f.read().strip().split(";", 1)
+    assert json.loads(itens) == [{"id": 1, "nome": "Produto A", "preco": 10.0},
+                                 {"id": 2, "nome": "Produto B", "preco": 5.5}]
@@ -0,0 +1,142 @@
+import pytest
+from datetime import datetime
+import src.utils.repositorios as repositorios
+
+BACKENDS = ["memoria", "arquivo", "sqlite"]
+
+
+@pytest.fixture(params=BACKENDS)
+def repositorio(request):
+    return repositorios.configurar(request.param)
+
+
+@pytest.mark.unitario_repositorios
+def test_produtos_mesmo_comportamento_em_todos_os_backends(repositorio):
+    """Testa inserir, atualizar, excluir e listar produtos locais"""
+    repositorio.inserir_produto({"id": 21, "title": "Produto A", "price": 10.0, "description": "Desc A"})
+    repositorio.inserir_produto({"id": 22, "title": "Produto B", "price": 20.0, "description": "Desc B"})
+    repositorio.atualizar_produto({"id": 21, "title": "Produto A2", "price": 15.0, "description": "Desc A2"})
+    repositorio.excluir_produto(22)
+    repositorio.inserir_produto({"id": 23, "title": "Produto C", "price": 5.0, "description": "Desc C"})
+
+    assert repositorio.listar_produtos() == [
+        {"id": 21, "title": "Produto A2", "price": 15.0, "description": "Desc A2"},
+        {"id": 23, "title": "Produto C", "price": 5.0, "description": "Desc C"},
+    ]
+
+
+@pytest.mark.unitario_repositorios
+def test_pedidos_mesmo_comportamento_em_todos_os_backends(repositorio):
+    """Testa gravar, listar e apagar pedidos no formato do carrinho"""
+    repositorio.gravar_pedido([(1, "Produto A", 10.0), (2, "Produto B", 2.5)], datetime(2025, 8, 18, 10, 0))
+
+    assert repositorio.listar_pedidos() == [
+        ("2025-08-18 10:00:00", [{"id": 1, "nome": "Produto A", "preco": 10.0},
+                                 {"id": 2, "nome": "Produto B", "preco": 2.5}])
+    ]
+    assert repositorio.resumo_pedidos() == (1, 12.5)
+
+    segundo = repositorio.gravar_pedido([(3, "Produto C", 4.0)], datetime(2025, 8, 18, 11, 0))
+    assert repositorio.buscar_pedido(segundo) == ("2025-08-18 11:00:00", [{"id": 3, "nome": "Produto C", "preco": 4.0}])
+    assert repositorio.remover_pedido(segundo)[0] == "2025-08-18 11:00:00"
+    assert repositorio.buscar_pedido(segundo) is None
+    assert repositorio.remover_pedido(segundo) is None
+    assert repositorio.resumo_pedidos() == (1, 12.5)
+    repositorio.apagar_pedidos()
+    assert repositorio.listar_pedidos() == []
+    assert repositorio.resumo_pedidos() == (0, 0.0)
+
+
+@pytest.mark.unitario_repositorios
+def test_historico_de_pedidos_por_periodo_em_todos_os_backends(repositorio):
+    """Testa que o histórico guarda pedidos já pagos e filtra por período"""
+    repositorio.gravar_pedido([(1, "Produto A", 10.0)], datetime(2025, 8, 18, 10, 0))
+    repositorio.apagar_pedidos()
+    repositorio.gravar_pedido([(2, "Produto B", 20.0)], datetime(2025, 8, 19, 10, 0))
+    repositorio.gravar_pedido([(3, "Produto C", 30.0)], datetime(2025, 8, 20, 10, 0))
+
+    assert [d for d, _ in repositorio.historico_pedidos()] == \
+        ["2025-08-18 10:00:00", "2025-08-19 10:00:00", "2025-08-20 10:00:00"]
+    assert list(repositorio.historico_pedidos("2025-08-18", "2025-08-20")) == [
+        ("2025-08-18 10:00:00", [{"id": 1, "nome": "Produto A", "preco": 10.0}]),
+        ("2025-08-19 10:00:00", [{"id": 2, "nome": "Produto B", "preco": 20.0}]),
+    ]
+
+
+@pytest.mark.unitario_repositorios
+def test_vendas_por_dia_em_todos_os_backends(repositorio):
+    """Testa os agregados por dia mantidos a cada pedido, inclusive dos já pagos"""
+    repositorio.gravar_pedido([(1, "Produto A", 10.0), (2, "Produto B", 2.5)], datetime(2025, 8, 18, 10, 0))
+    repositorio.apagar_pedidos()
+    repositorio.gravar_pedido([(1, "Produto A", 10.0)], datetime(2025, 8, 18, 15, 0))
+    repositorio.gravar_pedido([(3, "Produto C", 4.0)], datetime(2025, 8, 19, 10, 0))
+
+    vendas = repositorio.vendas_por_dia()
+    assert list(vendas) == ["2025-08-18", "2025-08-19"]
+    assert (vendas["2025-08-18"].pedidos, vendas["2025-08-18"].itens, vendas["2025-08-18"].total) == (2, 3, 22.5)
+    assert vendas["2025-08-18"].por_produto == {1: ["Produto A", 2, 20.0], 2: ["Produto B", 1, 2.5]}
+    assert list(repositorio.vendas_por_dia("2025-08-19", "2025-08-20")) == ["2025-08-19"]
+
+
+@pytest.mark.unitario_repositorios
+def test_usuarios_mesmo_comportamento_em_todos_os_backends(repositorio):
+    """Testa salvar/carregar a base de usuários e buscar por username ou e-mail"""
+    dados = repositorio.carregar_usuarios()
+    assert dados == {"usuarios": [], "recuperacoes": {}}
+
+    dados["usuarios"].append({"id": "u1", "username": "ana", "email": "ana@x.com"})
+    dados["recuperacoes"]["tok"] = {"user_id": "u1", "expira_em": 123}
+    repositorio.salvar_usuarios(dados)
+
+    assert repositorio.carregar_usuarios() == dados
+    assert repositorio.buscar_usuario("ana@x.com")["id"] == "u1"
+    assert repositorio.buscar_usuario("bia") is None
+
+
+@pytest.mark.unitario_repositorios
+def test_backend_escolhido_pela_configuracao(monkeypatch):
+    """Testa a escolha por LOJA_BACKEND e o erro para nomes desconhecidos"""
+    monkeypatch.setenv("LOJA_BACKEND", "memoria")
+    repositorios.reiniciar()
+    assert isinstance(repositorios.obter(), repositorios.RepositorioMemoria)
+
+    monkeypatch.delenv("LOJA_BACKEND")
+    repositorios.reiniciar()
+    assert isinstance(repositorios.obter(), repositorios.RepositorioArquivo)
+
+    with pytest.raises(ValueError):
+        repositorios.configurar("postgres")
+
+
+@pytest.mark.unitario_repositorios
+def test_fluxo_de_cadastro_usa_o_backend_configurado(mocker):
+    """Testa que o cadastro grava pelo repositório, sem criar arquivos"""
+    import os
+    import src.models.cadastros as cadastros
+    repositorio = repositorios.configurar("memoria")
+    mocker.patch('builtins.input', side_effect=['1', 'Caneca', '25.00', 'Azul'])
+    mocker.patch('src.interface.interface.pausar')
+    mocker.patch('src.interface.interface.titulo')
+    mocker.patch('src.interface.interface.limpar_tela')
+    mocker.patch('src.interface.interface.mensagem_sucesso')
+
+    cadastros.cadastrar_item()
+
+    assert repositorio.listar_produtos() == [{"id": 21, "title": "Caneca", "price": 25.0, "description": "Azul"}]
+    assert not os.path.exists("produtos_local.txt")
+
+
+@pytest.mark.unitario_repositorios
+def test_ids_reservados_em_blocos_sem_colisao(repositorio, monkeypatch):
+    """Testa que cada instância (processo) usa o próprio bloco e que os blocos não se sobrepõem"""
+    monkeypatch.setattr(repositorios, 'TAMANHO_BLOCO_IDS', 3)
+    repositorio.inserir_produto({"id": 30, "title": "Antigo", "price": 1.0, "description": ""})
+    outro = repositorios.configurar(repositorio.nome) if repositorio.nome != "memoria" else repositorio
+
+    ids = [repositorio.gerar_id_produto(), repositorio.gerar_id_produto(), outro.gerar_id_produto(),
+           repositorio.gerar_id_produto(), outro.gerar_id_produto()]
+
+    assert len(set(ids)) == len(ids)
+    if repositorio.nome != "memoria":
+        # a sequência durável nasce depois do maior ID já gravado
+        assert ids == [31, 32, 34, 33, 35]
@@ -0,0 +1,36 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import src.utils.sequencia_ids as sequencia_ids
+
+
+def _reservar_varias(caminho, vezes):
+    return [sequencia_ids.reservar(caminho, 1, lambda: 1) for _ in range(vezes)]
+
+
+@pytest.mark.unitario_sequencia_ids
+def test_reserva_em_blocos_e_duravel(tmp_path):
+    """Testa que os blocos são consecutivos e que o valor inicial só é calculado uma vez"""
+    caminho = str(tmp_path / "seq")
+    chamadas = []
+
+    def inicial():
+        chamadas.append(1)
+        return 21
+
+    assert sequencia_ids.reservar(caminho, 20, inicial) == 21
+    assert sequencia_ids.reservar(caminho, 20, inicial) == 41
+    assert len(chamadas) == 1
+    with open(caminho) as f:
+        assert f.read().strip() == "61"
+
+
+@pytest.mark.unitario_sequencia_ids
+def test_processos_concorrentes_nunca_repetem_id(tmp_path):
+    """Testa a trava de arquivo entre processos: nenhum ID é entregue duas vezes"""
+    caminho = str(tmp_path / "seq")
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        blocos = list(executor.map(_reservar_varias, [caminho] * 4, [50] * 4))
+
+    ids = [i for bloco in blocos for i in bloco]
+    assert sorted(ids) == list(range(1, 201))